@@ -9,6 +9,8 @@ from app.services.impact_calculator import impact_calculator_service
 from app.services.sec_parser import sec_parser
 from app.services.relationship_fusion import relationship_fusion
 from app.services.persistence import persistence_service
+from app.services.llm_scheduler import context_submit
+from app.services.url_index import url_index
 
 def agent_1_news_monitor(state: SupplyChainState) -> Dict[str, Any]:
     """Agent 1: Continuous news surveillance across all sources."""
@@ -16,10 +18,15 @@ def agent_1_news_monitor(state: SupplyChainState) -> Dict[str, Any]:
     
     # Use the new high-intelligence ingestion layer
     portfolio_tickers = state.get("portfolio", [])
-    articles = news_aggregator_layer.ingest_all(portfolio_tickers)[:5] # Limit to 5 for demo speed/rate-limits
-    
-    # If fetch_all returned nothing (e.g. API limits or no news), we mock a relevant one for verification
-    if not articles:
+    # Only stories not processed in an earlier run (agent 2 marks them seen once analyzed).
+    # Waits for the fan-out so the 5 taken are the highest-credibility ones, not the fastest source's
+    articles = news_aggregator_layer.ingest_all(portfolio_tickers, unseen_only=True)[:5] # Limit to 5 for demo speed/rate-limits
+
+    # If every source came back empty (e.g. API limits), we mock a relevant one for verification;
+    # nothing new since the last run is a normal outcome and yields no articles
+    report = news_aggregator_layer.last_report or {}
+    upstream_empty = not any(t["articles"] for t in report.get("timings", {}).values())
+    if not articles and upstream_empty:
         from app.models.article import Article
         articles = [Article(
             title="TSMC Semiconductor Production Halt in Taiwan Due to Earthquake",
@@ -59,8 +66,15 @@ def agent_2_classifier(state: SupplyChainState) -> Dict[str, Any]:
     """Agent 2: Categorize news into 10 market factors + sentiment."""
     print("---EXECUTING AGENT 2: CLASSIFIER---")
     classified = []
+    analyzed_urls = []
+    portfolio = state.get("portfolio", [])
     for article in state["news_articles"]:
-        res = classification_service.classify_article(article["title"], article["content"])
+        # Fused call also returns relationships and direct impact for downstream agents
+        res = classification_service.analyze_article(article["title"], article["content"], portfolio,
+                                                     article_id=article["id"])
+        # Heuristic fallbacks (LLM error) stay unseen so the next run retries them
+        if not str(res.get("reasoning", "")).startswith("Heuristic fallback"):
+            analyzed_urls.append(article["url"])
         classified.append({
             "article_id": article["id"],
             "ticker": article["companies"][0] if article["companies"] else "UNKNOWN",
@@ -69,6 +83,7 @@ def agent_2_classifier(state: SupplyChainState) -> Dict[str, Any]:
     
     # Filter for high priority (Sentiment score < -0.5 or > 0.5)
     high_priority = [c["article_id"] for c in classified if abs(c["sentiment_score"]) > 0.5]
+    url_index.mark_seen(analyzed_urls)
     
     return {
         "classified_articles": classified,
@@ -152,10 +167,11 @@ def agent_3b_discovery(state: SupplyChainState) -> Dict[str, Any]:
         
         try:
              # Quick LLM lookup to make it feel real
-             from app.services.gemini_client import GeminiClient
+             from app.services.gemini_client import gemini_client
+             from app.services.llm_scheduler import PRIORITY_LOW
              prompt = f"""For the company '{name}', provide a brief 1-sentence description and its likely sector.
              Return JSON: {{"sector": "Sector", "description": "Description"}}"""
-             resp = GeminiClient().generate_content(prompt).text
+             resp = gemini_client.generate_content(prompt, priority=PRIORITY_LOW, caller="private_company_inference").text
              clean = re.sub(r'^```json\s*|\s*```$', '', resp.strip(), flags=re.MULTILINE)
              info = json.loads(clean)
              
@@ -206,17 +222,17 @@ def agent_3b_discovery(state: SupplyChainState) -> Dict[str, Any]:
             # SOURCE 1: SEC EDGAR filings (highest confidence) - Only for Public
             sec_future = None
             if c_type == "public":
-                sec_future = executor.submit(sec_parser.extract_relationships, ticker)
+                sec_future = context_submit(executor, sec_parser.extract_relationships, ticker)
             
             # SOURCE 2: LLM Discovery
             def llm_discovery(t):
-                from app.services.gemini_client import GeminiClient
+                from app.services.gemini_client import gemini_client
                 prompt = f"""Identify the top 5 strategic suppliers and customers for {t}.
                 Return ONLY valid JSON array:
                 [{{"related_company": "Company Name", "type": "supplier|customer", "criticality": "high|medium|low"}}]
                 """
                 try:
-                    resp = GeminiClient().generate_content(prompt).text
+                    resp = gemini_client.generate_content(prompt, caller="llm_discovery").text
                     clean_json = re.sub(r'^```json\s*|\s*```$', '', resp.strip(), flags=re.MULTILINE)
                     rels = json.loads(clean_json)
                     for r in rels:
@@ -227,7 +243,7 @@ def agent_3b_discovery(state: SupplyChainState) -> Dict[str, Any]:
                     print(f"      LLM error: {str(e)[:50]}")
                     return []
 
-            llm_future = executor.submit(llm_discovery, ticker)
+            llm_future = context_submit(executor, llm_discovery, ticker)
 
             # SOURCE 3: News Context Discovery
             def news_discovery(t):
@@ -246,7 +262,7 @@ def agent_3b_discovery(state: SupplyChainState) -> Dict[str, Any]:
                                 })
                 return bolstering
 
-            news_future = executor.submit(news_discovery, ticker)
+            news_future = context_submit(executor, news_discovery, ticker)
 
             # SOURCE 4: Web scraping (simplified for demo - can be enhanced)
             def web_discovery(t):
@@ -255,7 +271,7 @@ def agent_3b_discovery(state: SupplyChainState) -> Dict[str, Any]:
                 # For now, return empty to focus on other sources
                 return []
 
-            web_future = executor.submit(web_discovery, ticker)
+            web_future = context_submit(executor, web_discovery, ticker)
 
             # Wait for all sources (max 10 seconds each)
             results = {'sec': [], 'llm': [], 'news': [], 'web': []}
@@ -328,7 +344,9 @@ def agent_3b_discovery(state: SupplyChainState) -> Dict[str, Any]:
     misses = state.get("cache_misses", [])
     if misses:
         with concurrent.futures.ThreadPoolExecutor(max_workers=len(misses)) as executor:
-            results = list(executor.map(discover_for_ticker, misses))
+            # Carry the caller's LLM priority (interactive vs bulk refresh) into workers
+            futures = [context_submit(executor, discover_for_ticker, m) for m in misses]
+            results = [f.result() for f in futures]
             discovered = [r for r in results if r]
 
     return {
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
+import asyncio
 import logging
 import os
 from datetime import datetime
@@ -9,6 +10,7 @@ from app.services.persistence import persistence_service
 from app.services.stock_data import stock_data_service
 from app.services.database import get_db_connection
 from app.agents.workflow import app as langgraph_app
+from app.services.llm_scheduler import llm_priority, PRIORITY_HIGH
 
 logger = logging.getLogger(__name__)
 
@@ -97,6 +99,7 @@ async def update_portfolio(request: Dict[str, Any], background_tasks: Background
         from app.services.database import get_db_connection
         from app.services.auth import auth_service
         from app.agents.nodes import agent_3b_discovery
+        from app.services.llm_scheduler import llm_priority, PRIORITY_LOW
 
         # Get or create user
         user_name = request.get("user_name", "User")
@@ -126,13 +129,18 @@ async def update_portfolio(request: Dict[str, Any], background_tasks: Background
         conn.commit()
         conn.close()
 
+        # New holdings become detectable in article text right away
+        from app.services.mention_extractor import mention_index
+        mention_index.add_companies((h['ticker'], h.get('company')) for h in holdings)
+
         # 3. Trigger relationship discovery in background
         def discover_relationships():
             logger.info(f"🔍 Starting relationship discovery for user {user_name}: {len(tickers)} companies...")
             for ticker in tickers:
                 try:
                     state = {"portfolio": tickers}
-                    agent_3b_discovery(state)
+                    with llm_priority(PRIORITY_LOW):
+                        agent_3b_discovery(state)
                     logger.info(f"✅ Discovered relationships for {ticker}")
                 except Exception as e:
                     logger.error(f"❌ Discovery failed for {ticker}: {e}")
@@ -284,8 +292,9 @@ async def run_intelligence(request: WorkflowTriggerRequest):
             "started_at": datetime.now().isoformat()
         }
         
-        # Execute workflow
-        final_state = langgraph_app.invoke(initial_state)
+        # Execute workflow (interactive: served ahead of bulk LLM work)
+        with llm_priority(PRIORITY_HIGH):
+            final_state = langgraph_app.invoke(initial_state)
         
         return {
             "status": "complete",
@@ -346,9 +355,10 @@ async def get_stats():
 async def get_articles(limit: int = 15, portfolio: str = None):
     """
     Get LIVE news from MULTIPLE sources (NewsAPI, Finnhub, GNews, RSS, etc.)
-    This endpoint ONLY fetches and displays live news - does NOT store in database.
+    Served from a shared per-ticker-set snapshot refreshed in the background (as_of = fetch time);
+    does NOT store in database.
     """
-    from app.services.news_aggregator import NewsIngestionLayer
+    from app.services.news_snapshot import news_snapshot
     
     # tickers = ['AAPL', 'NVDA', 'AMD', 'MSFT', 'GOOGL'] <--- REMOVED HARDCODED DEFAULT
     
@@ -373,27 +383,13 @@ async def get_articles(limit: int = 15, portfolio: str = None):
         return []
 
     
-    logger.info(f"📰 Fetching LIVE news from MULTIPLE sources for: {tickers} (NO DATABASE STORAGE)")
-    
     try:
-        news_layer = NewsIngestionLayer()
-        query = " OR ".join(tickers)
-        
-        # Fetch from ALL available sources - LIVE DATA ONLY
-        all_articles = []
-        
-        # 1. RSS Feeds (Unlimited, always available)
-        all_articles.extend(news_layer.fetch_rss_feeds(tickers) or [])
-        all_articles.extend(news_layer.fetch_google_news_rss(query) or [])
+        # Shared snapshot of ALL sources (RSS + official APIs); only a cold/expired set waits for a fan-out
+        snapshot = await asyncio.to_thread(news_snapshot.get, tickers)
+        all_articles = snapshot["articles"]
         
-        # 2. Official APIs
-        all_articles.extend(news_layer.fetch_news_api(query) or [])
-        all_articles.extend(news_layer.fetch_newsdata(query) or [])
-        all_articles.extend(news_layer.fetch_finnhub(query) or [])
-        all_articles.extend(news_layer.fetch_gnews(query) or [])
-        all_articles.extend(news_layer.fetch_hacker_news() or [])
-        
-        logger.info(f"✅ Got {len(all_articles)} LIVE articles from all sources")
+        logger.info(f"✅ Got {len(all_articles)} LIVE articles from snapshot as of {snapshot['as_of']}"
+                    + (" (refreshing)" if snapshot["stale"] else ""))
         
         # Filter by date (last 7 days)
         from datetime import datetime, timedelta, timezone
@@ -417,14 +413,13 @@ async def get_articles(limit: int = 15, portfolio: str = None):
         
         logger.info(f"📅 Filtered to {len(recent_articles)} articles from last 7 days")
         
-        # Filter by portfolio companies and tag
+        # Filter by portfolio companies and tag (one automaton pass per article, names and tickers)
+        from app.services.mention_extractor import mention_index
         filtered = []
         for art in recent_articles:
-            text = f"{art.get('title', '')} {art.get('content', '')}".upper()
-            affected = [t for t in tickers if t in text]
+            affected = mention_index.extract(f"{art.get('title', '')} {art.get('content', '')}", tickers)
             if affected:
-                art['affected_companies'] = affected
-                filtered.append(art)
+                filtered.append({**art, 'affected_companies': affected})  # snapshot dicts are shared
         
         # If no portfolio matches, still return recent articles (broader market news)
         if not filtered and recent_articles:
@@ -445,12 +440,12 @@ async def get_articles(limit: int = 15, portfolio: str = None):
         # Return live articles only - NO STATIC FALLBACK
         result = unique[:limit]
         logger.info(f"📊 Returning {len(result)} LIVE articles (not stored in database)")
-        return {"articles": result}
+        return {"articles": result, "as_of": snapshot["as_of"], "stale": snapshot["stale"]}
         
     except Exception as e:
         logger.error(f"❌ News fetch error: {e}")
         # Return empty array instead of static data
-        return {"articles": []}
+        return {"articles": [], "as_of": None, "stale": False}
 @router.get("/relationships")
 async def get_relationships(limit: int = 100):
     """Get all discovered relationships."""
@@ -464,10 +459,56 @@ async def get_knowledge_graphs():
 
 @router.get("/news/fetch-status")
 async def get_news_fetch_status():
-    """Get status of background news fetching."""
-    # Since we use background tasks, we'll simulate an 'idle' or 'active' state
-    # In a real app, we'd check a task queue or database flag
-    return {"status": "idle", "last_fetch": datetime.now().isoformat(), "message": "Ready"}
+    """Get status of background news fetching, with per-source timings of the last fan-out."""
+    from app.services.news_aggregator import news_aggregator_layer
+    from app.services.ingest_cursors import ingest_cursors
+    report = news_aggregator_layer.last_report
+    if report is None:
+        return {"status": "idle", "last_fetch": None, "message": "Ready", "cursors": ingest_cursors.get_stats()}
+    return {"status": "idle", "last_fetch": report["finished_at"], "message": "Ready",
+            "elapsed": report["elapsed"], "sources": report["timings"], "cursors": ingest_cursors.get_stats()}
+
+@router.get("/news/feed-stats")
+async def get_feed_stats():
+    """Conditional GET statistics per RSS/Atom feed (304 hit rate, bytes saved)."""
+    from app.services.feed_cache import feed_cache
+    return feed_cache.get_stats()
+
+@router.get("/news/url-index")
+async def get_url_index_stats():
+    """Seen-URL index counters (Bloom filter negatives, DB-confirmed repeats, false positives)."""
+    from app.services.url_index import url_index
+    return url_index.get_stats()
+
+@router.get("/news/quota")
+async def get_news_quota():
+    """Per-source API quota: used, remaining, calls available now under pacing, window reset."""
+    from app.services.quota_budget import quota_budget
+    return quota_budget.get_stats()
+
+@router.get("/news/snapshots")
+async def get_news_snapshot_stats():
+    """/articles snapshot cache: hits, background refreshes and the age of each ticker set."""
+    from app.services.news_snapshot import news_snapshot
+    return news_snapshot.get_stats()
+
+@router.get("/news/scrape-stats")
+async def get_scrape_stats():
+    """Full-text scraper counters (cache hits, scraped, robots-disallowed, failures)."""
+    from app.services.scrape_scheduler import scrape_scheduler
+    return scrape_scheduler.get_stats()
+
+@router.get("/news/http-stats")
+async def get_http_stats():
+    """Outbound HTTP metrics per upstream host (requests, retries, status mix, latency p50/p95)."""
+    from app.services.http_client import http_client
+    return http_client.get_stats()
+
+@router.get("/news/parse-stats")
+async def get_parse_stats():
+    """Feed/HTML parsing counters: inline vs offloaded to worker processes."""
+    from app.services.parse_pool import parse_pool
+    return parse_pool.get_stats()
 
 @router.post("/fetch-news")
 async def trigger_news_fetch(background_tasks: BackgroundTasks):
@@ -531,7 +572,6 @@ async def analyze_news_for_alerts(background_tasks: BackgroundTasks):
     def generate_alerts_from_news():
         """Background task to analyze news and create alerts"""
         try:
-            from app.services.gemini_client import GeminiClient
             from app.services.database import get_db_connection
             import uuid
             
@@ -549,14 +589,11 @@ async def analyze_news_for_alerts(background_tasks: BackgroundTasks):
                 return
             
             # Get recent articles (from our multi-source feed)
-            from app.services.news_aggregator import NewsIngestionLayer
-            news_layer = NewsIngestionLayer()
+            from app.services.news_aggregator import news_aggregator_layer
             tickers = [p['ticker'] for p in portfolio]
             query = " OR ".join(tickers)
             
-            articles = []
-            articles.extend(news_layer.fetch_news_api(query) or [])
-            articles.extend(news_layer.fetch_finnhub(query) or [])
+            articles = news_aggregator_layer.fetch_all_sources(tickers, query, sources=["newsapi", "finnhub"])["articles"]
             
             logger.info(f"📰 Analyzing {len(articles)} articles for portfolio impact...")
             
@@ -566,33 +603,28 @@ async def analyze_news_for_alerts(background_tasks: BackgroundTasks):
             from datetime import datetime
             
             pipeline = Pipeline()
-            alerts_generated = 0
-            
+            batch = []
             for article_data in articles[:5]:  # Limit to 5 most recent
                 try:
                     # Convert to Article model
-                    article_obj = Article(
+                    batch.append(Article(
                         title=article_data.get('title', 'Unknown'),
                         url=article_data.get('url', 'http://unknown.com'),
                         source=article_data.get('source', 'Unknown'),
                         published_at=datetime.now(), # Default to now if missing
                         content=article_data.get('content') or article_data.get('description', ''),
                         companies_mentioned=[]
-                    )
-                    
-                    # Execute Pipeline (Validates -> Extracts Relations -> Infers Cascade -> Calculates Impact -> Saves Alert)
-                    logger.info(f"🚀 Pipeline executing for: {article_obj.title[:50]}...")
-                    alert = pipeline.process_article(article_obj)
-                    
-                    if alert:
-                        alerts_generated += 1
-                        logger.info(f"✅ Generated alert: {alert.id}")
-                    else:
-                        logger.info(f"⏭️ No alert generated for article (Filtered/Low Confidence)")
-                        
+                    ))
                 except Exception as e:
                     logger.error(f"Error processing article in pipeline: {e}")
                     continue
+
+            # Execute Pipeline (Validates -> Extracts Relations in one batched request -> Infers Cascade -> Calculates Impact -> Saves Alert)
+            logger.info(f"🚀 Pipeline executing for {len(batch)} articles...")
+            alerts = pipeline.process_articles(batch)
+            for alert in alerts:
+                logger.info(f"✅ Generated alert: {alert.id}")
+            alerts_generated = len(alerts)
             
             logger.info(f"🎉 Alert generation complete! Created {alerts_generated} alerts")
             
@@ -606,3 +638,52 @@ async def analyze_news_for_alerts(background_tasks: BackgroundTasks):
         "status": "started",
         "message": "Analyzing news articles for portfolio impacts in background..."
     }
+
+# --- LLM GATEWAY ---
+@router.get("/llm/cache-stats")
+async def get_llm_cache_stats():
+    """LLM response cache hit/miss counters."""
+    from app.services.llm_cache import llm_cache
+    return llm_cache.get_stats()
+
+@router.get("/llm/rate-limits")
+async def get_llm_rate_limits():
+    """Shared per-provider-key token bucket state."""
+    from app.services.rate_limiter import provider_limiters
+    return provider_limiters.get_stats()
+
+@router.get("/llm/scheduler")
+async def get_llm_scheduler_stats():
+    """Priority queue depth and throughput of the LLM request scheduler."""
+    from app.services.llm_scheduler import llm_scheduler
+    return llm_scheduler.get_stats()
+
+@router.get("/llm/coalescing")
+async def get_llm_coalescing_stats():
+    """In-flight request coalescing counters for identical LLM prompts."""
+    from app.services.singleflight import llm_singleflight
+    return llm_singleflight.get_stats()
+
+@router.get("/llm/routing")
+async def get_llm_routing_stats():
+    """Rolling latency/error/429 stats and circuit state per model and API key."""
+    from app.services.gemini_client import gemini_client
+    return gemini_client.router.get_stats()
+
+@router.get("/llm/hedging")
+async def get_llm_hedging_stats():
+    """Hedged-request counters and remaining hedge budget."""
+    from app.services.gemini_client import gemini_client
+    return gemini_client.get_hedge_stats()
+
+@router.get("/llm/reuse")
+async def get_llm_reuse_stats():
+    """Near-duplicate article reuse counters (LLM calls avoided for syndicated stories)."""
+    from app.services.analysis_reuse import analysis_reuse
+    return analysis_reuse.get_stats()
+
+@router.get("/llm/usage")
+def get_llm_usage(days: int = 7):
+    """LLM usage ledger: requests, tokens, latency and cost per day, model and caller."""
+    from app.services.usage_tracker import usage_tracker
+    return usage_tracker.get_summary(days)
@@ -128,6 +128,57 @@ NEWSDATA_RATE_LIMIT = 200  # requests per day
 FINNHUB_BASE_URL = "https://finnhub.io/api/v1"
 FINNHUB_RATE_LIMIT = 60  # requests per minute (free tier) - SAFE for 5-min intervals
 
+GNEWS_RATE_LIMIT = 100  # requests per day (free tier)
+
+# Quota budgeter: calls per source and window, persisted; daily quotas are paced over the day
+SOURCE_QUOTAS: Dict[str, Dict[str, int]] = {
+    "newsapi": {"limit": NEWSAPI_RATE_LIMIT, "window": 86400},
+    "newsdata": {"limit": NEWSDATA_RATE_LIMIT, "window": 86400},
+    "gnews": {"limit": GNEWS_RATE_LIMIT, "window": 86400},
+    "finnhub": {"limit": FINNHUB_RATE_LIMIT, "window": 60},
+}
+QUOTA_ENFORCED = os.getenv("QUOTA_ENFORCED", "True").lower() == "true"
+QUOTA_PACING_BURST = int(os.getenv("QUOTA_PACING_BURST", 3))  # calls allowed ahead of the even daily pace
+
+# Concurrent ingestion: every source is fetched at once, late sources are dropped
+INGEST_CONCURRENT = os.getenv("INGEST_CONCURRENT", "True").lower() == "true"
+INGEST_DEADLINE_SECONDS = float(os.getenv("INGEST_DEADLINE_SECONDS", 12))  # global budget for one fan-out
+INGEST_MAX_WORKERS = int(os.getenv("INGEST_MAX_WORKERS", 16))  # shared fetch pool size
+
+# Hacker News: item payloads are cached by ID, only new top-story IDs hit the API
+HN_FETCH_WORKERS = int(os.getenv("HN_FETCH_WORKERS", 8))  # concurrent item requests
+HN_ITEM_CACHE_MAX_ITEMS = int(os.getenv("HN_ITEM_CACHE_MAX_ITEMS", 2000))
+
+# Canonical URLs of articles already sent to the LLM pipeline (Bloom filter + SQLite)
+URL_INDEX_TTL_SECONDS = int(os.getenv("URL_INDEX_TTL_SECONDS", 14 * 24 * 3600))  # 14 days
+URL_INDEX_BLOOM_CAPACITY = int(os.getenv("URL_INDEX_BLOOM_CAPACITY", 200000))
+URL_INDEX_BLOOM_FP_RATE = float(os.getenv("URL_INDEX_BLOOM_FP_RATE", 0.01))
+
+# Full-text scraping: one request per domain per interval, domains scraped in parallel
+SCRAPE_DOMAIN_INTERVAL_SECONDS = float(os.getenv("SCRAPE_DOMAIN_INTERVAL_SECONDS", 1.0))  # floor; robots Crawl-delay can raise it
+SCRAPE_MAX_WORKERS = int(os.getenv("SCRAPE_MAX_WORKERS", 6))  # domains scraped at once
+SCRAPE_TIMEOUT_SECONDS = float(os.getenv("SCRAPE_TIMEOUT_SECONDS", 10))
+SCRAPE_ROBOTS_TTL_SECONDS = int(os.getenv("SCRAPE_ROBOTS_TTL_SECONDS", 24 * 3600))
+SCRAPE_FAILURE_RETRY_SECONDS = int(os.getenv("SCRAPE_FAILURE_RETRY_SECONDS", 6 * 3600))  # empty/failed scrapes
+
+# /articles news snapshot: one shared fan-out per ticker set, refreshed in the background
+NEWS_SNAPSHOT_TTL_SECONDS = int(os.getenv("NEWS_SNAPSHOT_TTL_SECONDS", 900))  # fresh for 15 min, then refreshed
+NEWS_SNAPSHOT_MAX_STALE_SECONDS = int(os.getenv("NEWS_SNAPSHOT_MAX_STALE_SECONDS", 6 * 3600))  # older = refetch inline
+NEWS_SNAPSHOT_IDLE_SECONDS = int(os.getenv("NEWS_SNAPSHOT_IDLE_SECONDS", 3600))  # unrequested sets stop refreshing
+NEWS_SNAPSHOT_MAX_KEYS = int(os.getenv("NEWS_SNAPSHOT_MAX_KEYS", 32))
+
+# Outbound HTTP for news APIs, feeds, scraping and SEC: per-host keep-alive pools, jittered retries
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", 3.05))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", 10))  # default; callers may pass their own
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", 16))  # keep-alive connections per host
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", 2))  # idempotent requests only
+HTTP_BACKOFF_BASE_SECONDS = float(os.getenv("HTTP_BACKOFF_BASE_SECONDS", 0.5))
+HTTP_BACKOFF_MAX_SECONDS = float(os.getenv("HTTP_BACKOFF_MAX_SECONDS", 8))
+
+# Feed/HTML parsing off the request threads: 0 workers parses inline (default)
+PARSE_POOL_WORKERS = int(os.getenv("PARSE_POOL_WORKERS", 0))  # worker processes
+PARSE_POOL_MIN_BYTES = int(os.getenv("PARSE_POOL_MIN_BYTES", 64 * 1024))  # smaller documents are not worth the IPC
+
 # ═══════════════════════════════════════════════════════════════════════════
 # GEMINI API CONFIGURATION - HACKATHON MODE (Free Tier)
 # ═══════════════════════════════════════════════════════════════════════════
@@ -144,6 +195,73 @@ GEMINI_TEMPERATURE = 0.2  # Lower temperature for more deterministic outputs
 GEMINI_TIMEOUT = 30  # Timeout for API calls
 GEMINI_MAX_RETRIES = 2  # Reduced from 3 to conserve budget
 
+# Shared token buckets (one per provider API key, process-wide)
+OPENROUTER_RATE_LIMIT_PER_KEY = int(os.getenv("OPENROUTER_RATE_LIMIT_PER_KEY", 30))  # requests per minute
+LLM_RATE_LIMIT_BURST = int(os.getenv("LLM_RATE_LIMIT_BURST", 3))  # max back-to-back requests per key
+LLM_SCHEDULER_WORKERS = int(os.getenv("LLM_SCHEDULER_WORKERS", 4))  # workers draining the priority queue
+
+# Pooled async HTTP transport for OpenRouter (keep-alive, HTTP/2 when h2 is installed)
+LLM_HTTP_TIMEOUT = float(os.getenv("LLM_HTTP_TIMEOUT", 30))  # seconds per request
+LLM_HTTP_CONNECT_TIMEOUT = float(os.getenv("LLM_HTTP_CONNECT_TIMEOUT", 5))
+LLM_HTTP_MAX_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", 20))
+LLM_HTTP_MAX_KEEPALIVE = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", 10))
+LLM_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", 60))  # idle seconds before closing
+
+# Model/key routing on rolling latency, error and 429 rates (circuit breaker per target)
+LLM_ROUTER_WINDOW_SECONDS = int(os.getenv("LLM_ROUTER_WINDOW_SECONDS", 600))  # rolling stats window
+LLM_ROUTER_FAILURE_THRESHOLD = int(os.getenv("LLM_ROUTER_FAILURE_THRESHOLD", 3))  # consecutive failures to open circuit
+LLM_ROUTER_COOLDOWN_SECONDS = float(os.getenv("LLM_ROUTER_COOLDOWN_SECONDS", 60))  # first cooldown, doubles per trip
+LLM_ROUTER_MAX_COOLDOWN_SECONDS = float(os.getenv("LLM_ROUTER_MAX_COOLDOWN_SECONDS", 900))
+
+# Hedged requests: race the next-best model once the primary runs past its usual latency
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "False").lower() == "true"
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", 95))  # of the primary model's observed latency
+LLM_HEDGE_MIN_DELAY_SECONDS = float(os.getenv("LLM_HEDGE_MIN_DELAY_SECONDS", 2.0))  # never hedge earlier than this
+LLM_HEDGE_BUDGET_PER_MINUTE = int(os.getenv("LLM_HEDGE_BUDGET_PER_MINUTE", 4))  # extra requests allowed for hedging
+
+# Fused analysis: one LLM call per article for classification, sentiment, relationships and direct impact
+# (batched extraction packs several articles into one call)
+LLM_FUSED_ANALYSIS = os.getenv("LLM_FUSED_ANALYSIS", "True").lower() == "true"
+LLM_EXTRACTION_BATCH_SIZE = int(os.getenv("LLM_EXTRACTION_BATCH_SIZE", 8))  # articles packed into one extraction prompt
+
+# ═══════════════════════════════════════════════════════════════════════════
+# LLM RESPONSE CACHE
+# ═══════════════════════════════════════════════════════════════════════════
+# Identical prompts (same article, same portfolio) are answered from SQLite
+# instead of spending rate limit and budget on a repeat call.
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "True").lower() == "true"
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", 6 * 3600))  # 6 hours
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 5000))  # LRU-evicted beyond this
+
+# Syndicated copies of a story (different headline/summary) reuse the original's
+# extraction and classification via a local MinHash index
+NEAR_DUP_REUSE_ENABLED = os.getenv("NEAR_DUP_REUSE_ENABLED", "True").lower() == "true"
+NEAR_DUP_SIMILARITY_THRESHOLD = float(os.getenv("NEAR_DUP_SIMILARITY_THRESHOLD", 0.6))  # estimated Jaccard of word 2-shingles
+NEAR_DUP_TTL_SECONDS = int(os.getenv("NEAR_DUP_TTL_SECONDS", 48 * 3600))  # how long an analysis stays reusable
+
+# ═══════════════════════════════════════════════════════════════════════════
+# LLM USAGE LEDGER
+# ═══════════════════════════════════════════════════════════════════════════
+# Append-only SQLite ledger, written off the request path by a background writer
+
+LLM_CREDIT_BUDGET_USD = float(os.getenv("LLM_CREDIT_BUDGET_USD", 10.00))  # prepaid credits tracked against
+USAGE_FLUSH_INTERVAL_SECONDS = float(os.getenv("USAGE_FLUSH_INTERVAL_SECONDS", 2.0))  # max delay before rows hit disk
+
+# ═══════════════════════════════════════════════════════════════════════════
+# HTTP RECORD / REPLAY
+# ═══════════════════════════════════════════════════════════════════════════
+# record: save every upstream exchange (LLM, news APIs, RSS, SEC, yfinance) as a fixture
+# replay: serve those fixtures from a local stub server, offline and deterministic
+
+HTTP_REPLAY_MODE = os.getenv("HTTP_REPLAY_MODE", "off").lower()  # off, record or replay
+HTTP_FIXTURE_DIR = os.getenv("HTTP_FIXTURE_DIR", os.path.join(os.path.dirname(__file__), "data", "http_fixtures"))
+HTTP_REPLAY_LATENCY_MS = float(os.getenv("HTTP_REPLAY_LATENCY_MS", 0))  # injected per-response delay
+HTTP_REPLAY_JITTER_MS = float(os.getenv("HTTP_REPLAY_JITTER_MS", 0))  # plus uniform random 0..jitter
+HTTP_REPLAY_ERROR_RATE = float(os.getenv("HTTP_REPLAY_ERROR_RATE", 0.0))  # fraction answered with 429/503
+HTTP_REPLAY_SEED = int(os.getenv("HTTP_REPLAY_SEED", 42))  # seeds latency/error injection
+HTTP_STUB_PORT = int(os.getenv("HTTP_STUB_PORT", 0))  # 0 = any free port
+
 # ═══════════════════════════════════════════════════════════════════════════
 # DATABASE CONFIGURATION
 # ═══════════════════════════════════════════════════════════════════════════
@@ -216,14 +334,14 @@ AGENT_ROUTING_KEYWORDS = {
 # LOGGING CONFIGURATION
 # ═══════════════════════════════════════════════════════════════════════════
 
+# Log file next to the data; LOG_FILE="" logs to the console only (the test suite sets this)
+LOG_FILE = os.getenv("LOG_FILE", os.path.join(DATA_DIR, 'marketpulse.log'))
+
 # Configure logging
 logging.basicConfig(
     level=getattr(logging, LOG_LEVEL),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler(os.path.join(DATA_DIR, 'marketpulse.log'))
-    ]
+    handlers=[logging.StreamHandler()] + ([logging.FileHandler(LOG_FILE)] if LOG_FILE else [])
 )
 
 logger = logging.getLogger(__name__)
@@ -66,6 +66,10 @@ async def startup_event():
     logger.info("🚀 MARKETPULSE-X STARTING UP")
     logger.info("="*70)
 
+    # Record or replay upstream HTTP (HTTP_REPLAY_MODE=record/replay; off by default)
+    from app.services.http_replay import http_recorder
+    http_recorder.install()
+
     # Initialize database
     from app.services.database import init_db
     init_db()
@@ -88,6 +92,22 @@ async def shutdown_event():
     logger.info("="*70)
     logger.info("🛑 MARKETPULSE-X SHUTTING DOWN")
     logger.info("="*70)
+
+    # Release pooled LLM connections
+    from app.services.llm_transport import llm_transport
+    llm_transport.close()
+
+    # Release pooled outbound HTTP connections
+    from app.services.http_client import http_client
+    http_client.close()
+
+    # Stop parse worker processes (if any were started)
+    from app.services.parse_pool import parse_pool
+    parse_pool.close()
+
+    # Drain buffered usage ledger rows
+    from app.services.usage_tracker import usage_tracker
+    usage_tracker.flush()
     logger.info("✅ MarketPulse-X shut down successfully")
     logger.info("="*70 + "\n")
 
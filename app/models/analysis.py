@@ -0,0 +1,102 @@
+"""
+Article Analysis Model
+Validated schema for the fused single-call analysis (classification, sentiment,
+relationships and direct portfolio impact)
+"""
+
+from typing import Dict, List
+from pydantic import BaseModel, Field
+
+from app.models.factors import MarketFactor, FACTOR_METADATA
+
+
+class ExtractedRelationship(BaseModel):
+    """A company-to-company relationship found in the article"""
+    from_company: str
+    to_company: str
+    relationship_type: str = "supply_chain"
+    confidence: float = Field(0.0, ge=0.0, le=1.0)
+    description: str = ""
+
+
+class DirectImpact(BaseModel):
+    """Direct effect of the article on portfolio holdings"""
+    has_direct_impact: bool = False
+    affected_companies: List[str] = Field(default_factory=list)
+    impact_type: str = "neutral"  # positive / negative / neutral
+    severity: str = "low"  # low / medium / high
+    reasoning: str = ""
+
+
+class ArticleAnalysis(BaseModel):
+    """Fused LLM analysis of one article"""
+
+    # Classification (same fields as ClassificationService.classify_article)
+    factor_name: str
+    sentiment: str = "neutral"
+    sentiment_score: float = Field(0.0, ge=-1.0, le=1.0)
+    confidence: float = Field(0.85, ge=0.0, le=1.0)
+    reasoning: str = ""
+    affected_sectors: List[str] = Field(default_factory=list)
+
+    # Relationship extraction (same fields as GeminiClient.extract_relationships)
+    event_type: str = "news"
+    summary: str = ""
+    relationships: List[ExtractedRelationship] = Field(default_factory=list)
+
+    direct_impact: DirectImpact = Field(default_factory=DirectImpact)
+
+    def factor_type(self) -> int:
+        """MarketFactor value for factor_name (market sentiment if unrecognised)"""
+        for factor, meta in FACTOR_METADATA.items():
+            if meta["name"].lower() == self.factor_name.lower():
+                return factor.value
+        return MarketFactor.MARKET_SENTIMENT.value
+
+    def to_classification(self) -> Dict:
+        """Dict in the shape returned by ClassificationService.classify_article"""
+        return {
+            "factor_type": self.factor_type(),
+            "factor_name": self.factor_name,
+            "sentiment": self.sentiment.lower(),
+            "sentiment_score": self.sentiment_score,
+            "reasoning": self.reasoning or "LLM Analysis Complete",
+            "confidence": self.confidence,
+            "affected_sectors": list(self.affected_sectors)
+        }
+
+    def to_extraction(self) -> Dict:
+        """Dict in the shape returned by GeminiClient.extract_relationships"""
+        return {
+            "relationships": [
+                {
+                    "from_company": rel.from_company,
+                    "to_company": rel.to_company,
+                    "relationship_type": rel.relationship_type,
+                    "confidence": rel.confidence,
+                    "description": rel.description
+                }
+                for rel in self.relationships
+            ],
+            "event_type": self.event_type,
+            "summary": self.summary
+        }
+
+    def to_direct_impact(self) -> Dict:
+        """Dict in the shape returned by GeminiClient.detect_direct_impact"""
+        impact = self.direct_impact
+        return {
+            "has_direct_impact": impact.has_direct_impact,
+            "affected_companies": list(impact.affected_companies),
+            "impact_type": impact.impact_type,
+            "severity": impact.severity,
+            "reasoning": impact.reasoning
+        }
+
+    def to_dict(self) -> Dict:
+        """Flat dict combining classification, extraction and direct impact"""
+        return {
+            **self.to_classification(),
+            **self.to_extraction(),
+            "direct_impact": self.to_direct_impact()
+        }
@@ -4,7 +4,7 @@ Continuously processes news and generates alerts based on portfolio impact
 Uses the sophisticated 7-Stage Pipeline for consistent logic.
 """
 import logging
-from typing import List, Dict, Any
+from typing import Iterable, List, Dict, Optional
 from datetime import datetime
 import uuid
 
@@ -26,37 +26,63 @@ class AlertGenerator:
 
         Returns number of alerts created.
         """
-        alerts_created = 0
-        
         logger.info(f"⚡ AlertGenerator: Processing {len(news_articles)} articles via Pipeline...")
 
+        articles = []
         for article_data in news_articles:
             try:
                 # Convert dict to Article object required by Pipeline
                 # Handle potentially missing fields gracefully
-                article_obj = Article(
+                articles.append(Article(
                     title=article_data.get('title', 'Unknown News'),
                     url=article_data.get('url', 'http://unknown.source'),
                     source=article_data.get('source', 'Unknown Source'),
                     published_at=datetime.now(), # Default
                     content=article_data.get('content') or article_data.get('description', '') or article_data.get('title', ''),
                     companies_mentioned=[] # Pipeline will extract this
-                )
-                
-                # Execute Pipeline
-                # This performs: Validation -> Relation Extraction -> Cascade Inference -> Impact Calc -> Persistence
-                alert = self.pipeline.process_article(article_obj)
-
-                if alert:
-                    alerts_created += 1
-                    logger.info(f"✅ Alert Created via Pipeline: {alert.id}")
-            
+                ))
             except Exception as e:
                 logger.error(f"Error processing article '{article_data.get('title', 'Unknown')}': {e}")
                 continue
 
+        # Execute Pipeline
+        # Relation extraction is batched across articles; then per article:
+        # Validation -> Cascade Inference -> Impact Calc -> Persistence
+        alerts = self.pipeline.process_articles(articles)
+        for alert in alerts:
+            logger.info(f"✅ Alert Created via Pipeline: {alert.id}")
+
+        alerts_created = len(alerts)
         logger.info(f"✅ Alert Generation Complete. Total New Alerts: {alerts_created}")
         return alerts_created
 
+    def generate_alerts_from_stream(self, batches: Iterable[List[Article]], max_articles: Optional[int] = None) -> int:
+        """
+        Run the Pipeline on each batch as ingestion streams it in (see NewsIngestionLayer.stream_batches),
+        so LLM work on early sources overlaps fetching the slower ones.
+
+        max_articles: stop after this many (default: every article of every batch). Incremental
+        batches (ArticleBatch) are committed after processing, so their cursors only move past what
+        the Pipeline finished; articles cut here or left unfinished are fetched again next cycle.
+
+        Returns number of alerts created.
+        """
+        alerts_created, processed = 0, 0
+        for batch in batches:
+            todo = batch if max_articles is None else batch[:max_articles - processed]
+            processed += len(todo)
+            alerts = self.pipeline.process_articles(todo)
+            for alert in alerts:
+                logger.info(f"✅ Alert Created via Pipeline: {alert.id}")
+            alerts_created += len(alerts)
+            commit = getattr(batch, "commit", None)
+            if commit:
+                commit(self.pipeline.unfinished(todo) + batch[len(todo):])
+            if max_articles is not None and processed >= max_articles:
+                break  # closes the stream; sources still in flight are abandoned
+
+        logger.info(f"✅ Streamed Alert Generation Complete. {processed} articles, {alerts_created} new alerts")
+        return alerts_created
+
 # Global instance
 alert_generator = AlertGenerator()
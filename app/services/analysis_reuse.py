@@ -0,0 +1,222 @@
+"""
+Near-Duplicate Analysis Reuse
+Local MinHash index over recently analyzed articles; a syndicated copy of a story
+reuses the original's LLM extraction/classification and records the reuse link
+"""
+
+import json
+import logging
+import time
+from collections import deque
+from datetime import datetime
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import (
+    NEAR_DUP_REUSE_ENABLED, NEAR_DUP_SIMILARITY_THRESHOLD, NEAR_DUP_TTL_SECONDS
+)
+from app.services.database import get_db_connection
+from app.services.minhash import MinHasher, LSHIndex, shingles
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 64
+BANDS = 16
+
+
+def portfolio_kind(kind: str, holdings) -> str:
+    """Kind key for results that depend on the portfolio (e.g. direct impact)"""
+    return f"{kind}:{','.join(sorted(set(holdings or [])))}"
+
+
+class AnalysisReuseIndex:
+    """Finds a recent near-identical article whose LLM result can be reused"""
+
+    def __init__(self, threshold: float = NEAR_DUP_SIMILARITY_THRESHOLD,
+                 ttl_seconds: int = NEAR_DUP_TTL_SECONDS, enabled: bool = NEAR_DUP_REUSE_ENABLED):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.hasher = MinHasher(NUM_PERM)
+        self.indexes: Dict[str, LSHIndex] = {}
+        self.entries: Dict[int, Dict] = {}  # row id -> {kind, article_id, created_at, result}
+        self.order = deque()  # (created_at, row id), oldest first
+        self.lock = Lock()
+        self.loaded = False
+        self.stats = {"lookups": 0, "reused": 0, "stored": 0}
+
+    def _ensure_tables(self, cursor):
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS analysis_index (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                article_id TEXT,
+                signature TEXT NOT NULL,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_analysis_index_created ON analysis_index(created_at)")
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS analysis_reuse_links (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                article_id TEXT,
+                source_article_id TEXT,
+                kind TEXT,
+                similarity REAL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+    def _signature(self, title: str, content: str):
+        return self.hasher.signature(shingles(f"{title} {(content or '')[:1500]}"))
+
+    def _add_entry(self, row_id: int, kind: str, article_id: Optional[str], signature, result: Any, created_at: float):
+        # Called with self.lock held
+        self.entries[row_id] = {"kind": kind, "article_id": article_id, "created_at": created_at, "result": result}
+        self.order.append((created_at, row_id))
+        self.indexes.setdefault(kind, LSHIndex(NUM_PERM, BANDS)).add(row_id, signature)
+
+    def _load(self):
+        """Warm the in-memory index from rows still inside the TTL window"""
+        if self.loaded:
+            return
+        cutoff = time.time() - self.ttl_seconds
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        self._ensure_tables(cursor)
+        cursor.execute("DELETE FROM analysis_index WHERE created_at < ?", (cutoff,))
+        conn.commit()
+        cursor.execute(
+            "SELECT id, kind, article_id, signature, result, created_at FROM analysis_index ORDER BY created_at"
+        )
+        rows = cursor.fetchall()
+        conn.close()
+
+        for row in rows:
+            try:
+                self._add_entry(row["id"], row["kind"], row["article_id"], tuple(json.loads(row["signature"])),
+                                json.loads(row["result"]), row["created_at"])
+            except (ValueError, TypeError):
+                continue
+        self.loaded = True
+        if rows:
+            logger.info(f"🧬 Loaded {len(rows)} analyzed articles into near-duplicate index")
+
+    def _expire(self, now: float):
+        # Called with self.lock held
+        cutoff = now - self.ttl_seconds
+        while self.order and self.order[0][0] < cutoff:
+            _, row_id = self.order.popleft()
+            entry = self.entries.pop(row_id, None)
+            if entry:
+                self.indexes[entry["kind"]].remove(row_id)
+
+    def find(self, kind: str, title: str, content: str) -> Optional[Dict]:
+        """
+        Most similar recent article analyzed under `kind`
+
+        Returns:
+            {"article_id", "similarity", "result"} or None
+        """
+        if not self.enabled:
+            return None
+        signature = self._signature(title, content)
+        with self.lock:
+            self._load()
+            self._expire(time.time())
+            self.stats["lookups"] += 1
+            index = self.indexes.get(kind)
+            matches = index.query(signature, self.threshold) if index else []
+            if not matches:
+                return None
+            row_id, similarity = matches[0]
+            entry = self.entries[row_id]
+            return {"article_id": entry["article_id"], "similarity": similarity, "result": entry["result"]}
+
+    def reuse(self, kind: str, article_id: Optional[str], title: str, content: str) -> Optional[Any]:
+        """Return a near-duplicate's stored result (recording the link), or None"""
+        try:
+            match = self.find(kind, title, content)
+        except Exception as e:
+            logger.warning(f"Near-duplicate lookup failed: {e}")
+            return None
+        if match is None:
+            return None
+
+        self.record_link(article_id, match["article_id"], kind, match["similarity"])
+        return match["result"]
+
+    def record_link(self, article_id: Optional[str], source_article_id: Optional[str], kind: str, similarity: float):
+        """Persist that article_id reused source_article_id's result"""
+        with self.lock:
+            self.stats["reused"] += 1
+        logger.info(f"♻️ Reusing {kind} from near-duplicate article {source_article_id} (similarity {similarity:.2f})")
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            self._ensure_tables(cursor)
+            cursor.execute(
+                "INSERT INTO analysis_reuse_links (article_id, source_article_id, kind, similarity, created_at) VALUES (?, ?, ?, ?, ?)",
+                (article_id, source_article_id, kind, similarity, datetime.now())
+            )
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Could not record reuse link: {e}")
+
+    def cluster(self, articles: List[Any]) -> Dict[str, Tuple[str, float]]:
+        """
+        Group near-duplicates within one batch (objects with .id, .title, .content)
+
+        Returns:
+            {follower_id: (leader_id, similarity)}; the first article of a group leads
+        """
+        if not self.enabled:
+            return {}
+        index = LSHIndex(NUM_PERM, BANDS)
+        followers = {}
+        for article in articles:
+            signature = self._signature(article.title, article.content)
+            matches = index.query(signature, self.threshold)
+            if matches:
+                followers[article.id] = matches[0]
+            else:
+                index.add(article.id, signature)
+        return followers
+
+    def remember(self, kind: str, article_id: Optional[str], title: str, content: str, result: Any):
+        """Index a freshly computed LLM result so later near-duplicates can reuse it"""
+        if not self.enabled or result is None:
+            return
+        try:
+            signature = self._signature(title, content)
+            created_at = time.time()
+            with self.lock:
+                self._load()
+                conn = get_db_connection()
+                cursor = conn.cursor()
+                self._ensure_tables(cursor)
+                cursor.execute(
+                    "INSERT INTO analysis_index (kind, article_id, signature, result, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (kind, article_id, json.dumps(signature), json.dumps(result, default=str), created_at)
+                )
+                row_id = cursor.lastrowid
+                conn.commit()
+                conn.close()
+                self._add_entry(row_id, kind, article_id, signature, result, created_at)
+                self.stats["stored"] += 1
+        except Exception as e:
+            logger.warning(f"Could not index analysis for reuse: {e}")
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            stats = dict(self.stats)
+            stats["indexed"] = len(self.entries)
+        stats["reuse_rate"] = round(stats["reused"] / stats["lookups"], 4) if stats["lookups"] else 0.0
+        stats["threshold"] = self.threshold
+        return stats
+
+
+# Singleton
+analysis_reuse = AnalysisReuseIndex()
@@ -69,7 +69,7 @@ scheduler = BackgroundScheduler()
 def start_background_tasks():
     """Initialize and start all background tasks."""
     from app.services.alert_generator import alert_generator
-    from app.services.news_aggregator import NewsIngestionLayer
+    from app.services.news_aggregator import news_aggregator_layer
     from app.services.database import get_db_connection
 
     def news_to_alerts_job():
@@ -87,19 +87,17 @@ def start_background_tasks():
                 return
 
             # Fetch news
-            news_layer = NewsIngestionLayer()
             tickers = [p['ticker'] for p in portfolio]
             query = " OR ".join(tickers)
 
-            articles = []
-            articles.extend(news_layer.fetch_news_api(query) or [])
-            articles.extend(news_layer.fetch_finnhub(query) or [])
-            articles.extend(news_layer.fetch_gnews(query) or [])
+            # Incremental: each cycle only sees items newer than what the previous one processed.
+            # Streamed: the pipeline starts on the first source to answer, not the slowest
+            batches = news_aggregator_layer.stream_batches(
+                tickers, query, sources=["newsapi", "finnhub", "gnews"], incremental=True
+            )
 
-            logger.info(f"📰 Fetched {len(articles)} news articles")
-
-            # Generate alerts
-            alerts_count = alert_generator.generate_alerts_from_news(articles[:20], portfolio)
+            # Generate alerts: each batch commits its source's cursor once the Pipeline is done with it
+            alerts_count = alert_generator.generate_alerts_from_stream(batches)
             logger.info(f"✅ Generated {alerts_count} alerts")
 
         except Exception as e:
@@ -109,6 +107,7 @@ def start_background_tasks():
         """Update relationships for portfolio companies."""
         try:
             from app.agents.nodes import agent_3b_discovery
+            from app.services.llm_scheduler import llm_priority, PRIORITY_LOW
 
             conn = get_db_connection()
             cursor = conn.cursor()
@@ -121,7 +120,9 @@ def start_background_tasks():
             for ticker in tickers:
                 try:
                     state = {"portfolio": tickers}
-                    agent_3b_discovery(state)
+                    # Bulk refresh must never delay interactive LLM requests
+                    with llm_priority(PRIORITY_LOW):
+                        agent_3b_discovery(state)
                 except Exception as e:
                     logger.error(f"Relationship update failed for {ticker}: {e}")
 
@@ -130,8 +131,25 @@ def start_background_tasks():
         except Exception as e:
             logger.error(f"Relationship update job failed: {e}")
 
+    def news_snapshot_job():
+        """Keep /articles snapshots warm (holdings plus recently requested ticker sets)."""
+        try:
+            from app.services.news_snapshot import news_snapshot
+
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute("SELECT ticker FROM holdings")
+            news_snapshot.track(row['ticker'] for row in cursor.fetchall())
+            conn.close()
+
+            news_snapshot.refresh_due()
+
+        except Exception as e:
+            logger.error(f"News snapshot job failed: {e}")
+
     # Schedule tasks
     scheduler.add_task("News-to-Alerts", news_to_alerts_job, interval_seconds=300)  # Every 5 min
+    scheduler.add_task("News-Snapshot", news_snapshot_job, interval_seconds=60)  # Refreshes only sets past their TTL
     scheduler.add_task("Relationship-Updates", relationship_update_job, interval_seconds=3600)  # Every hour
 
     # Start scheduler
@@ -1,9 +1,11 @@
 import logging
 import json
 import re
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from app.config import LLM_FUSED_ANALYSIS
 from app.models.factors import MarketFactor, FACTOR_METADATA
-from app.services.gemini_client import GeminiClient
+from app.services.gemini_client import GeminiClient, gemini_client
+from app.services.analysis_reuse import analysis_reuse, portfolio_kind
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +37,7 @@ class ClassificationService:
         """
         
         try:
-            response = self.gemini_client.generate_content(prompt)
+            response = self.gemini_client.generate_content(prompt, caller="classify_article")
             raw_text = response.text.strip()
             
             # Clean JSON from markdown if necessary
@@ -76,4 +78,32 @@ class ClassificationService:
                 "affected_sectors": []
             }
 
-classification_service = ClassificationService(GeminiClient())
+    def analyze_article(self, title: str, content: str, portfolio: Optional[List[str]] = None,
+                        article_id: Optional[str] = None) -> Dict[str, Any]:
+        """Classification plus relationships and direct impact from one fused LLM call.
+
+        Near-duplicates of a recently analyzed article reuse its result. Falls
+        back to classify_article (relationships empty, no direct impact) when
+        fused analysis is disabled or its response fails validation.
+        """
+        kind = portfolio_kind("analysis", portfolio)
+        reused = analysis_reuse.reuse(kind, article_id, title, content)
+        if reused is not None:
+            return reused
+
+        analysis = None
+        if LLM_FUSED_ANALYSIS:
+            analysis = self.gemini_client.analyze_article(content, title, portfolio or [])
+        if analysis is None:
+            return {
+                **self.classify_article(title, content),
+                "relationships": [],
+                "event_type": None,
+                "summary": title,
+                "direct_impact": {"has_direct_impact": False}
+            }
+        result = analysis.to_dict()
+        analysis_reuse.remember(kind, article_id, title, content, result)
+        return result
+
+classification_service = ClassificationService(gemini_client)
@@ -131,6 +131,10 @@ def init_db():
             expires_at DATETIME
         )
     ''')
+    try:
+        cursor.execute("ALTER TABLE cache_metadata ADD COLUMN last_accessed DATETIME")
+    except:
+        pass
 
     # 9. Historical Precedents Table (Spec 3.0)
     cursor.execute('''
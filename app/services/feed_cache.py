@@ -0,0 +1,125 @@
+"""
+Feed Validator Cache
+Persists ETag / Last-Modified per RSS/Atom feed (plus the articles last parsed from it)
+so each cycle can send a conditional GET and skip parsing on 304 Not Modified
+"""
+
+import json
+import logging
+from datetime import datetime
+from threading import Lock
+from typing import Dict, List, Optional
+
+from app.services.database import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+
+class FeedValidatorCache:
+    """Per-feed HTTP validators and last parsed articles, memory first then SQLite"""
+
+    def __init__(self):
+        self.entries: Dict[str, Optional[Dict]] = {}  # url -> entry (None = known absent)
+        self.stats: Dict[str, Dict] = {}
+        self.lock = Lock()
+        self._table_ready = False
+
+    def _ensure_table(self, cursor):
+        if self._table_ready:
+            return
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS feed_validators (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                articles TEXT,
+                content_length INTEGER DEFAULT 0,
+                updated_at DATETIME
+            )
+        ''')
+        self._table_ready = True
+
+    def get(self, url: str) -> Optional[Dict]:
+        """{"etag", "last_modified", "articles", "content_length"} from the last 200, or None"""
+        with self.lock:
+            if url in self.entries:
+                return self.entries[url]
+        entry = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            self._ensure_table(cursor)
+            cursor.execute(
+                "SELECT etag, last_modified, articles, content_length FROM feed_validators WHERE url = ?", (url,)
+            )
+            row = cursor.fetchone()
+            conn.close()
+            if row:
+                entry = {"etag": row["etag"], "last_modified": row["last_modified"],
+                         "articles": json.loads(row["articles"] or "[]"), "content_length": row["content_length"] or 0}
+        except Exception as e:
+            logger.warning(f"Feed validator lookup failed for {url}: {e}")
+        with self.lock:
+            self.entries[url] = entry
+        return entry
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict]) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since for a cached entry"""
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url: str, etag: Optional[str], last_modified: Optional[str], articles: List[Dict],
+              content_length: int):
+        """Remember a fresh 200 response (only feeds that send validators are persisted)"""
+        entry = {"etag": etag, "last_modified": last_modified, "articles": articles, "content_length": content_length}
+        with self.lock:
+            self.entries[url] = entry if (etag or last_modified) else None
+        if not (etag or last_modified):
+            return
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            self._ensure_table(cursor)
+            cursor.execute(
+                "INSERT OR REPLACE INTO feed_validators (url, etag, last_modified, articles, content_length, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, json.dumps(articles, default=str), content_length, datetime.now())
+            )
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Could not persist feed validators for {url}: {e}")
+
+    def record(self, url: str, outcome: str, bytes_downloaded: int = 0, bytes_saved: int = 0):
+        """Count one fetch: outcome is "modified", "not_modified" or "error" """
+        with self.lock:
+            stats = self.stats.setdefault(url, {"requests": 0, "modified": 0, "not_modified": 0, "errors": 0,
+                                                "bytes_downloaded": 0, "bytes_saved": 0})
+            stats["requests"] += 1
+            stats["errors" if outcome == "error" else outcome] += 1
+            stats["bytes_downloaded"] += bytes_downloaded
+            stats["bytes_saved"] += bytes_saved
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            feeds = {url: dict(stats) for url, stats in self.stats.items()}
+        for stats in feeds.values():
+            stats["hit_rate"] = round(stats["not_modified"] / stats["requests"], 4) if stats["requests"] else 0.0
+        requests_total = sum(s["requests"] for s in feeds.values())
+        not_modified = sum(s["not_modified"] for s in feeds.values())
+        return {
+            "requests": requests_total,
+            "not_modified": not_modified,
+            "hit_rate": round(not_modified / requests_total, 4) if requests_total else 0.0,
+            "bytes_saved": sum(s["bytes_saved"] for s in feeds.values()),
+            "feeds": feeds
+        }
+
+
+# Singleton
+feed_cache = FeedValidatorCache()
@@ -7,17 +7,35 @@ WITH ROBUST RATE LIMITING, QUEUING, AND EXPONENTIAL BACKOFF
 import google.generativeai as genai
 import logging
 import json
-import time
 import math
+import time
+from concurrent.futures import Future, as_completed, wait
+from threading import Lock
 from typing import Dict, List, Optional, Any
-import requests
+import asyncio
 from app.config import (
-    GEMINI_API_KEY, GEMINI_MODEL, GEMINI_TEMPERATURE,
-    OPENROUTER_API_KEYS
+    GEMINI_API_KEY, GEMINI_MODEL, GEMINI_TEMPERATURE, GEMINI_TIMEOUT,
+    GEMINI_RATE_LIMIT, OPENROUTER_API_KEYS,
+    OPENROUTER_RATE_LIMIT_PER_KEY, LLM_RATE_LIMIT_BURST,
+    LLM_HEDGE_ENABLED, LLM_HEDGE_PERCENTILE, LLM_HEDGE_MIN_DELAY_SECONDS, LLM_HEDGE_BUDGET_PER_MINUTE,
+    LLM_EXTRACTION_BATCH_SIZE, HTTP_REPLAY_MODE
 )
+from app.models.analysis import ArticleAnalysis
+from app.models.factors import FACTOR_METADATA
+from app.services.llm_cache import llm_cache
+from app.services.usage_tracker import usage_tracker
+from app.services.singleflight import llm_singleflight
+from app.services.rate_limiter import provider_limiters, TokenBucket
+from app.services.model_router import ModelRouter, TIMEOUT
+from app.services.llm_transport import llm_transport
+from app.services.llm_scheduler import llm_scheduler, RetryAfter, current_priority, PRIORITY_LOW
+from app.services.mention_extractor import MentionExtractor
 
 logger = logging.getLogger(__name__)
 
+# Names the heuristic extraction fallback knows about (case-insensitive, word boundaries)
+_heuristic_names = MentionExtractor({name: name for name in ("TSMC", "Apple", "NVIDIA", "AMD", "Samsung", "Foxconn")})
+
 # Budget tracking
 def track_gemini_call():
     """Track LLM API call for budget management"""
@@ -26,13 +44,40 @@ def track_gemini_call():
     except Exception as e:
         logger.warning(f"Could not track LLM budget: {e}")
 
+class MockResponse:
+    """Minimal response object compatible with genai (exposes .text)"""
+
+    def __init__(self, text: str, model: Optional[str] = None, cached: bool = False, coalesced: bool = False,
+                 usage: Optional[Dict] = None):
+        self.text = text
+        self.model = model
+        self.cached = cached
+        self.coalesced = coalesced
+        self.usage = usage or {}  # OpenRouter token counts (prompt_tokens / completion_tokens)
+
+
+def _coalesced_copy(response: Any) -> Any:
+    """Per-caller view of a shared response, flagged so usage is only counted once"""
+    if response is None:
+        return None
+    try:
+        text = response.text
+    except Exception:
+        return None
+    return MockResponse(text, model=getattr(response, "model", None), coalesced=True)
+
+
 class GeminiClient:
-    """Client for interacting with OpenRouter/Gemini with robust queuing and rate limits"""
+    """Client for interacting with OpenRouter/Gemini with robust queuing and rate limits
+
+    Use the process-wide `gemini_client` (or `get_gemini_client()`) rather than
+    constructing new instances: rate limits are enforced per provider key through
+    shared token buckets, and model/key health stats live on the instance.
+    """
 
     def __init__(self):
         """Initialize LLM client with automatic fallback"""
         self.openrouter_api_keys = OPENROUTER_API_KEYS
-        self.current_key_index = 0
         self.use_openrouter = bool(self.openrouter_api_keys)
         self.has_gemini = bool(GEMINI_API_KEY)
         self.openrouter_available = self.use_openrouter
@@ -45,165 +90,154 @@ class GeminiClient:
             "google/gemini-flash-1.5",               # Standard Flash
             "google/gemini-flash-1.5-8b",
         ]
-        self.current_model_index = 0
+        # Per-request model/key choice from rolling latency and error stats
+        self.router = ModelRouter(self.openrouter_models, self.openrouter_api_keys)
         
         # Rate Limiting Configuration
-        self.request_timestamps = []
-        self.requests_per_minute = 30  # Conservative limit
+        # Buckets are shared per provider key across every caller in the process
+        self.requests_per_minute = OPENROUTER_RATE_LIMIT_PER_KEY
         self.max_retries = 3
         self.retry_delay = 2.0  # Seconds
         self.backoff_multiplier = 2.0
+
+        # Hedging: spare requests per minute for racing a slow primary model
+        self.hedge_enabled = LLM_HEDGE_ENABLED
+        self.hedge_budget = TokenBucket(LLM_HEDGE_BUDGET_PER_MINUTE, burst=max(1, LLM_HEDGE_BUDGET_PER_MINUTE // 2))
+        self.hedge_lock = Lock()
+        self.hedge_stats = {"sent": 0, "won": 0, "skipped_budget": 0}
         
         if self.use_openrouter:
-            self.api_key = self.openrouter_api_keys[0]
             self.base_url = "https://openrouter.ai/api/v1"
             logger.info(f"OpenRouter client initialized with {len(self.openrouter_api_keys)} API key(s). Active model: {self.openrouter_models[0]}")
         
         if self.has_gemini:
-            genai.configure(api_key=GEMINI_API_KEY)
+            # REST transport goes through requests, so record/replay can capture it (default is gRPC)
+            genai.configure(api_key=GEMINI_API_KEY, transport="rest" if HTTP_REPLAY_MODE != "off" else None)
             self.gemini_model = genai.GenerativeModel(GEMINI_MODEL) 
             logger.info(f"Gemini fallback initialized with model: {GEMINI_MODEL}")
 
-    def _get_current_key(self):
-        """Get current API key"""
+    def _pick_key(self, exclude=()) -> Optional[str]:
+        """Healthiest API key that has a rate-limit token free right now (else the healthiest)"""
         if not self.openrouter_api_keys:
             return None
-        return self.openrouter_api_keys[self.current_key_index]
-
-    def _rotate_api_key(self):
-        """Rotate to next API key"""
-        if len(self.openrouter_api_keys) <= 1:
-            return
-        prev_index = self.current_key_index
-        self.current_key_index = (self.current_key_index + 1) % len(self.openrouter_api_keys)
-        self.api_key = self.openrouter_api_keys[self.current_key_index]
-        logger.warning(f"🔑 Rotating API key from #{prev_index + 1} to #{self.current_key_index + 1}")
-
-    def _get_current_model(self):
-        return self.openrouter_models[self.current_model_index]
-
-    def _rotate_model(self):
-        """Switch to next available model"""
-        prev_model = self._get_current_model()
-        self.current_model_index = (self.current_model_index + 1) % len(self.openrouter_models)
-        new_model = self._get_current_model()
-        logger.warning(f"🔄 Switching model from {prev_model} to {new_model}")
-
-    def _enforce_rate_limit(self):
-        """Enforce requests per minute limit"""
-        now = time.time()
-        # Clean old timestamps (older than 60s)
-        self.request_timestamps = [t for t in self.request_timestamps if t > now - 60]
-        
-        if len(self.request_timestamps) >= self.requests_per_minute:
-            oldest_request = self.request_timestamps[0]
-            wait_time = (oldest_request + 60) - now
-            if wait_time > 0:
-                logger.warning(f"⏳ Rate limit approaching. Queueing request for {wait_time:.2f}s...")
-                time.sleep(wait_time)
-            # Recursive check/cleanup after sleep
-            self._enforce_rate_limit()
-        else:
-            self.request_timestamps.append(now)
-
-    def _send_openrouter_request_with_backoff(self, payload: Dict, retry_count=0) -> Optional[requests.Response]:
-        """Send request with exponential backoff for 429s"""
-        self._enforce_rate_limit()
-        
+        ranked = self.router.ranked_keys(exclude)
+        for key in ranked:
+            if self._limiter_for_key(key).time_until_available() <= 0:
+                return key
+        return ranked[0]
+
+    def _limiter_for_key(self, api_key: Optional[str]):
+        """Shared token bucket for an OpenRouter key"""
+        return provider_limiters.get("openrouter", api_key, self.requests_per_minute, LLM_RATE_LIMIT_BURST)
+
+    def _send_openrouter(self, payload: Dict, api_key: Optional[str]) -> Future:
+        """Start a single OpenRouter attempt over the pooled transport (no retries, no sleeping)"""
         headers = {
-            "Authorization": f"Bearer {self.api_key}",
+            "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
             "HTTP-Referer": "https://marketpulse.ai",
             "X-Title": "MarketPulse-X"
         }
-        
+        return llm_transport.submit(
+            f"{self.base_url}/chat/completions",
+            headers=headers,
+            json=payload,
+            timeout=GEMINI_TIMEOUT
+        )
+
+    def _hedge_delay(self, model: str) -> Optional[float]:
+        """Seconds to wait on `model` before hedging (None until its latency is known)"""
+        observed = self.router.model_latency_percentile(model, LLM_HEDGE_PERCENTILE)
+        if observed is None:
+            return None
+        return max(observed, LLM_HEDGE_MIN_DELAY_SECONDS)
+
+    def _take_hedge_slot(self, api_key: Optional[str]) -> bool:
+        """Spend one hedge-budget token and one rate-limit token for the hedge's key"""
+        with self.hedge_lock:
+            if self.hedge_budget.time_until_available() > 0 or not self._limiter_for_key(api_key).try_acquire():
+                self.hedge_stats["skipped_budget"] += 1
+                return False
+            self.hedge_budget.try_acquire()
+            self.hedge_stats["sent"] += 1
+            return True
+
+    def get_hedge_stats(self) -> Dict:
+        with self.hedge_lock:
+            stats = dict(self.hedge_stats)
+        stats["enabled"] = self.hedge_enabled
+        stats["win_rate"] = round(stats["won"] / stats["sent"], 4) if stats["sent"] else 0.0
+        stats["budget"] = self.hedge_budget.get_stats()
+        return stats
+
+    def _resolve_generation_params(self, generation_config, kwargs) -> Dict:
+        """Align genai-style generation config with OpenRouter payload fields"""
+        temperature = kwargs.get("temperature", GEMINI_TEMPERATURE)
+        max_tokens = 2000
+        response_mime_type = None
+        if generation_config:
+            if hasattr(generation_config, 'temperature'): temperature = generation_config.temperature
+            if hasattr(generation_config, 'max_output_tokens'): max_tokens = generation_config.max_output_tokens
+            response_mime_type = getattr(generation_config, 'response_mime_type', None)
+        return {"temperature": temperature, "max_tokens": max_tokens, "response_mime_type": response_mime_type}
+
+    def _cache_model_id(self) -> str:
+        """Model identity used in cache keys (primary target, not the fallback that answered)"""
+        if self.use_openrouter:
+            return self.openrouter_models[0]
+        return GEMINI_MODEL
+
+    def _cache_store(self, cache_key: str, response: Any):
+        if response is None:
+            return
         try:
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=30
-            )
-            
-            if response.status_code == 429:
-                if retry_count < self.max_retries:
-                    # Exponential Backoff
-                    wait_time = self.retry_delay * math.pow(self.backoff_multiplier, retry_count)
-                    logger.warning(f"⚠️ 429 Rate Limited. Retrying in {wait_time:.1f}s (Attempt {retry_count + 1}/{self.max_retries})")
-                    time.sleep(wait_time)
-                    return self._send_openrouter_request_with_backoff(payload, retry_count + 1)
-                else:
-                    logger.error(f"❌ Rate limit exceeded after {self.max_retries} retries.")
-                    # Try rotating to next API key if available
-                    if len(self.openrouter_api_keys) > 1:
-                        self._rotate_api_key()
-                        # Retry with new key (reset retry count)
-                        return self._send_openrouter_request_with_backoff(payload, retry_count=0)
-                    return response # Return failing response to trigger model rotation
-
-            if response.status_code in [404, 401, 500, 502, 503]:
-                # Instant rotation for these errors
-                return response
-                
+            text = response.text
+        except Exception:
+            text = None  # Blocked/empty Gemini responses raise on .text
+        if text:
+            llm_cache.set(cache_key, text, model=getattr(response, "model", None))
+
+    def generate_content(self, prompt: str, generation_config=None, use_cache: bool = True,
+                         priority: Optional[int] = None, hedge: Optional[bool] = None,
+                         caller: Optional[str] = None, **kwargs) -> Any:
+        """Content generation: response cache, then in-flight coalescing, then the fallback queue
+
+        hedge: race a second model if the first is slower than usual (defaults to LLM_HEDGE_ENABLED)
+        caller: label for the usage ledger (e.g. "extract_relationships")
+        """
+        started = time.monotonic()
+        params = self._resolve_generation_params(generation_config, kwargs)
+        cache_key = llm_cache.make_key(self._cache_model_id(), prompt, params)
+
+        if use_cache:
+            cached_text = llm_cache.get(cache_key)
+            if cached_text is not None:
+                logger.info("💾 LLM cache hit")
+                return MockResponse(cached_text, cached=True)
+
+        def leader_call():
+            response = self._generate_uncached(prompt, generation_config, params, priority, hedge)
+            if use_cache:
+                self._cache_store(cache_key, response)
             return response
-            
-        except Exception as e:
-            logger.error(f"Network error in OpenRouter request: {e}")
-            if retry_count < self.max_retries:
-                time.sleep(2)
-                return self._send_openrouter_request_with_backoff(payload, retry_count + 1)
-            return None
 
-    def generate_content(self, prompt: str, generation_config=None, **kwargs) -> Any:
-        """Content generation with intelligent fallback queue"""
-        
-        # 1. Try OpenRouter First (if enabled)
-        if self.use_openrouter and self.openrouter_available:
-            # Try rotating through models if one fails
-            attempts_per_call = 3 
-            for _ in range(attempts_per_call):
-                current_model = self._get_current_model()
-                
-                # Align config
-                temperature = kwargs.get("temperature", GEMINI_TEMPERATURE)
-                max_tokens = 2000
-                if generation_config:
-                    if hasattr(generation_config, 'temperature'): temperature = generation_config.temperature
-                    if hasattr(generation_config, 'max_output_tokens'): max_tokens = generation_config.max_output_tokens
-
-                payload = {
-                    "model": current_model,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "temperature": temperature,
-                    "max_tokens": max_tokens
-                }
-
-                # Attempt with Backoff
-                response = self._send_openrouter_request_with_backoff(payload)
-
-                if response and response.status_code == 200:
-                    try:
-                        # Mock a response object compatible with genai
-                        class MockResponse:
-                            def __init__(self, text): self.text = text
-                        
-                        data = response.json()
-                        content = data['choices'][0]['message']['content']
-                        track_gemini_call()
-                        return MockResponse(content)
-                    except Exception as parse_error:
-                        logger.error(f"Failed to parse OpenRouter response: {parse_error}")
-                        # Fall through to rotate
-                
-                # If we get here, it failed. Log and Rotate.
-                code = response.status_code if response else "Error"
-                logger.warning(f"⚠️ OpenRouter error {code} on {current_model}. Rotating...")
-                self._rotate_model()
+        # Identical prompts already in flight share one upstream request
+        response, shared = llm_singleflight.do(cache_key, leader_call)
+        if shared:
+            logger.info("🔗 Coalesced with in-flight identical LLM request")
+            return _coalesced_copy(response)
 
-            logger.warning("⚠️ All OpenRouter models failed for this request. Falling back to Gemini API...")
-        
-        # 2. Fallback to Direct Gemini API
-        if self.has_gemini:
+        _record_usage(prompt, response, caller, (time.monotonic() - started) * 1000)
+        return response
+
+    def _submit_openrouter(self, prompt: str, params: Dict, priority: Optional[int], hedge: Optional[bool] = None):
+        """Queue the OpenRouter leg on the scheduler; returns a Future"""
+        request = _OpenRouterRequest(self, prompt, params, self.hedge_enabled if hedge is None else hedge)
+        return llm_scheduler.submit(request.attempt, priority, request.bucket)
+
+    def _submit_gemini(self, prompt: str, generation_config, priority: Optional[int]):
+        """Queue the direct Gemini fallback on the scheduler; returns a Future"""
+        def gemini_attempt():
             try:
                 logger.info("🔄 Using Gemini API Fallback")
                 return self.gemini_model.generate_content(
@@ -214,9 +248,80 @@ class GeminiClient:
                 logger.error(f"Gemini API error: {e}")
                 # Don't crash, just return None or raise
                 return None
+
+        gemini_bucket = provider_limiters.get("gemini", GEMINI_API_KEY, GEMINI_RATE_LIMIT, LLM_RATE_LIMIT_BURST)
+        return llm_scheduler.submit(gemini_attempt, priority, lambda: gemini_bucket)
+
+    def _generate_uncached(self, prompt: str, generation_config, params: Dict, priority: Optional[int] = None,
+                           hedge: Optional[bool] = None) -> Any:
+        """Intelligent fallback queue: OpenRouter models first, then direct Gemini
+
+        Both legs run on the LLM scheduler's workers, so rate-limit waits and
+        429 backoff never sleep in the calling thread.
+        """
+
+        # 1. Try OpenRouter First (if enabled)
+        if self.use_openrouter and self.openrouter_available:
+            response = self._submit_openrouter(prompt, params, priority, hedge).result()
+            if response is not None:
+                return response
+
+            logger.warning("⚠️ All OpenRouter models failed for this request. Falling back to Gemini API...")
+        
+        # 2. Fallback to Direct Gemini API
+        if self.has_gemini:
+            return self._submit_gemini(prompt, generation_config, priority).result()
         
         return None
 
+    async def _agenerate_uncached(self, prompt: str, generation_config, params: Dict, priority: Optional[int] = None,
+                                  hedge: Optional[bool] = None) -> Any:
+        """Awaitable twin of _generate_uncached: never blocks the event loop"""
+        if self.use_openrouter and self.openrouter_available:
+            response = await asyncio.wrap_future(self._submit_openrouter(prompt, params, priority, hedge))
+            if response is not None:
+                return response
+
+            logger.warning("⚠️ All OpenRouter models failed for this request. Falling back to Gemini API...")
+
+        if self.has_gemini:
+            return await asyncio.wrap_future(self._submit_gemini(prompt, generation_config, priority))
+
+        return None
+
+    async def agenerate_content(self, prompt: str, generation_config=None, use_cache: bool = True,
+                                priority: Optional[int] = None, hedge: Optional[bool] = None,
+                                caller: Optional[str] = None, **kwargs) -> Any:
+        """Async content generation for FastAPI routes and LangGraph nodes
+
+        Same cache, coalescing, scheduler and fallback semantics as generate_content.
+        """
+        started = time.monotonic()
+        if priority is None:
+            priority = current_priority()  # Resolve in the caller's context, not a worker's
+        params = self._resolve_generation_params(generation_config, kwargs)
+        cache_key = llm_cache.make_key(self._cache_model_id(), prompt, params)
+
+        if use_cache:
+            cached_text = await asyncio.to_thread(llm_cache.get, cache_key)
+            if cached_text is not None:
+                logger.info("💾 LLM cache hit")
+                return MockResponse(cached_text, cached=True)
+
+        async def leader_call():
+            response = await self._agenerate_uncached(prompt, generation_config, params, priority, hedge)
+            if use_cache:
+                await asyncio.to_thread(self._cache_store, cache_key, response)
+            return response
+
+        response, shared = await llm_singleflight.ado(cache_key, leader_call)
+        if shared:
+            logger.info("🔗 Coalesced with in-flight identical LLM request")
+            return _coalesced_copy(response)
+
+        _record_usage(prompt, response, caller, (time.monotonic() - started) * 1000)
+        return response
+
     def _parse_json_response(self, text: str) -> Optional[Dict]:
         """Clean and parse JSON from LLM response"""
         try:
@@ -244,12 +349,13 @@ class GeminiClient:
         }
         
         relationships = []
-        text_lower = (article_title + " " + article_text).lower()
+        # One pass over the text for every name (word boundaries, so "pineapple" is not Apple)
+        mentioned = set(_heuristic_names.extract(article_title + " " + article_text))
         
         for key_company, partners in tech_map.items():
-            if key_company.lower() in text_lower:
+            if key_company in mentioned:
                 for partner in partners:
-                    if partner.lower() in text_lower:
+                    if partner in mentioned:
                         relationships.append({
                             "from_company": key_company,
                             "to_company": partner,
@@ -259,9 +365,9 @@ class GeminiClient:
                         })
         
         if not relationships:
-            if "apple" in text_lower:
+            if "Apple" in mentioned:
                  relationships.append({"from_company": "Market", "to_company": "Apple", "relationship_type": "market_sentiment", "confidence": 0.6, "description": "Direct market impact"})
-            elif "nvidia" in text_lower:
+            elif "NVIDIA" in mentioned:
                  relationships.append({"from_company": "Market", "to_company": "NVIDIA", "relationship_type": "market_sentiment", "confidence": 0.6, "description": "Direct market impact"})
 
         return {
@@ -270,8 +376,9 @@ class GeminiClient:
             "summary": article_title
         }
 
-    def extract_relationships(self, article_text: str, article_title: str) -> Optional[Dict]:
-        """Extract company relationships with robust retry logic"""
+    def extract_relationships(self, article_text: str, article_title: str,
+                              priority: Optional[int] = None) -> Optional[Dict]:
+        """Extract company relationships with robust retry logic (priority defaults to the llm_priority() context)"""
         
         prompt = f"""Analyze this news for Supply Chain Disruptions.
 Title: "{article_title}"
@@ -297,7 +404,9 @@ If no specific supply chain relationship is found, leave 'relationships' empty a
                 temperature=0.1,
                 max_output_tokens=1500,
                 response_mime_type="application/json"
-            )
+            ),
+            priority=priority,
+            caller="extract_relationships"
         )
         
         if response and response.text:
@@ -311,6 +420,110 @@ If no specific supply chain relationship is found, leave 'relationships' empty a
         # FINAL FALLBACK
         return self._heuristic_extraction(article_text, article_title)
 
+    def extract_relationships_batch(self, articles: List[Any], portfolio_holdings: Optional[List[str]] = None,
+                                    batch_size: int = LLM_EXTRACTION_BATCH_SIZE,
+                                    priority: Optional[int] = None) -> Dict[str, Dict]:
+        """Extract relationships for several articles per LLM request
+
+        Args:
+            articles: Objects with .id, .title and .content (e.g. Article)
+            portfolio_holdings: If given, each result also carries a 'direct_impact' dict
+            batch_size: Articles packed into one prompt
+            priority: Scheduler priority (defaults to the llm_priority() context)
+
+        Returns:
+            {article.id: result} in the extract_relationships shape; items the
+            batch response misses or mangles are re-extracted one by one
+        """
+        batch_size = max(1, batch_size)
+        results: Dict[str, Dict] = {}
+        for start in range(0, len(articles), batch_size):
+            chunk = articles[start:start + batch_size]
+            parsed = self._extract_batch_chunk(chunk, portfolio_holdings, priority) if len(chunk) > 1 else {}
+
+            for article in chunk:
+                result = parsed.get(article.id)
+                if result is None:
+                    result = self.extract_relationships(article.content, article.title, priority)
+                results[article.id] = result
+
+        return results
+
+    def _extract_batch_chunk(self, chunk: List[Any], portfolio_holdings: Optional[List[str]],
+                             priority: Optional[int] = None) -> Dict[str, Dict]:
+        """One batched extraction request; returns only the items that parsed cleanly"""
+        local_ids = {f"A{i + 1}": article for i, article in enumerate(chunk)}
+        articles_str = "\n\n".join(
+            f'[{local_id}] Title: "{article.title}"\nContent: {article.content[:800]}'
+            for local_id, article in local_ids.items()
+        )
+
+        impact_instruction = ""
+        impact_field = ""
+        if portfolio_holdings:
+            impact_instruction = f"\nAlso assess DIRECT impact of each article on: {', '.join(sorted(set(portfolio_holdings)))}"
+            impact_field = (',\n      "direct_impact": {"has_direct_impact": true/false, "affected_companies": ["TICKER"], '
+                            '"impact_type": "positive/negative/neutral", "severity": "low/medium/high", "reasoning": "brief"}')
+
+        prompt = f"""Analyze each news article below for Supply Chain Disruptions.
+Identify relationships between: Apple, NVIDIA, AMD, Intel, Broadcom, TSMC, Samsung, MediaTek, ARM, ASML.{impact_instruction}
+
+{articles_str}
+
+Return JSON with exactly one entry per article id:
+{{
+  "results": [
+    {{
+      "id": "A1",
+      "relationships": [
+        {{"from_company": "Name", "to_company": "Name", "relationship_type": "supply_chain", "confidence": 0.9, "description": "details"}}
+      ],
+      "event_type": "disruption_or_news",
+      "summary": "brief summary"{impact_field}
+    }}
+  ]
+}}
+
+If no specific supply chain relationship is found for an article, leave its 'relationships' empty array [].
+"""
+        response = self.generate_content(
+            prompt,
+            generation_config=genai.GenerationConfig(
+                temperature=0.1,
+                max_output_tokens=min(8000, 700 * len(chunk)),
+                response_mime_type="application/json"
+            ),
+            priority=priority,
+            caller="extract_relationships_batch"
+        )
+        if not response or not response.text:
+            return {}
+
+        data = self._parse_json_response(response.text)
+        items = data.get("results") if isinstance(data, dict) else None
+        if not isinstance(items, list):
+            logger.warning(f"⚠️ Batched extraction unparseable; falling back for {len(chunk)} articles")
+            return {}
+
+        parsed = {}
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            article = local_ids.get(str(item.get("id", "")).strip("[] "))
+            if article is None or not isinstance(item.get("relationships"), list):
+                continue
+            result = {
+                "relationships": item["relationships"],
+                "event_type": item.get("event_type", "disruption_or_news"),
+                "summary": item.get("summary", article.title)
+            }
+            if portfolio_holdings and isinstance(item.get("direct_impact"), dict):
+                result["direct_impact"] = item["direct_impact"]
+            parsed[article.id] = result
+
+        logger.info(f"✓ Batched extraction: {len(parsed)}/{len(chunk)} articles in one request")
+        return parsed
+
     def _dummy_cascade(self, portfolio_companies: List[str]) -> Dict:
         return {
           "cascade_chain": [],
@@ -346,7 +559,8 @@ Return JSON:
 """
             response = self.generate_content(
                 prompt,
-                generation_config=genai.GenerationConfig(temperature=GEMINI_TEMPERATURE, max_output_tokens=1000)
+                generation_config=genai.GenerationConfig(temperature=GEMINI_TEMPERATURE, max_output_tokens=1000),
+                caller="infer_cascade"
             )
             
             if response and response.text:
@@ -369,18 +583,19 @@ Holdings: {[h['ticker'] for h in affected_holdings]}
 
 Keep it brief (2 sentences)."""
         
-        res = self.generate_content(prompt)
+        res = self.generate_content(prompt, priority=PRIORITY_LOW, caller="generate_explanation")
         return res.text if res else "Impact calculated based on supply chain dependencies."
 
 
-    def detect_direct_impact(self, article_text: str, article_title: str, portfolio_holdings: List[str]) -> Optional[Dict]:
+    def detect_direct_impact(self, article_text: str, article_title: str, portfolio_holdings: List[str],
+                             priority: Optional[int] = None) -> Optional[Dict]:
         """Detect direct impact on portfolio"""
         portfolio_str = ", ".join(portfolio_holdings)
         prompt = f"""Analyze DIRECT impact on: {portfolio_str}
 Title: {article_title}
 Content: {article_text[:500]}
 Return JSON: {{"has_direct_impact": true/false, "affected_companies": ["TICKER"], "impact_type": "positive/negative/neutral", "severity": "low/medium/high", "reasoning": "brief"}}"""
-        response = self.generate_content(prompt)
+        response = self.generate_content(prompt, priority=priority, caller="detect_direct_impact")
         if response and response.text:
             result = self._parse_json_response(response.text)
             if result and result.get('has_direct_impact'):
@@ -388,26 +603,270 @@ Return JSON: {{"has_direct_impact": true/false, "affected_companies": ["TICKER"]
             return result
         return {"has_direct_impact": False}
 
-# Singleton instance
+    def analyze_article(self, article_text: str, article_title: str, portfolio_holdings: List[str],
+                        priority: Optional[int] = None) -> Optional[ArticleAnalysis]:
+        """Fused analysis: factor, sentiment, relationships and direct impact in one call
+
+        Returns None when the response is missing or fails schema validation, so
+        callers can fall back to the individual calls.
+        """
+        factor_names = [meta["name"] for meta in FACTOR_METADATA.values()]
+        # Sorted so every caller with the same holdings shares cache entries
+        portfolio_str = ", ".join(sorted(set(portfolio_holdings))) or "none"
+        prompt = f"""Analyze this financial news article for a portfolio monitor.
+Title: "{article_title}"
+Content: {article_text[:1500]}
+Portfolio: {portfolio_str}
+
+1. Classify it into EXACTLY ONE market factor: {json.dumps(factor_names)}
+2. Sentiment score from -1.0 (extremely negative/disruptive) to +1.0 (extremely positive/growth).
+3. Supply chain relationships between: Apple, NVIDIA, AMD, Intel, Broadcom, TSMC, Samsung, MediaTek, ARM, ASML (empty array if none).
+4. Direct impact on the portfolio tickers.
+
+Return ONLY JSON:
+{{
+  "factor_name": "Exact Factor Name",
+  "sentiment": "positive|negative|neutral",
+  "sentiment_score": 0.0,
+  "confidence": 0.9,
+  "reasoning": "1-2 sentences",
+  "affected_sectors": ["sector"],
+  "event_type": "disruption_or_news",
+  "summary": "brief summary",
+  "relationships": [
+    {{"from_company": "Name", "to_company": "Name", "relationship_type": "supply_chain", "confidence": 0.9, "description": "details"}}
+  ],
+  "direct_impact": {{"has_direct_impact": false, "affected_companies": ["TICKER"], "impact_type": "positive|negative|neutral", "severity": "low|medium|high", "reasoning": "brief"}}
+}}
+"""
+        response = self.generate_content(
+            prompt,
+            generation_config=genai.GenerationConfig(
+                temperature=0.1,
+                max_output_tokens=2000,
+                response_mime_type="application/json"
+            ),
+            priority=priority,
+            caller="analyze_article"
+        )
+        if not response or not response.text:
+            return None
+
+        data = self._parse_json_response(response.text)
+        if not data:
+            return None
+        try:
+            analysis = ArticleAnalysis(**data)
+        except Exception as e:
+            logger.warning(f"Fused analysis failed schema validation: {e}")
+            return None
+
+        logger.info(f"✓ Fused analysis: {analysis.factor_name}, {len(analysis.relationships)} relationships, "
+                    f"direct impact={analysis.direct_impact.has_direct_impact}")
+        return analysis
+
+class _OpenRouterRequest:
+    """One logical OpenRouter call, executed as re-queueable attempts on the scheduler
+
+    Each attempt goes to the best healthy model/key the router knows of. A 429
+    moves to another healthy key, then backs off exponentially; other failures
+    move on to the next-best model (up to 3 models per call). With hedging on,
+    a primary that runs past its usual latency is raced against the next-best model.
+    """
+
+    attempts_per_call = 3
+
+    def __init__(self, client: "GeminiClient", prompt: str, params: Dict, hedge: bool = False):
+        self.client = client
+        self.prompt = prompt
+        self.params = params
+        self.hedge = hedge
+        self.api_key = None
+        self.model = None
+        self.retry_count = 0
+        self.network_retries = 0
+        self.keys_tried = set()    # keys that returned 429 in the current backoff round
+        self.models_tried = set()  # models that failed for this call
+
+    def bucket(self):
+        """Token bucket for the key the next attempt will use"""
+        self.api_key = self.client._pick_key(exclude=self.keys_tried)
+        return self.client._limiter_for_key(self.api_key)
+
+    def _next_model(self, reason: Any) -> Any:
+        logger.warning(f"⚠️ OpenRouter error {reason} on {self.model}. Rerouting...")
+        self.models_tried.add(self.model)
+        if len(self.models_tried) >= self.attempts_per_call:
+            return None
+        self.retry_count = 0
+        self.network_retries = 0
+        self.keys_tried.clear()
+        return RetryAfter(0)
+
+    def _payload(self, model: str) -> Dict:
+        return {
+            "model": model,
+            "messages": [{"role": "user", "content": self.prompt}],
+            "temperature": self.params["temperature"],
+            "max_tokens": self.params["max_tokens"]
+        }
+
+    @staticmethod
+    def _content(future: Future) -> Optional[str]:
+        """Message text of a finished 200 response, else None"""
+        try:
+            response = future.result()
+            if response.status_code != 200:
+                return None
+            return response.json()['choices'][0]['message']['content']
+        except Exception:
+            return None
+
+    @classmethod
+    def _status(cls, future: Future) -> Any:
+        """Router outcome of a finished response future"""
+        if future.cancelled() or future.exception() is not None:
+            return None
+        status = future.result().status_code
+        if status == 200 and cls._content(future) is None:
+            return "invalid_response"
+        return status
+
+    def _race(self, primary: Future, started: float) -> Optional[MockResponse]:
+        """Hedge a slow primary with the next-best model
+
+        Returns the hedge's response if it wins; otherwise None once the
+        primary has finished, leaving its result to the normal handling.
+        """
+        client = self.client
+        delay = client._hedge_delay(self.model)
+        if delay is None:
+            return None
+        if wait([primary], timeout=max(0.0, started + delay - time.monotonic())).done:
+            return None
+
+        hedge_model = client.router.pick_model(exclude=self.models_tried | {self.model})
+        if hedge_model == self.model or hedge_model in self.models_tried:
+            return None
+        hedge_key = client._pick_key()
+        if not client._take_hedge_slot(hedge_key):
+            return None
+
+        logger.info(f"🏁 {self.model} slower than {delay:.1f}s; hedging with {hedge_model}")
+        hedge_started = time.monotonic()
+        hedge = client._send_openrouter(self._payload(hedge_model), hedge_key)
+
+        for future in as_completed([primary, hedge]):
+            if future is primary:
+                if self._content(primary) is not None:
+                    hedge.cancel()
+                    return None
+                continue  # Primary failed: give the hedge a chance before handling it
+
+            content = self._content(hedge)
+            status = self._status(hedge)
+            client.router.record(hedge_model, hedge_key, time.monotonic() - hedge_started, status)
+            if content is not None:
+                if primary.done() and not primary.cancelled():
+                    client.router.record(self.model, None, time.monotonic() - started, self._status(primary))
+                else:
+                    # Out-raced: a failure for the circuit breaker, and a lower bound on its latency
+                    primary.cancel()
+                    client.router.record(self.model, None, time.monotonic() - started, TIMEOUT)
+                with client.hedge_lock:
+                    client.hedge_stats["won"] += 1
+                track_gemini_call()
+                return MockResponse(content, model=hedge_model, usage=hedge.result().json().get('usage'))
+        return None
+
+    def attempt(self) -> Any:
+        client = self.client
+        router = client.router
+        api_key = self.api_key or client._pick_key(exclude=self.keys_tried)
+        self.model = router.pick_model(exclude=self.models_tried)
+
+        started = time.monotonic()
+        pending = client._send_openrouter(self._payload(self.model), api_key)
+        if self.hedge:
+            hedged = self._race(pending, started)
+            if hedged is not None:
+                return hedged
+        try:
+            response = pending.result()
+        except Exception as e:
+            router.record(self.model, api_key, time.monotonic() - started, None)
+            logger.error(f"Network error in OpenRouter request: {e}")
+            if self.network_retries < client.max_retries:
+                self.network_retries += 1
+                return RetryAfter(2)
+            return self._next_model("Error")
+        latency = time.monotonic() - started
+
+        if response.status_code == 429:
+            router.record(self.model, api_key, latency, 429)
+            self.keys_tried.add(api_key)
+            if router.has_healthy_key(exclude=self.keys_tried):
+                logger.warning("⚠️ 429 Rate Limited. Retrying on another API key")
+                return RetryAfter(0)
+            if self.retry_count < client.max_retries:
+                # Exponential Backoff (re-queued, not slept)
+                wait_time = client.retry_delay * math.pow(client.backoff_multiplier, self.retry_count)
+                logger.warning(f"⚠️ 429 Rate Limited. Retrying in {wait_time:.1f}s (Attempt {self.retry_count + 1}/{client.max_retries})")
+                self.retry_count += 1
+                self.keys_tried.clear()
+                return RetryAfter(wait_time)
+            logger.error(f"❌ Rate limit exceeded after {client.max_retries} retries.")
+            return self._next_model(429)
+
+        if response.status_code == 200:
+            try:
+                data = response.json()
+                content = data['choices'][0]['message']['content']
+                router.record(self.model, api_key, latency, 200)
+                track_gemini_call()
+                return MockResponse(content, model=self.model, usage=data.get('usage'))
+            except Exception as parse_error:
+                router.record(self.model, api_key, latency, "invalid_response")
+                logger.error(f"Failed to parse OpenRouter response: {parse_error}")
+                return self._next_model("invalid_response")
+
+        # 404/401/5xx: count against the model/key and reroute
+        router.record(self.model, api_key, latency, response.status_code)
+        return self._next_model(response.status_code)
+
+
+def _record_usage(prompt: str, response, caller: Optional[str] = None, latency_ms: Optional[float] = None):
+    """Queue a completed request for the usage ledger (cache hits and coalesced followers cost nothing)"""
+    if response is None or getattr(response, 'cached', False) or getattr(response, 'coalesced', False):
+        return
+    try:
+        text = response.text or ""
+    except Exception:
+        return  # Blocked/empty Gemini responses raise on .text
+
+    usage = getattr(response, 'usage', None) or {}
+    prompt_tokens = usage.get('prompt_tokens')
+    completion_tokens = usage.get('completion_tokens')
+    metadata = getattr(response, 'usage_metadata', None)  # Direct Gemini responses
+    if metadata is not None and prompt_tokens is None:
+        prompt_tokens = getattr(metadata, 'prompt_token_count', None)
+        completion_tokens = getattr(metadata, 'candidates_token_count', None)
+
+    usage_tracker.log_request(
+        getattr(response, 'model', None) or GEMINI_MODEL,
+        len(prompt),
+        len(text),
+        caller=caller,
+        latency_ms=latency_ms,
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens
+    )
+
+
+# Singleton instance: the process-wide LLM gateway every caller goes through
 gemini_client = GeminiClient()
 
-# Import usage tracker at the top
-from app.services.usage_tracker import usage_tracker
 
-# Override generate_content to add tracking
-_original_generate = GeminiClient.generate_content
-
-def _tracked_generate(self, prompt: str, generation_config=None, **kwargs):
-    """Wrapped generate_content with usage tracking"""
-    response = _original_generate(self, prompt, generation_config, **kwargs)
-    
-    # Log usage if successful
-    if response and hasattr(response, 'text'):
-        input_chars = len(prompt)
-        output_chars = len(response.text) if response.text else 0
-        usage_tracker.log_request("gemini-2.5-flash", input_chars, output_chars)
-    
-    return response
-
-# Monkey patch
-GeminiClient.generate_content = _tracked_generate
+def get_gemini_client() -> GeminiClient:
+    """Return the shared LLM gateway"""
+    return gemini_client
@@ -0,0 +1,77 @@
+"""
+Headline Deduplication
+Near-linear replacement for the pairwise headline comparison, with identical results:
+titles are tokenized once and a prefix-filtered inverted index proposes the only
+accepted titles that could pass the 60% word-overlap rule
+"""
+
+import re
+from collections import defaultdict
+from typing import Dict, List, Set
+
+TITLE_OVERLAP_THRESHOLD = 0.6  # share of the new title's words found in an accepted title
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def title_words(title: str) -> Set[str]:
+    """Lowercase word set used for headline overlap"""
+    return set(_WORD_RE.findall((title or "").lower()))
+
+
+def is_overlap_duplicate(words: Set[str], other: Set[str]) -> bool:
+    """The original rule: more than 60% of this title's words appear in the other"""
+    return len(words & other) / max(len(words), 1) > TITLE_OVERLAP_THRESHOLD
+
+
+def _min_overlap(size: int) -> int:
+    """Smallest shared-word count that passes the rule for a title of `size` words"""
+    return next(k for k in range(size + 1) if k / size > TITLE_OVERLAP_THRESHOLD)
+
+
+class HeadlineDeduplicator:
+    """
+    Accepts articles one at a time, rejecting repeated URLs and overlapping headlines
+
+    A duplicate must share at least t of the title's n words with an accepted title, so it
+    shares one of any n - t + 1 of them: only the postings of the n - t + 1 rarest words
+    are probed, then each candidate is checked with the exact rule.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, List[int]] = defaultdict(list)  # word -> accepted title ids
+        self.words: List[Set[str]] = []
+        self.seen_urls: Set[str] = set()
+
+    def is_duplicate(self, words: Set[str]) -> bool:
+        if not words:
+            return False  # 0 / 1 never exceeds the threshold
+        probe_size = len(words) - _min_overlap(len(words)) + 1
+        rarest = sorted(words, key=lambda w: len(self.postings.get(w, ())))[:probe_size]
+        candidates = {key for word in rarest for key in self.postings.get(word, ())}
+        return any(is_overlap_duplicate(words, self.words[key]) for key in candidates)
+
+    def add(self, article: Dict) -> bool:
+        """Index the article if it is new; False if it duplicates an accepted one"""
+        url = article.get("url")
+        if url in self.seen_urls:
+            return False
+        words = title_words(article.get("title", ""))
+        if self.is_duplicate(words):
+            return False
+
+        key = len(self.words)
+        self.words.append(words)
+        for word in words:
+            self.postings[word].append(key)
+        self.seen_urls.add(url)
+        return True
+
+    def __len__(self):
+        return len(self.words)
+
+
+def deduplicate_headlines(articles: List[Dict]) -> List[Dict]:
+    """First occurrence of every story, in input order"""
+    dedup = HeadlineDeduplicator()
+    return [article for article in articles if dedup.add(article)]
@@ -0,0 +1,118 @@
+"""
+Hacker News Item Cache
+Item payloads keyed by story ID, in memory and in the hn_items table; items are
+immutable for our purposes, so each ID is fetched from the API only once
+"""
+
+import json
+import logging
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Iterable
+
+from app.config import HN_ITEM_CACHE_MAX_ITEMS
+from app.services.database import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+
+class HNItemCache:
+    """Two-level (memory, SQLite) cache of Hacker News item payloads"""
+
+    def __init__(self, max_items: int = HN_ITEM_CACHE_MAX_ITEMS):
+        self.max_items = max_items
+        self.memory: "OrderedDict[int, Dict]" = OrderedDict()
+        self.lock = Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+        self._table_ready = False
+
+    def _ensure_table(self, cursor):
+        if self._table_ready:
+            return
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS hn_items (
+                id INTEGER PRIMARY KEY,
+                payload TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+        ''')
+        self._table_ready = True
+
+    def _remember(self, item_id: int, payload: Dict):
+        # Called with self.lock held
+        self.memory[item_id] = payload
+        self.memory.move_to_end(item_id)
+        while len(self.memory) > self.max_items:
+            self.memory.popitem(last=False)
+
+    def get_many(self, ids: Iterable[int]) -> Dict[int, Dict]:
+        """Cached payloads for the given IDs (missing IDs are simply absent)"""
+        ids = list(ids)
+        found: Dict[int, Dict] = {}
+        with self.lock:
+            for item_id in ids:
+                if item_id in self.memory:
+                    found[item_id] = self.memory[item_id]
+            self.stats["memory_hits"] += len(found)
+        pending = [item_id for item_id in ids if item_id not in found]
+        if not pending:
+            return found
+
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            self._ensure_table(cursor)
+            cursor.execute(
+                f"SELECT id, payload FROM hn_items WHERE id IN ({','.join('?' * len(pending))})", pending
+            )
+            rows = cursor.fetchall()
+            conn.close()
+        except Exception as e:
+            logger.warning(f"HN item cache read failed: {e}")
+            rows = []
+
+        with self.lock:
+            for row in rows:
+                payload = json.loads(row["payload"])
+                found[row["id"]] = payload
+                self._remember(row["id"], payload)
+            self.stats["disk_hits"] += len(rows)
+            self.stats["misses"] += len(pending) - len(rows)
+        return found
+
+    def put_many(self, items: Dict[int, Dict]):
+        """Store freshly fetched payloads and trim the table to max_items"""
+        if not items:
+            return
+        now = time.time()
+        with self.lock:
+            for item_id, payload in items.items():
+                self._remember(item_id, payload)
+            self.stats["stores"] += len(items)
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            self._ensure_table(cursor)
+            cursor.executemany(
+                "INSERT OR REPLACE INTO hn_items (id, payload, fetched_at) VALUES (?, ?, ?)",
+                [(item_id, json.dumps(payload), now) for item_id, payload in items.items()]
+            )
+            cursor.execute(
+                "DELETE FROM hn_items WHERE id NOT IN (SELECT id FROM hn_items ORDER BY fetched_at DESC LIMIT ?)",
+                (self.max_items,)
+            )
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.warning(f"HN item cache write failed: {e}")
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            stats = dict(self.stats)
+            stats["in_memory"] = len(self.memory)
+        return stats
+
+
+# Singleton
+hn_item_cache = HNItemCache()
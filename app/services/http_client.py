@@ -0,0 +1,161 @@
+"""
+Shared HTTP Client
+One requests session per upstream host (its own keep-alive pool), connect/read timeouts
+on every call, retries with full-jitter backoff for idempotent requests, and per-host
+latency/error metrics. Used by news APIs, feeds, Hacker News, scraping and SEC fetching.
+"""
+
+import logging
+import random
+import time
+from collections import deque
+from threading import Lock
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.config import (
+    HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT, HTTP_POOL_MAXSIZE,
+    HTTP_MAX_RETRIES, HTTP_BACKOFF_BASE_SECONDS, HTTP_BACKOFF_MAX_SECONDS
+)
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+LATENCY_SAMPLES = 200  # recent samples kept per host for percentiles
+
+
+class HostMetrics:
+    """Request counts and recent latencies for one host"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.statuses: Dict[int, int] = {}
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    def snapshot(self) -> Dict:
+        ordered = sorted(self.latencies)
+
+        def pct(p: float) -> Optional[float]:
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 1) if ordered else None
+
+        return {"requests": self.requests, "errors": self.errors, "retries": self.retries,
+                "statuses": dict(self.statuses), "p50_ms": pct(0.5), "p95_ms": pct(0.95),
+                "max_ms": round(ordered[-1] * 1000, 1) if ordered else None}
+
+
+class PooledHttpClient:
+    """Process-wide outbound HTTP client"""
+
+    def __init__(self, connect_timeout: float = HTTP_CONNECT_TIMEOUT, read_timeout: float = HTTP_READ_TIMEOUT,
+                 pool_maxsize: int = HTTP_POOL_MAXSIZE, max_retries: int = HTTP_MAX_RETRIES,
+                 backoff_base: float = HTTP_BACKOFF_BASE_SECONDS, backoff_max: float = HTTP_BACKOFF_MAX_SECONDS):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.sessions: Dict[str, requests.Session] = {}
+        self.metrics: Dict[str, HostMetrics] = {}
+        self.lock = Lock()
+
+    def _session(self, host: str) -> requests.Session:
+        with self.lock:
+            session = self.sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                # Retries are handled here (with jitter and metrics), not by urllib3
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize, max_retries=0)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self.sessions[host] = session
+                self.metrics[host] = HostMetrics()
+            return session
+
+    def _backoff(self, attempt: int, resp: Optional[requests.Response]) -> float:
+        """Full jitter: uniform(0, base * 2^attempt), or the server's Retry-After when it sends one"""
+        if resp is not None and resp.headers.get("Retry-After", "").isdigit():
+            return min(float(resp.headers["Retry-After"]), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _record(self, host: str, seconds: float, status: Optional[int], retried: bool):
+        with self.lock:
+            metrics = self.metrics[host]
+            metrics.requests += 1
+            metrics.latencies.append(seconds)
+            if status is None:
+                metrics.errors += 1
+            else:
+                metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+            if retried:
+                metrics.retries += 1
+
+    def request(self, method: str, url: str, timeout: Union[float, Tuple[float, float], None] = None,
+                retries: Optional[int] = None, **kwargs) -> requests.Response:
+        """
+        Send a request through the host's pool
+
+        Args:
+            timeout: read timeout in seconds (the connect timeout stays strict), or (connect, read)
+            retries: attempts after the first (default HTTP_MAX_RETRIES for idempotent methods, else 0);
+                     pass 0 for metered APIs where every call counts against a quota
+            **kwargs: passed to requests (params, headers, data, json, ...)
+
+        Returns:
+            The final response (including a 429/5xx once retries are spent)
+        """
+        method = method.upper()
+        host = urlsplit(url).netloc.lower()
+        session = self._session(host)
+        if not isinstance(timeout, tuple):
+            timeout = (self.connect_timeout, timeout or self.read_timeout)
+        if retries is None:
+            retries = self.max_retries if method in IDEMPOTENT_METHODS else 0
+
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            try:
+                resp = session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._record(host, time.monotonic() - started, None, attempt > 0)
+                if attempt >= retries:
+                    raise
+                delay = self._backoff(attempt, None)
+                logger.debug(f"↻ {host}: {type(e).__name__}, retry {attempt + 1}/{retries} in {delay:.2f}s")
+            else:
+                self._record(host, time.monotonic() - started, resp.status_code, attempt > 0)
+                if resp.status_code not in RETRY_STATUSES or attempt >= retries:
+                    return resp
+                delay = self._backoff(attempt, resp)
+                logger.debug(f"↻ {host}: HTTP {resp.status_code}, retry {attempt + 1}/{retries} in {delay:.2f}s")
+                resp.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def get_stats(self) -> Dict:
+        """Per-host request counts, retries, status mix and latency percentiles"""
+        with self.lock:
+            return {host: metrics.snapshot() for host, metrics in sorted(self.metrics.items())}
+
+    def close(self):
+        with self.lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions.clear()
+
+
+# Singleton
+http_client = PooledHttpClient()
@@ -0,0 +1,382 @@
+"""
+HTTP Record / Replay
+Record mode saves every upstream exchange (requests, httpx, curl_cffi) to a fixture directory;
+replay mode rewrites outgoing requests to a local stub server that serves those fixtures
+with configurable injected latency and error rates
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+import requests
+
+from app.config import (
+    HTTP_REPLAY_MODE, HTTP_FIXTURE_DIR, HTTP_REPLAY_LATENCY_MS, HTTP_REPLAY_JITTER_MS,
+    HTTP_REPLAY_ERROR_RATE, HTTP_REPLAY_SEED, HTTP_STUB_PORT
+)
+
+logger = logging.getLogger(__name__)
+
+# yfinance talks to Yahoo through curl_cffi; only hooked when it is installed
+try:
+    from curl_cffi import requests as curl_requests
+except ImportError:
+    curl_requests = None
+
+# Credentials are redacted from stored URLs; volatile params (dates, crumbs) would
+# otherwise stop a fixture from matching on a later day. Neither is part of the key.
+SECRET_PARAMS = {"apikey", "api_key", "token", "key", "access_key"}
+VOLATILE_PARAMS = {"from", "to", "crumb", "_"}
+KEPT_HEADERS = {"content-type", "etag", "last-modified", "location", "retry-after", "cache-control"}
+
+
+def _canonical_url(url: str) -> Tuple[str, str]:
+    """(match URL without secret/volatile params, stored URL with secrets redacted)"""
+    parts = urlsplit(url)
+    params = sorted(parse_qsl(parts.query, keep_blank_values=True))
+    matched = [(k, v) for k, v in params if k.lower() not in SECRET_PARAMS | VOLATILE_PARAMS]
+    redacted = [(k, "REDACTED" if k.lower() in SECRET_PARAMS else v) for k, v in params]
+    base = (parts.scheme.lower(), parts.netloc.lower(), parts.path or "/")
+    return urlunsplit(base + (urlencode(matched), "")), urlunsplit(base + (urlencode(redacted), ""))
+
+
+def _canonical_body(body) -> bytes:
+    if not body:
+        return b""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    try:
+        return json.dumps(json.loads(body), sort_keys=True).encode("utf-8")
+    except (ValueError, UnicodeDecodeError):
+        return bytes(body)
+
+
+def fixture_key(method: str, url: str, body=None) -> str:
+    """Stable fixture name for a request: host, method and a hash of URL + body"""
+    matched, _ = _canonical_url(url)
+    digest = hashlib.sha256(f"{method.upper()} {matched}\n".encode("utf-8") + _canonical_body(body))
+    host = urlsplit(url).netloc.lower().replace(":", "_")
+    return f"{host}_{method.upper()}_{digest.hexdigest()[:24]}"
+
+
+class FixtureStore:
+    """One JSON file per recorded exchange; re-recording a request overwrites it"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def save(self, method: str, url: str, body, status: int, headers: Dict, content: bytes, elapsed_ms: float):
+        os.makedirs(self.directory, exist_ok=True)
+        try:
+            text, encoding = content.decode("utf-8"), "utf-8"
+        except UnicodeDecodeError:
+            text, encoding = base64.b64encode(content).decode("ascii"), "base64"
+        exchange = {
+            "request": {"method": method.upper(), "url": _canonical_url(url)[1]},
+            "response": {
+                "status": status,
+                "headers": {k.lower(): v for k, v in headers.items() if k.lower() in KEPT_HEADERS},
+                "body": text,
+                "encoding": encoding
+            },
+            "elapsed_ms": round(elapsed_ms, 1),
+            "recorded_at": datetime.now().isoformat()
+        }
+        key = fixture_key(method, url, body)
+        tmp_path = self._path(key) + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(exchange, f, indent=1)
+        os.replace(tmp_path, self._path(key))
+
+    def load(self, key: str) -> Optional[Dict]:
+        try:
+            with open(self._path(key), "r") as f:
+                exchange = json.load(f)
+        except (OSError, ValueError):
+            return None
+        response = exchange["response"]
+        body = response["body"]
+        response["content"] = base64.b64decode(body) if response.get("encoding") == "base64" else body.encode("utf-8")
+        return exchange
+
+    def __len__(self):
+        if not os.path.isdir(self.directory):
+            return 0
+        return sum(1 for name in os.listdir(self.directory) if name.endswith(".json"))
+
+
+class StubServer:
+    """
+    Local HTTP server answering /<scheme>/<host>/<path>?<query> from recorded fixtures
+
+    Latency and errors are drawn from a seeded RNG so runs are repeatable.
+    """
+
+    def __init__(self, store: FixtureStore, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, seed: int = 42, port: int = 0):
+        self.store = store
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.port = port
+        self.lock = threading.Lock()
+        self.stats = {"served": 0, "missing": 0, "injected_errors": 0}
+        self.server: Optional[ThreadingHTTPServer] = None
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def _draw(self) -> Tuple[float, Optional[int]]:
+        """(delay in seconds, injected status or None)"""
+        with self.lock:
+            delay = (self.latency_ms + self.rng.uniform(0, self.jitter_ms)) / 1000
+            error = self.rng.choice((429, 503)) if self.rng.random() < self.error_rate else None
+        return delay, error
+
+    def _count(self, stat: str):
+        with self.lock:
+            self.stats[stat] += 1
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _serve(self):
+                scheme, _, rest = self.path.lstrip("/").partition("/")
+                url = f"{scheme}://{rest}"
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+
+                delay, error = stub._draw()
+                if delay:
+                    time.sleep(delay)
+                if error:
+                    stub._count("injected_errors")
+                    return self._reply(error, {"Content-Type": "application/json", "Retry-After": "1"},
+                                       json.dumps({"error": "injected by replay stub"}).encode("utf-8"))
+
+                exchange = stub.store.load(fixture_key(self.command, url, body))
+                if exchange is None:
+                    stub._count("missing")
+                    logger.warning(f"📼 No fixture for {self.command} {_canonical_url(url)[1]}")
+                    return self._reply(404, {"Content-Type": "application/json"},
+                                       json.dumps({"error": "no recorded fixture"}).encode("utf-8"))
+
+                stub._count("served")
+                response = exchange["response"]
+                self._reply(response["status"], response["headers"], response["content"])
+
+            def _reply(self, status: int, headers: Dict, content: bytes):
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = do_POST = do_PUT = do_DELETE = do_HEAD = _serve
+
+            def log_message(self, format, *args):
+                pass  # Keep benchmark output clean
+
+        return Handler
+
+    def start(self) -> "StubServer":
+        self.server = ThreadingHTTPServer(("127.0.0.1", self.port), self._handler())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name="replay-stub", daemon=True)
+        self.thread.start()
+        logger.info(f"📼 Replay stub serving {len(self.store)} fixtures at {self.base_url} "
+                    f"(latency={self.latency_ms}ms±{self.jitter_ms}, error_rate={self.error_rate})")
+        return self
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+class HttpRecorder:
+    """Hooks the HTTP clients used in the app so traffic is recorded or replayed"""
+
+    def __init__(self):
+        self.mode = "off"
+        self.store: Optional[FixtureStore] = None
+        self.stub: Optional[StubServer] = None
+        self.originals: Dict = {}
+        self.lock = threading.Lock()
+        self.recorded = 0
+
+    # ----- URL rewriting / recording helpers -----
+
+    def stub_url(self, url: str) -> str:
+        """Original URL -> same request addressed to the local stub"""
+        if url.startswith(self.stub.base_url):
+            return url
+        parts = urlsplit(url)
+        path = f"/{parts.scheme}/{parts.netloc}{parts.path or '/'}"
+        return f"{self.stub.base_url}{path}" + (f"?{parts.query}" if parts.query else "")
+
+    def _record(self, method: str, url: str, body, status: int, headers, content: bytes, elapsed_ms: float):
+        try:
+            self.store.save(method, url, body, status, dict(headers), content, elapsed_ms)
+            with self.lock:
+                self.recorded += 1
+        except Exception as e:
+            logger.warning(f"Could not record fixture for {method} {url}: {e}")
+
+    # ----- Client hooks -----
+
+    def _patch_requests(self):
+        original = requests.Session.send
+        recorder = self
+
+        def send(session, request, **kwargs):
+            if recorder.mode == "replay":
+                request.url = recorder.stub_url(request.url)
+                return original(session, request, **kwargs)
+            started = time.monotonic()
+            response = original(session, request, **kwargs)
+            if recorder.mode == "record":
+                recorder._record(request.method, request.url, request.body, response.status_code,
+                                 response.headers, response.content, (time.monotonic() - started) * 1000)
+            return response
+
+        self.originals[(requests.Session, "send")] = original
+        requests.Session.send = send
+
+    def _patch_httpx(self):
+        original_sync = httpx.Client.send
+        original_async = httpx.AsyncClient.send
+        recorder = self
+
+        def send(client, request, *args, **kwargs):
+            if recorder.mode == "replay":
+                request.url = httpx.URL(recorder.stub_url(str(request.url)))
+                return original_sync(client, request, *args, **kwargs)
+            started = time.monotonic()
+            response = original_sync(client, request, *args, **kwargs)
+            if recorder.mode == "record":
+                response.read()
+                recorder._record(request.method, str(request.url), request.content, response.status_code,
+                                 response.headers, response.content, (time.monotonic() - started) * 1000)
+            return response
+
+        async def asend(client, request, *args, **kwargs):
+            if recorder.mode == "replay":
+                request.url = httpx.URL(recorder.stub_url(str(request.url)))
+                return await original_async(client, request, *args, **kwargs)
+            started = time.monotonic()
+            response = await original_async(client, request, *args, **kwargs)
+            if recorder.mode == "record":
+                await response.aread()
+                recorder._record(request.method, str(request.url), request.content, response.status_code,
+                                 response.headers, response.content, (time.monotonic() - started) * 1000)
+            return response
+
+        self.originals[(httpx.Client, "send")] = original_sync
+        self.originals[(httpx.AsyncClient, "send")] = original_async
+        httpx.Client.send = send
+        httpx.AsyncClient.send = asend
+
+    def _patch_curl(self):
+        if curl_requests is None:
+            return
+        original = curl_requests.Session.request
+        recorder = self
+
+        def request(session, method, url, *args, params=None, data=None, json=None, **kwargs):
+            full_url = requests.Request(method, url, params=params).prepare().url
+            if recorder.mode == "replay":
+                return original(session, method, recorder.stub_url(full_url), *args,
+                                data=data, json=json, **kwargs)
+            started = time.monotonic()
+            response = original(session, method, url, *args, params=params, data=data, json=json, **kwargs)
+            if recorder.mode == "record":
+                body = _json_dumps(json) if json is not None else data
+                recorder._record(method, full_url, body, response.status_code, response.headers,
+                                 response.content, (time.monotonic() - started) * 1000)
+            return response
+
+        self.originals[(curl_requests.Session, "request")] = original
+        curl_requests.Session.request = request
+
+    # ----- Lifecycle -----
+
+    def install(self, mode: str = HTTP_REPLAY_MODE, fixture_dir: str = HTTP_FIXTURE_DIR,
+                latency_ms: float = HTTP_REPLAY_LATENCY_MS, jitter_ms: float = HTTP_REPLAY_JITTER_MS,
+                error_rate: float = HTTP_REPLAY_ERROR_RATE, seed: int = HTTP_REPLAY_SEED,
+                port: int = HTTP_STUB_PORT) -> "HttpRecorder":
+        """
+        Start recording or replaying (no-op for mode "off")
+
+        Args:
+            mode: "off", "record" or "replay"
+            fixture_dir: where fixtures are written / served from
+            latency_ms, jitter_ms, error_rate, seed: replay-only fault injection
+        """
+        if mode not in ("off", "record", "replay"):
+            raise ValueError(f"Unknown HTTP replay mode: {mode}")
+        self.uninstall()
+        if mode == "off":
+            return self
+
+        self.store = FixtureStore(fixture_dir)
+        if mode == "replay":
+            self.stub = StubServer(self.store, latency_ms, jitter_ms, error_rate, seed, port).start()
+        self._patch_requests()
+        self._patch_httpx()
+        self._patch_curl()
+        self.mode = mode
+        logger.info(f"📼 HTTP {mode} mode active (fixtures: {fixture_dir})")
+        return self
+
+    def uninstall(self):
+        """Restore the original client methods and stop the stub"""
+        for (owner, name), original in self.originals.items():
+            setattr(owner, name, original)
+        self.originals.clear()
+        if self.stub is not None:
+            self.stub.stop()
+            self.stub = None
+        self.mode = "off"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.uninstall()
+
+    def get_stats(self) -> Dict:
+        stats = {"mode": self.mode, "recorded": self.recorded,
+                 "fixtures": len(self.store) if self.store else 0}
+        if self.stub is not None:
+            with self.stub.lock:
+                stats.update(self.stub.stats)
+        return stats
+
+
+def _json_dumps(value) -> str:
+    return json.dumps(value)
+
+
+# Singleton
+http_recorder = HttpRecorder()
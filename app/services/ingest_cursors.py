@@ -0,0 +1,184 @@
+"""
+Ingestion Cursors
+Per-source, per-query high-water marks (newest published_at processed) so repeated
+ingestion cycles ask each API only for newer items and drop older ones at the
+fetch boundary
+"""
+
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from threading import Lock
+from typing import Dict, Iterable, List, Optional
+
+from app.services.database import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+FUTURE_SKEW_SECONDS = 15 * 60  # published_at further ahead than this counts as undated
+
+
+def published_timestamp(value) -> Optional[float]:
+    """Epoch seconds for ISO 8601, RFC 822 (RSS) or epoch values; None if unparseable (naive = UTC)"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        text = str(value).strip()
+        try:
+            parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+        except ValueError:
+            try:
+                parsed = parsedate_to_datetime(text)
+            except (TypeError, ValueError):
+                return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class IngestCursorStore:
+    """High-water marks in the ingest_cursors table, keyed by (source, query)"""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.stats = {"kept": 0, "dropped": 0, "undated": 0}
+
+    def _ensure_table(self, cursor):
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS ingest_cursors (
+                source TEXT NOT NULL,
+                query TEXT NOT NULL,
+                watermark REAL NOT NULL,
+                boundary_urls TEXT,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (source, query)
+            )
+        ''')
+
+    def get(self, source: str, query: str = "") -> Optional[Dict]:
+        """{"watermark": epoch, "boundary_urls": [...]} or None before the first advance"""
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            self._ensure_table(cursor)
+            cursor.execute("SELECT watermark, boundary_urls FROM ingest_cursors WHERE source = ? AND query = ?",
+                           (source, query))
+            row = cursor.fetchone()
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Ingest cursor lookup failed for {source}: {e}")
+            return None
+        if not row:
+            return None
+        return {"watermark": row["watermark"], "boundary_urls": json.loads(row["boundary_urls"] or "[]")}
+
+    def since(self, source: str, query: str = "") -> Optional[datetime]:
+        """The high-water mark as an aware UTC datetime, for APIs that accept a from-time"""
+        entry = self.get(source, query)
+        return datetime.fromtimestamp(entry["watermark"], tz=timezone.utc) if entry else None
+
+    def _stamped(self, articles: List[Dict]) -> Dict[str, Optional[float]]:
+        """url -> published epoch, None for undated (or future-dated) items, which cannot be ordered"""
+        horizon = time.time() + FUTURE_SKEW_SECONDS
+        stamps = {}
+        for article in articles:
+            ts = published_timestamp(article.get("published_at"))
+            # Future stamps (bad clocks/zones) must not push the mark past real items
+            stamps[article.get("url")] = None if ts is None or ts > horizon else ts
+        return stamps
+
+    def filter_new(self, source: str, query: str, articles: List[Dict]) -> List[Dict]:
+        """
+        Drop articles at or below the high-water mark (the mark itself only moves in commit)
+
+        Items stamped exactly at the mark are kept unless their URL was among those seen
+        at that instant; undated (or future-dated) items cannot be ordered and are always kept.
+        """
+        entry = self.get(source, query)
+        watermark = entry["watermark"] if entry else None
+        boundary = set(entry["boundary_urls"]) if entry else set()
+
+        stamps = self._stamped(articles)
+        fresh, dropped, undated = [], 0, 0
+        for article in articles:
+            ts = stamps[article.get("url")]
+            if ts is None:
+                undated += 1
+            elif watermark is not None and (ts < watermark or (ts == watermark and article.get("url") in boundary)):
+                dropped += 1
+                continue
+            fresh.append(article)
+
+        with self.lock:
+            self.stats["kept"] += len(fresh)
+            self.stats["dropped"] += dropped
+            self.stats["undated"] += undated
+        if dropped:
+            logger.debug(f"⏩ {source}: {dropped} article(s) older than the cursor dropped")
+        return fresh
+
+    def commit(self, source: str, query: str, articles: List[Dict], pending: Iterable[str] = ()):
+        """
+        Advance the mark past articles returned by filter_new, once the caller is done with them
+
+        Args:
+            articles: the filter_new result for this source/query
+            pending: URLs among them that were not processed; the mark stops at the oldest of
+                     these, so the next fetch returns them again (along with anything newer)
+        """
+        pending = set(pending)
+        stamps = {url: ts for url, ts in self._stamped(articles).items() if ts is not None}
+        held = [ts for url, ts in stamps.items() if url in pending]
+        done = {url: ts for url, ts in stamps.items()
+                if url not in pending and (not held or ts <= min(held))}
+        if not done:
+            return
+
+        entry = self.get(source, query)
+        watermark = entry["watermark"] if entry else None
+        boundary = set(entry["boundary_urls"]) if entry else set()
+        newest = max(done.values())
+        if watermark is None or newest >= watermark:
+            at_newest = {url for url, ts in done.items() if ts == newest}
+            self._save(source, query, newest, at_newest | (boundary if newest == watermark else set()))
+
+    def _save(self, source: str, query: str, watermark: float, boundary_urls):
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            self._ensure_table(cursor)
+            cursor.execute(
+                "INSERT OR REPLACE INTO ingest_cursors (source, query, watermark, boundary_urls, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (source, query, watermark, json.dumps(sorted(u for u in boundary_urls if u)), time.time())
+            )
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Could not advance ingest cursor for {source}: {e}")
+
+    def reset(self, source: Optional[str] = None):
+        """Forget one source's cursors (or all), so the next cycle refetches the full window"""
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        self._ensure_table(cursor)
+        if source:
+            cursor.execute("DELETE FROM ingest_cursors WHERE source = ?", (source,))
+        else:
+            cursor.execute("DELETE FROM ingest_cursors")
+        conn.commit()
+        conn.close()
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            return dict(self.stats)
+
+
+# Singleton
+ingest_cursors = IngestCursorStore()
@@ -0,0 +1,178 @@
+"""
+LLM Response Cache
+Content-addressed cache for LLM completions, persisted in the cache_metadata table
+Entries expire after a TTL and the table is bounded with LRU eviction
+expires_at / last_accessed hold epoch seconds (REAL), so expiry and LRU order compare numbers
+"""
+
+import hashlib
+import json
+import logging
+import time
+from threading import Lock
+from typing import Dict, Optional
+
+from app.config import LLM_CACHE_ENABLED, LLM_CACHE_TTL_SECONDS, LLM_CACHE_MAX_ENTRIES
+from app.services.database import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "llm:"
+
+
+class LLMResponseCache:
+    """SQLite-backed LLM response cache with TTL and size-bounded LRU eviction"""
+
+    def __init__(self, ttl_seconds: int = LLM_CACHE_TTL_SECONDS,
+                 max_entries: int = LLM_CACHE_MAX_ENTRIES, enabled: bool = LLM_CACHE_ENABLED):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.lock = Lock()
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "expired": 0}
+        self._table_ready = False
+
+    def _ensure_cache_table(self):
+        """Create cache_metadata (and the LRU column) if the DB predates it; drop pre-epoch LLM rows."""
+        if self._table_ready:
+            return
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS cache_metadata (
+                key TEXT PRIMARY KEY,
+                value TEXT,
+                expires_at DATETIME
+            )
+        ''')
+        try:
+            cursor.execute("ALTER TABLE cache_metadata ADD COLUMN last_accessed DATETIME")
+        except:
+            pass  # Column already exists
+        # Entries written as datetime text would never compare as expired against epoch seconds
+        cursor.execute("DELETE FROM cache_metadata WHERE key LIKE ? AND typeof(expires_at) = 'text'",
+                       (KEY_PREFIX + "%",))
+        conn.commit()
+        conn.close()
+        self._table_ready = True
+
+    @staticmethod
+    def make_key(model: str, prompt: str, config: Optional[Dict] = None) -> str:
+        """Hash model + prompt + generation config into a cache key."""
+        material = json.dumps(
+            {"model": model, "prompt": prompt, "config": config or {}},
+            sort_keys=True, default=str
+        )
+        return KEY_PREFIX + hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _count(self, name: str, amount: int = 1):
+        with self.lock:
+            self.stats[name] += amount
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached completion text, or None on miss/expiry."""
+        if not self.enabled:
+            return None
+        try:
+            self._ensure_cache_table()
+            now = time.time()
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute("SELECT value, expires_at FROM cache_metadata WHERE key = ?", (key,))
+            row = cursor.fetchone()
+
+            if not row:
+                conn.close()
+                self._count("misses")
+                return None
+
+            if row["expires_at"] is not None and row["expires_at"] < now:
+                cursor.execute("DELETE FROM cache_metadata WHERE key = ?", (key,))
+                conn.commit()
+                conn.close()
+                self._count("expired")
+                self._count("misses")
+                return None
+
+            cursor.execute("UPDATE cache_metadata SET last_accessed = ? WHERE key = ?", (now, key))
+            conn.commit()
+            conn.close()
+            self._count("hits")
+            return json.loads(row["value"]).get("text")
+        except Exception as e:
+            logger.warning(f"LLM cache read failed: {e}")
+            self._count("misses")
+            return None
+
+    def set(self, key: str, text: str, model: Optional[str] = None):
+        """Store a completion and evict least-recently-used entries beyond max_entries."""
+        if not self.enabled or not text:
+            return
+        try:
+            self._ensure_cache_table()
+            now = time.time()
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT OR REPLACE INTO cache_metadata (key, value, expires_at, last_accessed)
+                VALUES (?, ?, ?, ?)
+            """, (key, json.dumps({"text": text, "model": model}),
+                  now + self.ttl_seconds, now))
+
+            # Drop expired entries first, then trim to size by last access
+            cursor.execute("DELETE FROM cache_metadata WHERE key LIKE ? AND expires_at < ?",
+                           (KEY_PREFIX + "%", now))
+            expired = cursor.rowcount
+            cursor.execute("SELECT COUNT(*) AS count FROM cache_metadata WHERE key LIKE ?", (KEY_PREFIX + "%",))
+            overflow = cursor.fetchone()["count"] - self.max_entries
+            evicted = 0
+            if overflow > 0:
+                cursor.execute("""
+                    DELETE FROM cache_metadata WHERE key IN (
+                        SELECT key FROM cache_metadata WHERE key LIKE ?
+                        ORDER BY last_accessed ASC LIMIT ?
+                    )
+                """, (KEY_PREFIX + "%", overflow))
+                evicted = cursor.rowcount
+            conn.commit()
+            conn.close()
+
+            self._count("stores")
+            if expired > 0:
+                self._count("expired", expired)
+            if evicted > 0:
+                self._count("evictions", evicted)
+        except Exception as e:
+            logger.warning(f"LLM cache write failed: {e}")
+
+    def clear(self):
+        """Remove every LLM entry from the cache table."""
+        self._ensure_cache_table()
+        conn = get_db_connection()
+        conn.execute("DELETE FROM cache_metadata WHERE key LIKE ?", (KEY_PREFIX + "%",))
+        conn.commit()
+        conn.close()
+
+    def get_stats(self) -> Dict:
+        """Hit/miss counters plus current size."""
+        with self.lock:
+            stats = dict(self.stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["enabled"] = self.enabled
+        stats["ttl_seconds"] = self.ttl_seconds
+        stats["max_entries"] = self.max_entries
+        try:
+            self._ensure_cache_table()
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) AS count FROM cache_metadata WHERE key LIKE ?", (KEY_PREFIX + "%",))
+            stats["entries"] = cursor.fetchone()["count"]
+            conn.close()
+        except Exception:
+            stats["entries"] = None
+        return stats
+
+
+# Singleton
+llm_cache = LLMResponseCache()
@@ -0,0 +1,215 @@
+"""
+LLM Request Scheduler
+Priority queue drained by a fixed worker pool at the rate the shared token buckets allow
+Rate-limit waits and 429 backoff are re-queued instead of sleeping in the caller's thread
+"""
+
+import contextvars
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+from app.config import LLM_SCHEDULER_WORKERS
+
+logger = logging.getLogger(__name__)
+
+# Priority classes (lower value is served first)
+PRIORITY_HIGH = 0    # Extraction, direct-impact detection, interactive requests
+PRIORITY_NORMAL = 1  # Default
+PRIORITY_LOW = 2     # Explanations, private-company inference, bulk refreshes
+
+PRIORITY_NAMES = {PRIORITY_HIGH: "high", PRIORITY_NORMAL: "normal", PRIORITY_LOW: "low"}
+
+_current_priority = contextvars.ContextVar("llm_priority", default=PRIORITY_NORMAL)
+
+
+@contextmanager
+def llm_priority(priority: int):
+    """Set the default priority for LLM calls made inside this block"""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> int:
+    return _current_priority.get()
+
+
+def context_submit(executor, fn: Callable, *args, **kwargs) -> Future:
+    """executor.submit() that carries the caller's LLM priority into the worker thread"""
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+class RetryAfter:
+    """Returned by a job step to be re-queued after `delay` seconds instead of sleeping"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = max(0.0, delay)
+
+
+class _Job:
+    def __init__(self, step: Callable[[], Any], priority: int, bucket_fn: Optional[Callable]):
+        self.step = step
+        self.priority = priority
+        self.bucket_fn = bucket_fn
+        self.future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+class LLMRequestScheduler:
+    """Priority-aware dispatcher for rate-limited LLM requests"""
+
+    def __init__(self, num_workers: int = LLM_SCHEDULER_WORKERS):
+        self.num_workers = max(1, num_workers)
+        self.ready: List = []    # heap of (priority, seq, job)
+        self.delayed: List = []  # heap of (not_before, seq, job)
+        self.seq = itertools.count()
+        self.cond = threading.Condition()
+        self.workers: List[threading.Thread] = []
+        self.stats = {
+            "submitted": {name: 0 for name in PRIORITY_NAMES.values()},
+            "completed": 0,
+            "failed": 0,
+            "requeued": 0,
+            "max_queue_wait_seconds": {name: 0.0 for name in PRIORITY_NAMES.values()}
+        }
+
+    def _ensure_workers(self):
+        # Called with self.cond held
+        if self.workers:
+            return
+        for i in range(self.num_workers):
+            worker = threading.Thread(target=self._worker_loop, name=f"llm-worker-{i}", daemon=True)
+            worker.start()
+            self.workers.append(worker)
+        logger.info(f"🧵 LLM scheduler started with {self.num_workers} workers")
+
+    def submit(self, step: Callable[[], Any], priority: Optional[int] = None,
+               bucket_fn: Optional[Callable] = None) -> Future:
+        """
+        Queue a request
+
+        Args:
+            step: Callable performing one attempt; returns the result or RetryAfter
+            priority: PRIORITY_HIGH / NORMAL / LOW (defaults to the llm_priority() context)
+            bucket_fn: Returns the TokenBucket that must yield a token before each attempt
+
+        Returns:
+            Future resolved with the step's final result
+        """
+        if priority is None:
+            priority = current_priority()
+        job = _Job(step, priority, bucket_fn)
+        with self.cond:
+            self._ensure_workers()
+            heapq.heappush(self.ready, (priority, next(self.seq), job))
+            name = PRIORITY_NAMES.get(priority, str(priority))
+            self.stats["submitted"][name] = self.stats["submitted"].get(name, 0) + 1
+            self.cond.notify()
+        return job.future
+
+    def run(self, step: Callable[[], Any], priority: Optional[int] = None,
+            bucket_fn: Optional[Callable] = None, timeout: Optional[float] = None) -> Any:
+        """Submit and wait for the result"""
+        return self.submit(step, priority, bucket_fn).result(timeout=timeout)
+
+    def _promote_due(self, now: float):
+        while self.delayed and self.delayed[0][0] <= now:
+            _, seq, job = heapq.heappop(self.delayed)
+            heapq.heappush(self.ready, (job.priority, seq, job))
+
+    def _next_job(self) -> _Job:
+        """
+        Block until some ready job can take a token
+
+        Ready jobs are scanned in priority order and the first one whose bucket has a token is
+        dispatched, so a drained provider never holds up jobs bound for another one.
+        """
+        with self.cond:
+            while True:
+                now = time.monotonic()
+                self._promote_due(now)
+
+                if not self.ready:
+                    timeout = self.delayed[0][0] - now if self.delayed else None
+                    self.cond.wait(timeout=timeout)
+                    continue
+
+                picked = None
+                empty = {}  # id(bucket) -> bucket already found without a token in this pass
+                for _, _, job in sorted(self.ready):
+                    bucket = job.bucket_fn() if job.bucket_fn else None
+                    if bucket is None:
+                        picked = job
+                        break
+                    if id(bucket) in empty:
+                        continue
+                    if bucket.try_acquire():
+                        picked = job
+                        break
+                    empty[id(bucket)] = bucket
+
+                if picked is None:
+                    # Don't commit to a job while waiting; a higher-priority one may arrive
+                    wait = min(bucket.time_until_available() for bucket in empty.values())
+                    if self.delayed:
+                        wait = min(wait, max(0.0, self.delayed[0][0] - now))
+                    self.cond.wait(timeout=max(wait, 0.01))
+                    continue
+
+                self.ready = [entry for entry in self.ready if entry[2] is not picked]
+                heapq.heapify(self.ready)
+                name = PRIORITY_NAMES.get(picked.priority, str(picked.priority))
+                waited = now - picked.enqueued_at
+                if waited > self.stats["max_queue_wait_seconds"].get(name, 0.0):
+                    self.stats["max_queue_wait_seconds"][name] = round(waited, 3)
+                return picked
+
+    def _worker_loop(self):
+        while True:
+            job = self._next_job()
+            try:
+                result = job.step()
+            except Exception as e:
+                with self.cond:
+                    self.stats["failed"] += 1
+                job.future.set_exception(e)
+                continue
+
+            if isinstance(result, RetryAfter):
+                with self.cond:
+                    self.stats["requeued"] += 1
+                    heapq.heappush(self.delayed, (time.monotonic() + result.delay, next(self.seq), job))
+                    self.cond.notify()
+                continue
+
+            with self.cond:
+                self.stats["completed"] += 1
+            job.future.set_result(result)
+
+    def get_stats(self) -> Dict:
+        with self.cond:
+            queued = {name: 0 for name in PRIORITY_NAMES.values()}
+            for _, _, job in self.ready + self.delayed:
+                name = PRIORITY_NAMES.get(job.priority, str(job.priority))
+                queued[name] = queued.get(name, 0) + 1
+            return {
+                "workers": self.num_workers,
+                "queued": queued,
+                "submitted": dict(self.stats["submitted"]),
+                "completed": self.stats["completed"],
+                "failed": self.stats["failed"],
+                "requeued": self.stats["requeued"],
+                "max_queue_wait_seconds": dict(self.stats["max_queue_wait_seconds"])
+            }
+
+
+# Singleton
+llm_scheduler = LLMRequestScheduler()
@@ -0,0 +1,98 @@
+"""
+LLM HTTP Transport
+Pooled keep-alive httpx.AsyncClient for OpenRouter, running on a dedicated event loop
+Async callers await it directly; sync callers go through a thin blocking wrapper
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Dict, Optional
+
+import httpx
+
+from app.config import (
+    LLM_HTTP_TIMEOUT, LLM_HTTP_CONNECT_TIMEOUT,
+    LLM_HTTP_MAX_CONNECTIONS, LLM_HTTP_MAX_KEEPALIVE, LLM_HTTP_KEEPALIVE_EXPIRY
+)
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the optional 'h2' package (pip install httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class AsyncLLMTransport:
+    """Connection-pooled async HTTP client shared by every LLM request in the process"""
+
+    def __init__(self, timeout: float = LLM_HTTP_TIMEOUT, connect_timeout: float = LLM_HTTP_CONNECT_TIMEOUT,
+                 max_connections: int = LLM_HTTP_MAX_CONNECTIONS, max_keepalive: int = LLM_HTTP_MAX_KEEPALIVE,
+                 keepalive_expiry: float = LLM_HTTP_KEEPALIVE_EXPIRY):
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.http2 = HTTP2_AVAILABLE
+        self.client: Optional[httpx.AsyncClient] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.thread: Optional[threading.Thread] = None
+        self.lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the transport's event loop thread on first use"""
+        with self.lock:
+            if self.loop is None or self.loop.is_closed():
+                self.loop = asyncio.new_event_loop()
+                self.thread = threading.Thread(target=self.loop.run_forever, name="llm-transport", daemon=True)
+                self.thread.start()
+                logger.info(f"🌐 LLM transport started (http2={self.http2}, pool={self.limits.max_connections})")
+            return self.loop
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Only ever called on the transport loop
+        if self.client is None:
+            self.client = httpx.AsyncClient(http2=self.http2, limits=self.limits, timeout=self.timeout)
+        return self.client
+
+    async def _post(self, url: str, headers: Dict, json: Dict, timeout: Optional[float]) -> httpx.Response:
+        client = self._get_client()
+        request_timeout = httpx.Timeout(timeout, connect=self.timeout.connect) if timeout else self.timeout
+        return await client.post(url, headers=headers, json=json, timeout=request_timeout)
+
+    async def apost(self, url: str, headers: Dict, json: Dict, timeout: Optional[float] = None) -> httpx.Response:
+        """POST from any event loop; the request itself runs on the pooled transport loop"""
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(self._post(url, headers, json, timeout), loop)
+        return await asyncio.wrap_future(future)
+
+    def submit(self, url: str, headers: Dict, json: Dict, timeout: Optional[float] = None) -> Future:
+        """Start a POST without waiting; cancelling the Future aborts the request"""
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(self._post(url, headers, json, timeout), loop)
+
+    def post(self, url: str, headers: Dict, json: Dict, timeout: Optional[float] = None) -> httpx.Response:
+        """Blocking wrapper around the async client for threaded callers"""
+        return self.submit(url, headers, json, timeout).result()
+
+    def close(self):
+        """Close pooled connections and stop the loop"""
+        with self.lock:
+            loop, self.loop = self.loop, None
+        if loop is None:
+            return
+        if self.client is not None:
+            asyncio.run_coroutine_threadsafe(self.client.aclose(), loop).result(timeout=5)
+            self.client = None
+        loop.call_soon_threadsafe(loop.stop)
+        logger.info("🌐 LLM transport closed")
+
+
+# Singleton
+llm_transport = AsyncLLMTransport()
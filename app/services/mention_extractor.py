@@ -0,0 +1,286 @@
+"""
+Company Mention Extractor
+Single-pass company/ticker detection: every alias (company names, their suffix-less
+forms, tickers) goes into one Aho-Corasick automaton, so an article is scanned once
+however many companies are tracked. Matches must sit on word boundaries; bare tickers
+must appear in upper case so "ARM" matches but "arm" and "PHARMA" do not.
+"""
+
+import logging
+import re
+import time
+from collections import deque
+from threading import Lock
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from app.config import COMPANY_TICKERS, SUPPLY_CHAIN_COMPANIES
+from app.services.database import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+MENTION_INDEX_REFRESH_SECONDS = 300  # re-read companies/holdings at most this often
+
+# Common alternative names the tables do not carry
+COMPANY_ALIASES: Dict[str, str] = {
+    "Apple": "AAPL", "NVIDIA": "NVDA", "Nvidia": "NVDA", "Advanced Micro Devices": "AMD",
+    "Microsoft": "MSFT", "Alphabet": "GOOGL", "Google": "GOOGL", "Amazon": "AMZN", "Meta Platforms": "META",
+    "Intel": "INTC", "Broadcom": "AVGO", "Qualcomm": "QCOM", "Tesla": "TSLA", "Micron": "MU",
+    "Taiwan Semiconductor Manufacturing": "TSM",
+}
+
+_SUFFIX_RE = re.compile(
+    r"[,\s]+(inc\.?|incorporated|corp\.?|corporation|co\.?|company|ltd\.?|limited|plc|holdings?|group|"
+    r"n\.v\.|s\.a\.|ag|se)$", re.IGNORECASE
+)
+
+
+def name_variants(name: str) -> List[str]:
+    """The name plus its forms without legal suffixes ("NVIDIA Corporation" -> "NVIDIA")"""
+    variants = [name.strip()]
+    current = variants[0]
+    while True:
+        stripped = _SUFFIX_RE.sub("", current).strip(" ,")
+        if stripped == current or len(stripped) < 3:
+            break
+        variants.append(stripped)
+        current = stripped
+    return variants
+
+
+def _fold(text: str) -> str:
+    """Lowercase without changing length, so match offsets stay valid in the original text"""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+class AhoCorasick:
+    """Multi-pattern automaton over case-folded text; patterns can be added after matching started"""
+
+    def __init__(self):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.own: List[List[int]] = [[]]  # pattern ids ending exactly at a node
+        self.out: List[List[int]] = [[]]  # own + those of the failure chain
+        self.lengths: List[int] = []
+
+    def add(self, pattern: str) -> int:
+        """Insert a (folded) pattern; call relink() before matching"""
+        node = 0
+        for ch in pattern:
+            nxt = self.goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[node][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.own.append([])
+                self.out.append([])
+            node = nxt
+        self.own[node].append(len(self.lengths))
+        self.lengths.append(len(pattern))
+        return len(self.lengths) - 1
+
+    def relink(self):
+        """Recompute failure and output links breadth-first (linear in trie size)"""
+        queue = deque()
+        for child in self.goto[0].values():
+            self.fail[child] = 0
+            self.out[child] = list(self.own[child])
+            queue.append(child)
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[child] = self.goto[f].get(ch, 0)
+                self.out[child] = self.own[child] + self.out[self.fail[child]]
+                queue.append(child)
+
+    def iter_matches(self, folded: str) -> Iterator[Tuple[int, int, int]]:
+        """(start, end, pattern id) for every occurrence, overlapping ones included"""
+        node = 0
+        goto, fail, out, lengths = self.goto, self.fail, self.out, self.lengths
+        for i, ch in enumerate(folded):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for pid in out[node]:
+                yield i + 1 - lengths[pid], i + 1, pid
+
+
+class MentionExtractor:
+    """Alias -> canonical name matcher with word boundaries"""
+
+    def __init__(self, aliases: Optional[Dict[str, str]] = None, case_sensitive: bool = False):
+        self.automaton = AhoCorasick()
+        self.patterns: List[Tuple[str, str, bool]] = []  # id -> (alias, canonical, case_sensitive)
+        self.known: Set[Tuple[str, str, bool]] = set()
+        if aliases:
+            self.add(aliases, case_sensitive)
+
+    def add(self, aliases: Dict[str, str], case_sensitive: bool = False) -> int:
+        """Insert aliases not seen before (existing ones are untouched); returns how many were new"""
+        added = 0
+        for alias, canonical in aliases.items():
+            alias = (alias or "").strip()
+            entry = (alias, canonical, case_sensitive)
+            if not alias or not canonical or entry in self.known:
+                continue
+            self.known.add(entry)
+            self.automaton.add(_fold(alias))
+            self.patterns.append(entry)
+            added += 1
+        if added:
+            self.automaton.relink()
+        return added
+
+    def extract(self, text: str) -> List[str]:
+        """Canonical names mentioned in text, unique, in order of first mention"""
+        if not text:
+            return []
+        found: Dict[str, None] = {}
+        for start, end, pid in self.automaton.iter_matches(_fold(text)):
+            alias, canonical, case_sensitive = self.patterns[pid]
+            if canonical in found:
+                continue
+            if start > 0 and text[start - 1].isalnum():
+                continue
+            if end < len(text) and text[end].isalnum():
+                continue
+            if case_sensitive and text[start:end] != alias:
+                continue
+            found[canonical] = None
+        return list(found)
+
+
+class CompanyMentionIndex:
+    """
+    Ticker extractor over every tracked company: config maps, the companies table and holdings
+
+    New companies/holdings are inserted into the live automaton; only removals trigger a rebuild.
+    """
+
+    def __init__(self, refresh_seconds: int = MENTION_INDEX_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self.extractor = MentionExtractor()
+        self.entries: Set[Tuple[str, str, bool]] = set()
+        self.loaded_at = 0.0
+        self.lock = Lock()
+        self.stats = {"rebuilds": 0, "incremental_adds": 0}
+
+    @staticmethod
+    def _name_entries(name: str, ticker: str) -> Set[Tuple[str, str, bool]]:
+        # Acronym-style names ("ARM", "TSMC") are matched like tickers: upper case only
+        return {(variant, ticker.upper(), variant.isupper() and " " not in variant and len(variant) <= 5)
+                for variant in name_variants(name)}
+
+    @staticmethod
+    def _ticker_aliases(ticker: str) -> Dict[str, str]:
+        ticker = ticker.strip().upper()
+        # Single letters are only safe as cashtags
+        return {f"${ticker}": ticker} if len(ticker) < 2 else {ticker: ticker, f"${ticker}": ticker}
+
+    def _load_entries(self) -> Set[Tuple[str, str, bool]]:
+        names: Dict[str, str] = {**COMPANY_ALIASES, **SUPPLY_CHAIN_COMPANIES, **COMPANY_TICKERS}
+        tickers: Set[str] = set(names.values())
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute("SELECT ticker, name FROM companies")
+            for row in cursor.fetchall():
+                if row["ticker"]:
+                    tickers.add(row["ticker"].upper())
+                    if row["name"] and row["name"].upper() != row["ticker"].upper():
+                        names[row["name"]] = row["ticker"].upper()
+            cursor.execute("SELECT DISTINCT ticker, company_name FROM holdings")
+            for row in cursor.fetchall():
+                if row["ticker"]:
+                    tickers.add(row["ticker"].upper())
+                    if row["company_name"] and row["company_name"].upper() != row["ticker"].upper():
+                        names[row["company_name"]] = row["ticker"].upper()
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Mention index could not read companies/holdings: {e}")
+
+        entries = set()
+        for name, ticker in names.items():
+            entries |= self._name_entries(name, ticker)
+        for ticker in tickers:
+            for alias, canonical in self._ticker_aliases(ticker).items():
+                entries.add((alias, canonical, True))
+        return entries
+
+    def _apply(self, entries: Set[Tuple[str, str, bool]]):
+        """Bring the automaton to `entries` (called with self.lock held)"""
+        if self.entries - entries:
+            extractor = MentionExtractor()
+            self.stats["rebuilds"] += 1
+        else:
+            extractor = self.extractor
+            entries = entries - self.entries
+            if entries:
+                self.stats["incremental_adds"] += 1
+        for case_sensitive in (False, True):
+            extractor.add({a: c for a, c, cs in entries if cs == case_sensitive}, case_sensitive)
+        self.extractor = extractor
+        self.entries = set(extractor.known)
+
+    def refresh(self, force: bool = False):
+        """Re-read the company sources when stale (or forced)"""
+        if not force and time.time() - self.loaded_at < self.refresh_seconds:
+            return
+        entries = self._load_entries()
+        with self.lock:
+            self._apply(entries)
+            self.loaded_at = time.time()
+        logger.debug(f"🔎 Mention index: {len(self.entries)} aliases")
+
+    def add_companies(self, companies: Iterable[Tuple[str, Optional[str]]]):
+        """Insert (ticker, company name) pairs right away, e.g. after a portfolio update"""
+        entries = set()
+        for ticker, name in companies:
+            if not ticker:
+                continue
+            for alias, canonical in self._ticker_aliases(ticker).items():
+                entries.add((alias, canonical, True))
+            if name and name.upper() != ticker.upper():
+                entries |= self._name_entries(name, ticker)
+        with self.lock:
+            self._apply(self.entries | entries)
+
+    def extract(self, text: str, tickers: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Tickers mentioned in text, in order of first mention
+
+        Args:
+            tickers: only report these (unknown ones are added to the index first)
+        """
+        self.refresh()
+        wanted = None
+        if tickers is not None:
+            wanted = {t.strip().upper() for t in tickers if t and t.strip()}
+            missing = [(t, None) for t in wanted if (t, t, True) not in self.entries and len(t) > 1]
+            if missing:
+                self.add_companies(missing)
+        with self.lock:
+            found = self.extractor.extract(text)
+        return [t for t in found if wanted is None or t in wanted]
+
+    def aliases_for(self, tickers: Iterable[str]) -> List[str]:
+        """Every alias (ticker, cashtag, company names) that resolves to one of the tickers"""
+        self.refresh()
+        wanted = {t.strip().upper() for t in tickers if t and t.strip()}
+        with self.lock:
+            aliases = {alias for alias, canonical, _ in self.entries if canonical in wanted}
+        return sorted(aliases | wanted)
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            return {**self.stats, "aliases": len(self.entries), "trie_nodes": len(self.extractor.automaton.goto)}
+
+
+# Singleton
+mention_index = CompanyMentionIndex()
@@ -0,0 +1,110 @@
+"""
+MinHash / LSH
+CPU-only near-duplicate detection: word shingles, MinHash signatures and a
+banded locality-sensitive hash index for sub-linear candidate lookup
+"""
+
+import hashlib
+import random
+import re
+from typing import Dict, Hashable, Iterable, List, Set, Tuple
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+Signature = Tuple[int, ...]
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric word tokens"""
+    return _WORD_RE.findall((text or "").lower())
+
+
+def shingles(text: str, k: int = 2) -> Set[str]:
+    """Word k-shingles of text (single words if the text is shorter than k)"""
+    words = tokenize(text)
+    if len(words) < k:
+        return set(words)
+    return {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+
+def _hash64(token: str) -> int:
+    # Stable across processes (unlike hash()), so signatures can be persisted
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class MinHasher:
+    """Fixed family of permutations turning a token set into a MinHash signature"""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.permutations = [
+            (rng.randint(1, _MERSENNE_PRIME - 1), rng.randint(0, _MERSENNE_PRIME - 1))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, tokens: Iterable[str]) -> Signature:
+        hashes = [_hash64(t) for t in set(tokens)]
+        if not hashes:
+            return tuple([_MAX_HASH] * self.num_perm)
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self.permutations
+        )
+
+
+def estimate_similarity(sig_a: Signature, sig_b: Signature) -> float:
+    """Estimated Jaccard similarity of the sets behind two signatures"""
+    if not sig_a or len(sig_a) != len(sig_b):
+        return 0.0
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+class LSHIndex:
+    """Banded LSH over MinHash signatures: items sharing any band are candidates"""
+
+    def __init__(self, num_perm: int = 64, bands: int = 16):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.buckets: List[Dict[Tuple[int, ...], Set[Hashable]]] = [{} for _ in range(bands)]
+        self.signatures: Dict[Hashable, Signature] = {}
+
+    def _band_keys(self, signature: Signature):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    def add(self, key: Hashable, signature: Signature):
+        if key in self.signatures:
+            self.remove(key)
+        self.signatures[key] = signature
+        for band, band_key in self._band_keys(signature):
+            self.buckets[band].setdefault(band_key, set()).add(key)
+
+    def remove(self, key: Hashable):
+        signature = self.signatures.pop(key, None)
+        if signature is None:
+            return
+        for band, band_key in self._band_keys(signature):
+            bucket = self.buckets[band].get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self.buckets[band][band_key]
+
+    def candidates(self, signature: Signature) -> Set[Hashable]:
+        found: Set[Hashable] = set()
+        for band, band_key in self._band_keys(signature):
+            found.update(self.buckets[band].get(band_key, ()))
+        return found
+
+    def query(self, signature: Signature, threshold: float) -> List[Tuple[Hashable, float]]:
+        """Candidates whose estimated similarity is >= threshold, best first"""
+        scored = [(key, estimate_similarity(signature, self.signatures[key])) for key in self.candidates(signature)]
+        return sorted((item for item in scored if item[1] >= threshold), key=lambda item: -item[1])
+
+    def __len__(self):
+        return len(self.signatures)
@@ -0,0 +1,213 @@
+"""
+LLM Model Router
+Rolling latency / error / 429 statistics per model and per API key
+Picks the best healthy target per request, with circuit-breaker cooldowns
+"""
+
+import logging
+import time
+from collections import deque
+from threading import Lock
+from typing import Dict, Iterable, List, Optional
+
+from app.config import (
+    LLM_ROUTER_WINDOW_SECONDS, LLM_ROUTER_FAILURE_THRESHOLD,
+    LLM_ROUTER_COOLDOWN_SECONDS, LLM_ROUTER_MAX_COOLDOWN_SECONDS
+)
+from app.services.rate_limiter import key_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Assumed latency for targets without enough samples (seconds); keeps configured order as tie-break
+PRIOR_LATENCY = 3.0
+MIN_SAMPLES = 3
+
+# Outcomes recorded per request
+OK = "ok"
+ERROR = "error"
+RATE_LIMITED = "rate_limited"
+TIMEOUT = "timeout"  # abandoned while still running (e.g. out-raced by a hedge); latency is a lower bound
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile (pct in 0-100)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+class TargetHealth:
+    """Sliding window of outcomes plus circuit-breaker state for one model or key"""
+
+    def __init__(self, name: str, window_seconds: int):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.samples = deque()  # (timestamp, latency_seconds, outcome)
+        self.consecutive_failures = 0
+        self.trips = 0
+        self.open_until = 0.0
+
+    def _prune(self, now: float):
+        cutoff = now - self.window_seconds
+        while self.samples and self.samples[0][0] < cutoff:
+            self.samples.popleft()
+
+    def record(self, latency: float, outcome: str, now: float):
+        self._prune(now)
+        self.samples.append((now, latency, outcome))
+        if outcome == OK:
+            self.consecutive_failures = 0
+            self.trips = 0
+        else:
+            self.consecutive_failures += 1
+
+    def trip(self, now: float, base_cooldown: float, max_cooldown: float) -> float:
+        """Open the circuit; repeated trips back off exponentially"""
+        cooldown = min(max_cooldown, base_cooldown * (2 ** self.trips))
+        self.trips += 1
+        self.open_until = now + cooldown
+        self.consecutive_failures = 0
+        return cooldown
+
+    def is_open(self, now: float) -> bool:
+        return now < self.open_until
+
+    def latencies(self, now: float) -> List[float]:
+        """Success latencies plus timeout lower bounds, so the slow tail shows in percentiles"""
+        self._prune(now)
+        return [lat for _, lat, outcome in self.samples if outcome in (OK, TIMEOUT)]
+
+    def summary(self, now: float) -> Dict:
+        self._prune(now)
+        total = len(self.samples)
+        errors = sum(1 for _, _, o in self.samples if o == ERROR)
+        limited = sum(1 for _, _, o in self.samples if o == RATE_LIMITED)
+        timeouts = sum(1 for _, _, o in self.samples if o == TIMEOUT)
+        latencies = self.latencies(now)
+        p50 = percentile(latencies, 50)
+        p95 = percentile(latencies, 95)
+        return {
+            "requests": total,
+            "p50_latency_ms": round(p50 * 1000) if p50 is not None else None,
+            "p95_latency_ms": round(p95 * 1000) if p95 is not None else None,
+            "error_rate": round(errors / total, 4) if total else 0.0,
+            "rate_limited_rate": round(limited / total, 4) if total else 0.0,
+            "timeout_rate": round(timeouts / total, 4) if total else 0.0,
+            "circuit": "open" if self.is_open(now) else "closed",
+            "cooldown_remaining_s": round(max(0.0, self.open_until - now), 1)
+        }
+
+
+class ModelRouter:
+    """Chooses the healthiest, fastest model and API key for each LLM request"""
+
+    def __init__(self, models: List[str], api_keys: List[str],
+                 window_seconds: int = LLM_ROUTER_WINDOW_SECONDS,
+                 failure_threshold: int = LLM_ROUTER_FAILURE_THRESHOLD,
+                 cooldown_seconds: float = LLM_ROUTER_COOLDOWN_SECONDS,
+                 max_cooldown_seconds: float = LLM_ROUTER_MAX_COOLDOWN_SECONDS):
+        self.models = list(models)
+        self.api_keys = list(api_keys)
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.max_cooldown_seconds = max_cooldown_seconds
+        self.lock = Lock()
+        self.model_health = {m: TargetHealth(m, window_seconds) for m in self.models}
+        self.key_health = {k: TargetHealth(key_fingerprint(k), window_seconds) for k in self.api_keys}
+
+    # --- SCORING ---
+    def _score(self, health: TargetHealth, position: int, now: float) -> float:
+        """Lower is better: typical latency inflated by recent error and 429 rates"""
+        latencies = health.latencies(now)
+        if len(latencies) >= MIN_SAMPLES:
+            base = percentile(latencies, 50)
+        else:
+            base = PRIOR_LATENCY
+        summary = health.summary(now)
+        penalty = 1 + 4 * (summary["error_rate"] + summary["timeout_rate"]) + 2 * summary["rate_limited_rate"]
+        return base * penalty + position * 1e-3
+
+    def _rank(self, pool: Dict[str, TargetHealth], order: List[str], exclude: Iterable[str]) -> List[str]:
+        now = time.monotonic()
+        excluded = set(exclude)
+        candidates = [name for name in order if name not in excluded] or list(order)
+        healthy = [n for n in candidates if not pool[n].is_open(now)]
+        if healthy:
+            return sorted(healthy, key=lambda n: self._score(pool[n], order.index(n), now))
+        # Everything is cooling down: least-remaining cooldown first
+        return sorted(candidates, key=lambda n: pool[n].open_until)
+
+    def ranked_models(self, exclude: Iterable[str] = ()) -> List[str]:
+        with self.lock:
+            return self._rank(self.model_health, self.models, exclude)
+
+    def ranked_keys(self, exclude: Iterable[str] = ()) -> List[str]:
+        with self.lock:
+            return self._rank(self.key_health, self.api_keys, exclude)
+
+    def pick_model(self, exclude: Iterable[str] = ()) -> str:
+        return self.ranked_models(exclude)[0]
+
+    def has_healthy_key(self, exclude: Iterable[str] = ()) -> bool:
+        now = time.monotonic()
+        with self.lock:
+            return any(not h.is_open(now) for k, h in self.key_health.items() if k not in set(exclude))
+
+    def model_latency_percentile(self, model: str, pct: float) -> Optional[float]:
+        """Observed latency percentile for a model, timeouts included (None until MIN_SAMPLES)"""
+        with self.lock:
+            health = self.model_health.get(model)
+            if not health:
+                return None
+            latencies = health.latencies(time.monotonic())
+            return percentile(latencies, pct) if len(latencies) >= MIN_SAMPLES else None
+
+    # --- RECORDING ---
+    def record(self, model: str, api_key: Optional[str], latency: float, status) -> None:
+        """
+        Record one attempt
+
+        Args:
+            status: HTTP status code, or TIMEOUT for a request abandoned while still running;
+                    None (network error) or any other value counts as a failure
+        """
+        if status == 200:
+            outcome = OK
+        elif status == 429:
+            outcome = RATE_LIMITED
+        elif status == TIMEOUT:
+            outcome = TIMEOUT
+        else:
+            outcome = ERROR
+
+        now = time.monotonic()
+        with self.lock:
+            model_h = self.model_health.get(model)
+            key_h = self.key_health.get(api_key) if api_key is not None else None
+
+            if model_h:
+                model_h.record(latency, outcome, now)
+                # 404: model gone; otherwise trip after N consecutive failures
+                if outcome != OK and (status == 404 or model_h.consecutive_failures >= self.failure_threshold):
+                    cooldown = model_h.trip(now, self.cooldown_seconds, self.max_cooldown_seconds)
+                    logger.warning(f"🔌 Circuit open for model {model} ({status}); cooling down {cooldown:.0f}s")
+
+            # Keys only answer for throttling and auth; model/upstream failures aren't the key's fault
+            if key_h and (outcome in (OK, RATE_LIMITED) or status in (401, 403)):
+                key_h.record(latency, outcome, now)
+                # 401/403: bad key; 429: key-level throttling
+                if status in (401, 403) or (outcome == RATE_LIMITED and key_h.consecutive_failures >= self.failure_threshold):
+                    cooldown = key_h.trip(now, self.cooldown_seconds, self.max_cooldown_seconds)
+                    logger.warning(f"🔌 Circuit open for API key {key_h.name} ({status}); cooling down {cooldown:.0f}s")
+
+    def get_stats(self) -> Dict:
+        now = time.monotonic()
+        with self.lock:
+            ranked = self._rank(self.model_health, self.models, ())
+            return {
+                "preferred_model": ranked[0] if ranked else None,
+                "models": {m: h.summary(now) for m, h in self.model_health.items()},
+                "api_keys": {h.name: h.summary(now) for h in self.key_health.values()}
+            }
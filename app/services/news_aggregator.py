@@ -1,24 +1,61 @@
-import feedparser
 import requests
 import logging
 import json
 import os
 import time
 import re
-from typing import List, Dict, Optional, Set
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+from typing import Any, Callable, Iterable, Iterator, List, Dict, Optional, Set, Tuple
 from datetime import datetime, timedelta, timezone
-from bs4 import BeautifulSoup
 from app.config import (
     NEWSAPI_KEY, TRACKED_COMPANIES,
-    NEWSDATA_IO_KEY, FINNHUB_API_KEY, GNEWS_API_KEY, MEDIASTACK_API_KEY
+    NEWSDATA_IO_KEY, FINNHUB_API_KEY, GNEWS_API_KEY, MEDIASTACK_API_KEY,
+    INGEST_CONCURRENT, INGEST_DEADLINE_SECONDS, INGEST_MAX_WORKERS, HN_FETCH_WORKERS
 )
 from app.models.article import Article
+from app.services.hn_item_cache import hn_item_cache
+from app.services.feed_cache import feed_cache
+from app.services.headline_dedup import HeadlineDeduplicator, deduplicate_headlines
+from app.services.url_index import url_index
+from app.services.ingest_cursors import ingest_cursors
+from app.services.quota_budget import quota_budget
+from app.services.scrape_scheduler import scrape_scheduler
+from app.services.mention_extractor import mention_index
+from app.services.http_client import http_client
+from app.services.parse_pool import parse_pool
 
 # Fallback for any missing keys
 RAPID_API_KEY = os.getenv("RAPID_API_KEY")
 
 logger = logging.getLogger(__name__)
 
+# Shared by every NewsIngestionLayer instance (routes, scheduler, agents)
+_fetch_pool = ThreadPoolExecutor(max_workers=INGEST_MAX_WORKERS, thread_name_prefix="ingest")
+
+# Hacker News items: own pool (never nested inside _fetch_pool); connections come from http_client
+HN_API = "https://hacker-news.firebaseio.com/v0"
+_hn_pool = ThreadPoolExecutor(max_workers=HN_FETCH_WORKERS, thread_name_prefix="hn")
+
+# Ranked by score/relevance, not time: an older story can enter the list after newer ones were
+# seen, so a published_at cursor would drop it. Incremental mode uses the seen-URL index instead.
+RANKED_SOURCES = {"hacker_news", "google_news"}
+
+
+class ArticleBatch(list):
+    """Articles streamed from one source; commit() moves that source's ingest cursor past them"""
+
+    def __init__(self, articles: List[Article], source: str, commit: Optional[Callable] = None):
+        super().__init__(articles)
+        self.source = source
+        self._commit = commit
+
+    def commit(self, unfinished: Iterable[Article] = ()):
+        """Call once the batch is processed; unfinished articles (and anything newer) are fetched again"""
+        if self._commit:
+            self._commit([a.url for a in unfinished])
+
+
 class NewsIngestionLayer:
     """
     Expert News Ingestion Layer strictly using Free, Public, and Legal sources.
@@ -26,7 +63,6 @@ class NewsIngestionLayer:
     """
 
     def __init__(self):
-        self.seen_urls = set()
         self.headers = {
             'User-Agent': 'MarketPulse Intelligence Bot (support@marketpulse.ai) Web-Intelligence-System/1.1'
         }
@@ -35,6 +71,7 @@ class NewsIngestionLayer:
             "Reuters": 1, "Bloomberg": 2, "Financial Times": 3, 
             "WSJ": 4, "CNBC": 5, "The Guardian": 6, "BBC News": 7
         }
+        self.last_report: Optional[Dict] = None  # Per-source timings of the latest fan-out
     
     def strip_html(self, text: str) -> str:
         """Remove HTML tags and clean up text for display"""
@@ -52,13 +89,26 @@ class NewsIngestionLayer:
     # 1. OFFICIAL FREE APIs
     # ==========================================================================
 
-    def fetch_news_api(self, query: str) -> List[Dict]:
-        """NewsAPI.org (100 req/day)"""
+    def _metered_get(self, source: str, url: str, params: Dict) -> Optional[requests.Response]:
+        """GET against a quota-limited API; None when the quota budget defers this call"""
+        if not quota_budget.try_acquire(source):
+            return None
+        # No transparent retries: each attempt would count against the quota
+        resp = http_client.get(url, params=params, timeout=10, retries=0)
+        if resp.status_code == 429:
+            quota_budget.mark_exhausted(source)
+        return resp
+
+    def fetch_news_api(self, query: str, since: Optional[datetime] = None) -> List[Dict]:
+        """NewsAPI.org (100 req/day); since: only articles published after this (UTC)"""
         if not NEWSAPI_KEY: return []
         try:
             url = "https://newsapi.org/v2/everything"
             params = {"q": query, "language": "en", "sortBy": "publishedAt", "apiKey": NEWSAPI_KEY, "pageSize": 10}
-            resp = requests.get(url, params=params, timeout=10)
+            if since:
+                params["from"] = since.strftime('%Y-%m-%dT%H:%M:%S')
+            resp = self._metered_get("newsapi", url, params)
+            if resp is None: return []
             data = resp.json()
             return [{
                 "title": a["title"], 
@@ -71,28 +121,32 @@ class NewsIngestionLayer:
             } for a in data.get("articles", [])]
         except: return []
 
-    def fetch_newsdata(self, query: str) -> List[Dict]:
-        """NewsData.io (200 req/day)"""
+    def fetch_newsdata(self, query: str, since: Optional[datetime] = None) -> List[Dict]:
+        """NewsData.io (200 req/day); the latest endpoint has no from-time, so since is applied by the cursor"""
         if not NEWSDATA_IO_KEY: return []
         try:
             url = "https://newsdata.io/api/1/news"
             params = {"apikey": NEWSDATA_IO_KEY, "q": query, "language": "en"}
-            resp = requests.get(url, params=params, timeout=10)
+            resp = self._metered_get("newsdata", url, params)
+            if resp is None: return []
             data = resp.json()
             return [{"title": a["title"],"url": a["link"], "content": a.get("description", ""), "source": a["source_id"], "published_at": a["pubDate"], "type": "api", "credibility": "medium"} for a in data.get("results", [])]
         except: return []
 
-    def fetch_finnhub(self, query: str) -> List[Dict]:
-        """Finnhub.io (60 req/min) - Excellent for stock specific news"""
+    def fetch_finnhub(self, query: str, since: Optional[datetime] = None) -> List[Dict]:
+        """Finnhub.io (60 req/min) - Excellent for stock specific news; since narrows the from-date"""
         if not FINNHUB_API_KEY: return []
         try:
             today = datetime.now().strftime('%Y-%m-%d')
-            start = (datetime.now() - timedelta(days=2)).strftime('%Y-%m-%d')
+            window_start = datetime.now(timezone.utc) - timedelta(days=2)
+            start = max(since, window_start) if since else window_start
+            start = start.strftime('%Y-%m-%d')  # day granularity; the cursor drops the rest
             articles = []
             symbol = query.split(" OR ")[0] if " OR " in query else "AAPL" 
             url = "https://finnhub.io/api/v1/company-news"
             params = {"symbol": symbol, "from": start, "to": today, "token": FINNHUB_API_KEY}
-            resp = requests.get(url, params=params, timeout=10)
+            resp = self._metered_get("finnhub", url, params)
+            if resp is None: return []
             data = resp.json()
             for a in data[:10]:
                  articles.append({
@@ -100,34 +154,52 @@ class NewsIngestionLayer:
                      "url": a["url"],
                      "content": a["summary"],
                      "source": a["source"],
-                     "published_at": datetime.fromtimestamp(a["datetime"]).isoformat(),
+                     "published_at": datetime.fromtimestamp(a["datetime"], tz=timezone.utc).isoformat(),
                      "type": "api",
                      "credibility": "high"
                  })
             return articles
         except: return []
 
-    def fetch_gnews(self, query: str) -> List[Dict]:
-        """GNews API (100 req/day)"""
+    def fetch_gnews(self, query: str, since: Optional[datetime] = None) -> List[Dict]:
+        """GNews API (100 req/day); since: only articles published after this (UTC)"""
         if not GNEWS_API_KEY: return []
         try:
             url = "https://gnews.io/api/v4/search"
             params = {"q": query, "lang": "en", "token": GNEWS_API_KEY, "max": 10}
-            resp = requests.get(url, params=params, timeout=10)
+            if since:
+                params["from"] = since.strftime('%Y-%m-%dT%H:%M:%SZ')
+            resp = self._metered_get("gnews", url, params)
+            if resp is None: return []
             data = resp.json()
             return [{"title": a["title"], "url": a["url"], "content": a["description"], "source": a["source"]["name"], "published_at": a["publishedAt"], "type": "api", "credibility": "high"} for a in data.get("articles", [])]
         except: return []
 
+    def _fetch_hn_item(self, story_id: int) -> Optional[Dict]:
+        """One item payload ({} for deleted items), or None if the request failed"""
+        try:
+            resp = http_client.get(f"{HN_API}/item/{story_id}.json", timeout=5)
+            resp.raise_for_status()
+            return resp.json() or {}
+        except Exception:
+            return None
+
     def fetch_hacker_news(self) -> List[Dict]:
         """Hacker News API (Unlimited) - High signal for tech sector"""
         try:
-            # Get top 15 stories - Firebase API
-            url = "https://hacker-news.firebaseio.com/v0/topstories.json?print=pretty"
-            story_ids = requests.get(url, timeout=5).json()[:15]
+            # Get top 15 stories - Firebase API; only IDs not seen before are fetched
+            story_ids = http_client.get(f"{HN_API}/topstories.json", timeout=5).json()[:15]
+            items = hn_item_cache.get_many(story_ids)
+            missing = [sid for sid in story_ids if sid not in items]
+            if missing:
+                fetched = dict(zip(missing, _hn_pool.map(self._fetch_hn_item, missing)))
+                fetched = {sid: item for sid, item in fetched.items() if item is not None}
+                hn_item_cache.put_many(fetched)
+                items.update(fetched)
+
             articles = []
             for sid in story_ids:
-                s_url = f"https://hacker-news.firebaseio.com/v0/item/{sid}.json?print=pretty"
-                s_data = requests.get(s_url, timeout=5).json()
+                s_data = items.get(sid) or {}
                 if s_data.get("url"):
                     articles.append({
                         "title": s_data.get("title"),
@@ -145,35 +217,64 @@ class NewsIngestionLayer:
     # 2. FREE RSS FEEDS (UNLIMITED)
     # ==========================================================================
 
-    def fetch_rss_feeds(self, tickers: List[str]) -> List[Dict]:
-        """Support for Reuters, Bloomberg, CNBC, FT, WSJ, Yahoo, SEC Edgar"""
+    def _fetch_feed(self, url: str, to_articles: Callable[[Any], List[Dict]]) -> List[Dict]:
+        """
+        Conditional GET of a feed; a 304 returns the articles parsed last time without parsing
+
+        Args:
+            url: feed URL
+            to_articles: turns the parsed entry dicts (title, link, summary, ...) into article dicts
+        """
+        cached = feed_cache.get(url)
+        headers = {**self.headers, **feed_cache.conditional_headers(cached)}
+        try:
+            resp = http_client.get(url, headers=headers, timeout=10)
+            if resp.status_code == 304 and cached:
+                feed_cache.record(url, "not_modified", bytes_saved=cached["content_length"])
+                return cached["articles"]
+            resp.raise_for_status()
+        except Exception:
+            feed_cache.record(url, "error")
+            raise
+
+        articles = to_articles(parse_pool.feed_entries(resp.content))
+        feed_cache.store(url, resp.headers.get("ETag"), resp.headers.get("Last-Modified"), articles, len(resp.content))
+        feed_cache.record(url, "modified", bytes_downloaded=len(resp.content))
+        return articles
+
+    def _rss_feed_list(self, tickers: List[str]) -> List[Tuple[str, str, str, str]]:
+        """(label, source name, url, credibility) for every RSS feed"""
         feeds = [
-            ("Reuters", "http://feeds.reuters.com/reuters/businessNews", "high"),
-            ("Bloomberg", "https://feeds.bloomberg.com/markets/news.rss", "high"),
-            ("CNBC", "https://www.cnbc.com/id/100003114/device/rss/rss.html", "high"),
-            ("Financial Times", "https://www.ft.com/rss/home/us", "high"),
-            ("WSJ", "https://feeds.a.dj.com/rss/RSSMarketsMain.xml", "high")
+            ("rss:Reuters", "Reuters", "http://feeds.reuters.com/reuters/businessNews", "high"),
+            ("rss:Bloomberg", "Bloomberg", "https://feeds.bloomberg.com/markets/news.rss", "high"),
+            ("rss:CNBC", "CNBC", "https://www.cnbc.com/id/100003114/device/rss/rss.html", "high"),
+            ("rss:Financial Times", "Financial Times", "https://www.ft.com/rss/home/us", "high"),
+            ("rss:WSJ", "WSJ", "https://feeds.a.dj.com/rss/RSSMarketsMain.xml", "high")
         ]
         
         # Add Ticker-specific feeds
         for t in tickers[:3]:
-            feeds.append(("Yahoo Finance", f"https://finance.yahoo.com/rss/headline?s={t}", "medium"))
-            feeds.append(("SEC EDGAR", f"https://www.sec.gov/cgi-bin/browse-edgar?company={t}&output=atom", "high"))
+            feeds.append((f"rss:Yahoo Finance:{t}", "Yahoo Finance", f"https://finance.yahoo.com/rss/headline?s={t}", "medium"))
+            feeds.append((f"rss:SEC EDGAR:{t}", "SEC EDGAR", f"https://www.sec.gov/cgi-bin/browse-edgar?company={t}&output=atom", "high"))
+        return feeds
+
+    def _fetch_feed_entries(self, name: str, url: str, cred: str) -> List[Dict]:
+        return self._fetch_feed(url, lambda entries: [{
+            "title": entry["title"],
+            "url": entry["link"],
+            "content": entry.get("summary", entry.get("description", "")),
+            "source": name,
+            "published_at": entry.get("published", datetime.now().isoformat()),
+            "type": "rss",
+            "credibility": cred
+        } for entry in entries[:10]])
 
+    def fetch_rss_feeds(self, tickers: List[str]) -> List[Dict]:
+        """Support for Reuters, Bloomberg, CNBC, FT, WSJ, Yahoo, SEC Edgar"""
         articles = []
-        for name, url, cred in feeds:
+        for _, name, url, cred in self._rss_feed_list(tickers):
             try:
-                feed = feedparser.parse(url)
-                for entry in feed.entries[:10]:
-                    articles.append({
-                        "title": entry.title,
-                        "url": entry.link,
-                        "content": entry.get("summary", entry.get("description", "")),
-                        "source": name,
-                        "published_at": entry.get("published", datetime.now().isoformat()),
-                        "type": "rss",
-                        "credibility": cred
-                    })
+                articles.extend(self._fetch_feed_entries(name, url, cred))
             except: continue
         return articles
 
@@ -184,16 +285,15 @@ class NewsIngestionLayer:
     def fetch_google_news_rss(self, query: str) -> List[Dict]:
         try:
             url = f"https://news.google.com/rss/search?q={query}&hl=en-US&gl=US&ceid=US:en"
-            feed = feedparser.parse(url)
-            return [{
-                "title": e.title,
-                "url": e.link,
+            return self._fetch_feed(url, lambda entries: [{
+                "title": e["title"],
+                "url": e["link"],
                 "content": e.get("summary", ""),
                 "source": "Google News",
                 "published_at": e.get("published", ""),
                 "type": "rss",
                 "credibility": "medium"
-            } for e in feed.entries[:15]]
+            } for e in entries[:15]])
         except: return []
 
     # ==========================================================================
@@ -201,48 +301,16 @@ class NewsIngestionLayer:
     # ==========================================================================
 
     def scrape_source(self, url: str) -> str:
-        """Throttled scraper to extract only body text if available."""
-        try:
-            # Throttling
-            time.sleep(1) 
-            resp = requests.get(url, headers=self.headers, timeout=10)
-            if resp.status_code != 200: return ""
-            
-            soup = BeautifulSoup(resp.content, "html.parser")
-            # Remove scripts
-            for s in soup(["script", "style"]): s.decompose()
-            
-            # Simple body text extraction
-            paragraphs = soup.find_all('p')
-            return " ".join([p.text.strip() for p in paragraphs if len(p.text) > 30])[:5000]
-        except: return ""
+        """Body text for one article (robots.txt compliant, per-domain throttled, cached)."""
+        return scrape_scheduler.scrape(url, self.headers)
 
     # ==========================================================================
     # 5. DEDUPLICATION & PRIORITIZATION
     # ==========================================================================
 
     def deduplicate_by_similarity(self, articles: List[Dict]) -> List[Dict]:
-        """Deduplicate by URL and 60% headline overlap."""
-        unique = []
-        seen_urls = set()
-        
-        for art in articles:
-            if art["url"] in seen_urls: continue
-            
-            # Similarity check
-            is_dup = False
-            words = set(re.findall(r'\w+', art["title"].lower()))
-            for u in unique:
-                u_words = set(re.findall(r'\w+', u["title"].lower()))
-                overlap = len(words & u_words)
-                if overlap / max(len(words), 1) > 0.6:
-                    is_dup = True
-                    break
-            
-            if not is_dup:
-                seen_urls.add(art["url"])
-                unique.append(art)
-        return unique
+        """Deduplicate by URL and 60% headline overlap (prefix-filtered inverted index, exact overlap check)."""
+        return deduplicate_headlines(articles)
 
     def filter_and_prioritize(self, articles: List[Dict], portfolio: List[str]) -> List[Dict]:
         """Prioritize based on source credibility and mapping."""
@@ -251,52 +319,216 @@ class NewsIngestionLayer:
         
         return sorted(articles, key=get_priority)
 
+    # ==========================================================================
+    # 6. CONCURRENT FAN-OUT
+    # ==========================================================================
+
+    def _source_tasks(self, tickers: List[str], query: str,
+                      incremental: bool = False) -> List[Tuple[str, Callable[[], List[Dict]]]]:
+        """(label, fetcher) pairs in priority order: RSS first, then the official APIs"""
+        tasks = [(label, partial(self._fetch_feed_entries, name, url, cred))
+                 for label, name, url, cred in self._rss_feed_list(tickers)]
+        tasks.append(("google_news", partial(self.fetch_google_news_rss, query)))
+        # APIs with a from-time parameter get the cursor so they return only the newer items
+        for label, fetch in [("newsapi", self.fetch_news_api), ("newsdata", self.fetch_newsdata),
+                             ("finnhub", self.fetch_finnhub), ("gnews", self.fetch_gnews)]:
+            since = ingest_cursors.since(label, self._cursor_query(label, query)) if incremental else None
+            tasks.append((label, partial(fetch, query, since) if since else partial(fetch, query)))
+        tasks.append(("hacker_news", self.fetch_hacker_news))
+        return tasks
+
+    @staticmethod
+    def _cursor_query(label: str, query: str) -> str:
+        # RSS feeds are fixed per label; search sources depend on the query
+        return "" if label.startswith("rss:") else query
+
+    @staticmethod
+    def _timed(fetch: Callable[[], List[Dict]]) -> Tuple[List[Dict], float, Optional[str]]:
+        started = time.monotonic()
+        try:
+            return fetch() or [], time.monotonic() - started, None
+        except Exception as e:
+            return [], time.monotonic() - started, str(e)
+
+    def _iter_sources(self, tasks: List[Tuple[str, Callable[[], List[Dict]]]], query: str, deadline: float,
+                      concurrent: bool, incremental: bool,
+                      report: Optional[Dict] = None) -> Iterator[Tuple[str, List[Dict]]]:
+        """
+        (label, articles) for each source as soon as it completes, until the deadline
+
+        Per-source timings go to self.last_report (and `report`, if given) once the iteration
+        ends, also when the consumer stops early; sources still running then are timeouts.
+        """
+        started = time.monotonic()
+        timings = {label: {"status": "timeout", "seconds": None, "articles": 0} for label, _ in tasks}
+
+        def finish(label: str, result: Tuple[List[Dict], float, Optional[str]]) -> List[Dict]:
+            fetched, seconds, error = result
+            received = len(fetched)
+            if incremental and label in RANKED_SOURCES:
+                unseen = set(url_index.filter_unseen(a["url"] for a in fetched))
+                fetched = [a for a in fetched if a["url"] in unseen]
+            elif incremental:
+                fetched = ingest_cursors.filter_new(label, self._cursor_query(label, query), fetched)
+            timings[label] = {"status": "error" if error else "ok", "seconds": round(seconds, 3), "articles": len(fetched)}
+            if incremental:
+                timings[label]["stale"] = received - len(fetched)
+            return fetched
+
+        try:
+            if concurrent:
+                futures = {_fetch_pool.submit(self._timed, fetch): label for label, fetch in tasks}
+                pending = set(futures)
+                try:
+                    while pending:
+                        remaining = deadline - (time.monotonic() - started)
+                        done, pending = wait(pending, timeout=max(remaining, 0), return_when=FIRST_COMPLETED)
+                        if not done:
+                            break
+                        for future in done:
+                            yield futures[future], finish(futures[future], future.result())
+                finally:
+                    for future in pending:
+                        future.cancel()  # Queued ones never start; running ones finish unobserved
+            else:
+                for label, fetch in tasks:
+                    if time.monotonic() - started >= deadline:
+                        break
+                    yield label, finish(label, self._timed(fetch))
+        finally:
+            elapsed = time.monotonic() - started
+            self.last_report = {"finished_at": datetime.now().isoformat(), "elapsed": round(elapsed, 3),
+                                "concurrent": concurrent, "timings": timings}
+            if report is not None:
+                report.update(self.last_report, elapsed=elapsed)
+            late = [label for label, t in timings.items() if t["status"] == "timeout"]
+            fetched_count = sum(t["articles"] for t in timings.values())
+            logger.info(f"📡 Fetched {fetched_count} articles from {len(timings) - len(late)}/{len(timings)} sources "
+                        f"in {elapsed:.2f}s" + (f" (deadline missed: {', '.join(late)})" if late else ""))
+
+    def _selected_tasks(self, tickers: List[str], query: str, sources: Optional[List[str]],
+                        incremental: bool) -> List[Tuple[str, Callable[[], List[Dict]]]]:
+        return [(label, fetch) for label, fetch in self._source_tasks(tickers, query, incremental)
+                if sources is None or label.split(":")[0] in sources]
+
+    def fetch_all_sources(self, tickers: List[str], query: Optional[str] = None, sources: Optional[List[str]] = None,
+                          deadline: float = INGEST_DEADLINE_SECONDS, concurrent: bool = INGEST_CONCURRENT,
+                          incremental: bool = False) -> Dict:
+        """
+        Fetch every source at once and keep whatever finished before the deadline
+
+        Args:
+            tickers: portfolio tickers (drive the ticker-specific RSS feeds)
+            query: search query for the API sources (defaults to the first three tickers)
+            sources: only these sources, e.g. ["newsapi", "finnhub"] ("rss" selects every feed)
+            deadline: seconds allowed for the whole fan-out
+            concurrent: False runs the same sources one after another (same deadline)
+            incremental: only items newer than each source's persisted high-water mark
+                         (RANKED_SOURCES: only URLs not yet processed)
+
+        Returns:
+            {"articles": [...], "elapsed": seconds, "timings": {source: {"status", "seconds", "articles"}}}
+        """
+        query = query or " OR ".join(tickers[:3])
+        tasks = self._selected_tasks(tickers, query, sources, incremental)
+        report: Dict = {}
+        results = dict(self._iter_sources(tasks, query, deadline, concurrent, incremental, report))
+        if incremental:
+            # Everything goes back to the caller at once, so the cursors move now
+            for label, fetched in results.items():
+                if label not in RANKED_SOURCES:
+                    ingest_cursors.commit(label, self._cursor_query(label, query), fetched)
+
+        # Merge in task order, whatever order the sources finished in
+        articles = [article for label, _ in tasks for article in results.get(label, [])]
+        return {"articles": articles, "elapsed": report["elapsed"], "timings": report["timings"]}
+
     # ==========================================================================
     # MAIN INGESTION WORKFLOW
     # ==========================================================================
 
-    def ingest_all(self, tickers: List[str]) -> List[Article]:
-        all_raw = []
-        q = " OR ".join(tickers[:3]) # Optimize query
+    def ingest_all(self, tickers: List[str], unseen_only: bool = False, incremental: bool = False) -> List[Article]:
+        """
+        Fetch, deduplicate and prioritize news for the portfolio
 
-        # 1. RSS (Highest Priority per rule)
-        logger.info("Ingesting RSS Feeds...")
-        all_raw.extend(self.fetch_rss_feeds(tickers))
-        all_raw.extend(self.fetch_google_news_rss(q))
+        unseen_only: drop articles whose canonical URL already went through the LLM pipeline
+        incremental: fetch only items newer than each source's cursor (see fetch_all_sources)
+        """
+        q = " OR ".join(tickers[:3]) # Optimize query
 
-        # 2. APIs
-        logger.info("Ingesting Official APIs...")
-        all_raw.extend(self.fetch_news_api(q))
-        all_raw.extend(self.fetch_newsdata(q))
-        all_raw.extend(self.fetch_finnhub(q))
-        all_raw.extend(self.fetch_gnews(q))
-        all_raw.extend(self.fetch_hacker_news())
+        # 1-2. RSS and official APIs, fetched concurrently (RSS keeps first place in the merge order)
+        logger.info("Ingesting RSS Feeds and Official APIs...")
+        all_raw = self.fetch_all_sources(tickers, q, incremental=incremental)["articles"]
 
         # 3. Deduplicate & Prioritize
         deduped = self.deduplicate_by_similarity(all_raw)
+        if unseen_only:
+            unseen = set(url_index.filter_unseen(a["url"] for a in deduped))
+            logger.info(f"🔖 {len(deduped) - len(unseen)} already-processed articles skipped")
+            deduped = [a for a in deduped if a["url"] in unseen]
         prioritized = self.filter_and_prioritize(deduped, tickers)
 
-        # 4. Final Object Creation
-        final_articles = []
-        for a in prioritized[:20]: # Return top 20 relevant
-            # Optional: Scrape full text for top highly credible hits if missing
-            full_text = a["content"]
-            if len(full_text) < 200 and a["source"] in ["Reuters", "CNBC", "The Guardian"]:
-                 # Throttled scraping as fallback
-                 full_text = self.scrape_source(a["url"]) or full_text
-
-            final_articles.append(Article(
-                title=a["title"],
-                url=a["url"],
-                source=a["source"],
-                published_at=datetime.now(timezone.utc), # simplified
-                content=full_text,
-                companies_mentioned=tickers, # Placeholder for logic
-                priority=self.priority_map.get(a["source"], 99),
-                relevance="direct" if a["credibility"] == "high" else "indirect"
-            ))
-            
-        return final_articles
+        # 4. Scrape full text for highly credible hits with short content (domains in parallel)
+        top = prioritized[:20] # Return top 20 relevant
+        scraped = self._scrape_short(top)
+
+        # 5. Final Object Creation
+        return [self._to_article(a, scraped, tickers) for a in top]
+
+    def _scrape_short(self, articles: List[Dict]) -> Dict[str, str]:
+        """Full text for credible articles whose feed content is too short"""
+        to_scrape = [a["url"] for a in articles
+                     if len(a["content"] or "") < 200 and a["source"] in ["Reuters", "CNBC", "The Guardian"]]
+        return scrape_scheduler.scrape_many(to_scrape, self.headers) if to_scrape else {}
+
+    def _to_article(self, a: Dict, scraped: Dict[str, str], tickers: List[str]) -> Article:
+        return Article(
+            title=a["title"],
+            url=a["url"],
+            source=a["source"],
+            published_at=datetime.now(timezone.utc), # simplified
+            content=scraped.get(a["url"]) or a["content"],
+            companies_mentioned=mention_index.extract(f"{a['title']} {a['content']}"),
+            priority=self.priority_map.get(a["source"], 99),
+            relevance="direct" if a["credibility"] == "high" else "indirect"
+        )
+
+    def stream_batches(self, tickers: List[str], query: Optional[str] = None, sources: Optional[List[str]] = None,
+                       unseen_only: bool = False, incremental: bool = False,
+                       deadline: float = INGEST_DEADLINE_SECONDS) -> Iterator[ArticleBatch]:
+        """
+        Streaming ingest_all: one batch of new Articles per source, as soon as that source completes
+
+        Headline dedup state carries across batches, so an article is yielded once however many
+        sources carry it. Batches are prioritized internally, but arrive in completion order, and
+        the consumer can start LLM work (or stop) while slower sources are still in flight.
+        With incremental=True a source's cursor only moves when the consumer calls batch.commit().
+        """
+        query = query or " OR ".join(tickers[:3])
+        dedup = HeadlineDeduplicator()
+        tasks = self._selected_tasks(tickers, query, sources, incremental)
+        for label, fetched in self._iter_sources(tasks, query, deadline, INGEST_CONCURRENT, incremental):
+            commit = None
+            if incremental and label not in RANKED_SOURCES:
+                commit = partial(ingest_cursors.commit, label, self._cursor_query(label, query), fetched)
+            # Headline copies and already-processed URLs count as done for this source's cursor
+            fresh = [a for a in fetched if dedup.add(a)]
+            if unseen_only and fresh:
+                unseen = set(url_index.filter_unseen(a["url"] for a in fresh))
+                fresh = [a for a in fresh if a["url"] in unseen]
+            if not fresh:
+                if commit:
+                    commit()
+                continue
+            fresh = self.filter_and_prioritize(fresh, tickers)
+            scraped = self._scrape_short(fresh)
+            logger.info(f"🌊 {label}: {len(fresh)} new article(s) streamed ({len(dedup)} so far)")
+            yield ArticleBatch([self._to_article(a, scraped, tickers) for a in fresh], label, commit)
+
+    def stream_articles(self, tickers: List[str], **kwargs) -> Iterator[Article]:
+        """Article-at-a-time view of stream_batches (same arguments)"""
+        for batch in self.stream_batches(tickers, **kwargs):
+            yield from batch
 
 # Singleton
 news_aggregator_layer = NewsIngestionLayer()
@@ -0,0 +1,150 @@
+"""
+News Snapshot Cache
+One shared fan-out result per ticker set for GET /articles, served with
+stale-while-revalidate semantics: fresh snapshots are returned as-is, stale ones
+are returned immediately while a single background refresh runs, and a background
+task keeps recently requested ticker sets warm
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Optional
+
+from app.config import (
+    NEWS_SNAPSHOT_TTL_SECONDS, NEWS_SNAPSHOT_MAX_STALE_SECONDS, NEWS_SNAPSHOT_IDLE_SECONDS, NEWS_SNAPSHOT_MAX_KEYS
+)
+from app.services.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+def snapshot_key(tickers: Iterable[str]) -> str:
+    """Order-insensitive key for a ticker set"""
+    return ",".join(sorted({t.strip().upper() for t in tickers if t and t.strip()}))
+
+
+class NewsSnapshotCache:
+    """In-memory per-ticker-set article snapshots with background revalidation"""
+
+    def __init__(self, fetch: Optional[Callable[[List[str]], List[Dict]]] = None,
+                 ttl_seconds: int = NEWS_SNAPSHOT_TTL_SECONDS, max_stale_seconds: int = NEWS_SNAPSHOT_MAX_STALE_SECONDS,
+                 idle_seconds: int = NEWS_SNAPSHOT_IDLE_SECONDS, max_keys: int = NEWS_SNAPSHOT_MAX_KEYS):
+        self.fetch = fetch or self._fetch_all_sources
+        self.ttl_seconds = ttl_seconds
+        self.max_stale_seconds = max_stale_seconds
+        self.idle_seconds = idle_seconds
+        self.max_keys = max_keys
+        self.snapshots: Dict[str, Dict] = {}  # key -> {"articles", "fetched_at", "as_of", "last_requested"}
+        self.flight = SingleFlight("news-snapshot")
+        self.pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="snapshot")
+        self.lock = Lock()
+        self.stats = {"fresh_hits": 0, "stale_hits": 0, "cold_fetches": 0, "refreshes": 0, "refresh_errors": 0}
+
+    @staticmethod
+    def _fetch_all_sources(tickers: List[str]) -> List[Dict]:
+        from app.services.news_aggregator import news_aggregator_layer
+        return news_aggregator_layer.fetch_all_sources(tickers, " OR ".join(tickers))["articles"]
+
+    def _refresh(self, key: str) -> Dict:
+        """Fetch the ticker set once (concurrent callers for the same key share the fetch)"""
+        def run():
+            started = time.monotonic()
+            articles = self.fetch(key.split(","))
+            now = time.time()
+            with self.lock:
+                entry = self.snapshots.get(key, {"last_requested": now})
+                entry.update({"articles": articles, "fetched_at": now,
+                              "as_of": datetime.fromtimestamp(now, tz=timezone.utc).isoformat()})
+                self.snapshots[key] = entry
+                self.stats["refreshes"] += 1
+                self._evict()
+            logger.info(f"🗞️ News snapshot [{key}] refreshed: {len(articles)} articles in {time.monotonic() - started:.2f}s")
+            return entry
+
+        entry, _ = self.flight.do(key, run)
+        return entry
+
+    def _refresh_quietly(self, key: str):
+        try:
+            self._refresh(key)
+        except Exception as e:
+            with self.lock:
+                self.stats["refresh_errors"] += 1
+            logger.warning(f"News snapshot refresh failed for [{key}]: {e}")
+
+    def _evict(self):
+        # Called with self.lock held: drop the least recently requested sets beyond max_keys
+        while len(self.snapshots) > self.max_keys:
+            oldest = min(self.snapshots, key=lambda k: self.snapshots[k]["last_requested"])
+            del self.snapshots[oldest]
+
+    def get(self, tickers: Iterable[str]) -> Dict:
+        """
+        Snapshot for a ticker set
+
+        Returns:
+            {"articles": [...], "as_of": ISO timestamp of the fetch, "stale": bool}
+        """
+        key = snapshot_key(tickers)
+        now = time.time()
+        with self.lock:
+            entry = self.snapshots.get(key)
+            if entry:
+                entry["last_requested"] = now
+        age = now - entry["fetched_at"] if entry else None
+
+        if entry is None or age > self.max_stale_seconds:
+            with self.lock:
+                self.stats["cold_fetches"] += 1
+            entry = self._refresh(key)
+            stale = False
+        elif age > self.ttl_seconds:
+            # Serve what we have; one refresh per key runs behind it
+            with self.lock:
+                self.stats["stale_hits"] += 1
+            if key not in self.flight.calls:
+                self.pool.submit(self._refresh_quietly, key)
+            stale = True
+        else:
+            with self.lock:
+                self.stats["fresh_hits"] += 1
+            stale = False
+        return {"articles": entry["articles"], "as_of": entry["as_of"], "stale": stale}
+
+    def track(self, tickers: Iterable[str]):
+        """Register a ticker set (e.g. the holdings) for background refresh without serving it"""
+        key = snapshot_key(tickers)
+        if not key:
+            return
+        with self.lock:
+            if key not in self.snapshots:
+                self.snapshots[key] = {"articles": [], "fetched_at": 0.0, "as_of": None, "last_requested": time.time()}
+            else:
+                self.snapshots[key]["last_requested"] = time.time()
+
+    def refresh_due(self):
+        """Background task: refresh every recently requested set whose snapshot is past its TTL"""
+        now = time.time()
+        with self.lock:
+            idle = [k for k, e in self.snapshots.items() if now - e["last_requested"] > self.idle_seconds]
+            for key in idle:
+                del self.snapshots[key]
+            due = [k for k, e in self.snapshots.items() if now - e["fetched_at"] >= self.ttl_seconds]
+        for key in due:
+            self._refresh_quietly(key)
+
+    def get_stats(self) -> Dict:
+        now = time.time()
+        with self.lock:
+            stats = dict(self.stats)
+            stats["snapshots"] = {key: {"articles": len(e["articles"]), "as_of": e["as_of"],
+                                        "age_seconds": round(now - e["fetched_at"], 1) if e["fetched_at"] else None}
+                                  for key, e in self.snapshots.items()}
+        return stats
+
+
+# Singleton
+news_snapshot = NewsSnapshotCache()
@@ -0,0 +1,113 @@
+"""
+Parse Pool
+feedparser and BeautifulSoup are pure-Python and hold the GIL for the whole parse, so a
+multi-MB 10-K or a burst of feeds stalls request threads and the scheduler. This stage
+takes raw bytes and returns plain records (entry dicts, text), parsing either inline or,
+when PARSE_POOL_WORKERS > 0, in worker processes for documents above a size threshold.
+"""
+
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from threading import Lock
+from typing import Callable, Dict, List, Optional
+
+import feedparser
+from bs4 import BeautifulSoup
+
+from app.config import PARSE_POOL_WORKERS, PARSE_POOL_MIN_BYTES
+
+logger = logging.getLogger(__name__)
+
+ENTRY_FIELDS = ("title", "link", "summary", "description", "published")
+
+
+# Worker functions: module-level so they pickle; they must not touch the database or singletons
+
+def feed_entries(content: bytes) -> List[Dict[str, str]]:
+    """Entries of an RSS/Atom document as plain dicts (only the fields the feed carries)"""
+    parsed = feedparser.parse(content)
+    return [{field: str(entry[field]) for field in ENTRY_FIELDS if field in entry} for entry in parsed.entries]
+
+
+def article_text(html: bytes) -> str:
+    """Body text of an article page: paragraphs longer than 30 chars, capped at 5000 chars"""
+    soup = BeautifulSoup(html, "html.parser")
+    for s in soup(["script", "style"]):
+        s.decompose()
+    paragraphs = soup.find_all('p')
+    return " ".join([p.text.strip() for p in paragraphs if len(p.text) > 30])[:5000]
+
+
+def document_text(html: bytes) -> str:
+    """All visible text of a (filing) document, whitespace-joined"""
+    return BeautifulSoup(html, "html.parser").get_text(separator=' ', strip=True)
+
+
+class ParsePool:
+    """Runs the parsers inline or in a lazily started process pool"""
+
+    def __init__(self, workers: int = PARSE_POOL_WORKERS, min_bytes: int = PARSE_POOL_MIN_BYTES):
+        self.workers = workers
+        self.min_bytes = min_bytes
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.lock = Lock()
+        self.stats = {"inline": 0, "offloaded": 0, "fallbacks": 0, "bytes_offloaded": 0}
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self.lock:
+            if self.executor is None:
+                # spawn: forking a process that already runs threads can deadlock the child
+                self.executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                    mp_context=multiprocessing.get_context("spawn"))
+                logger.info(f"🧵 Parse pool started with {self.workers} worker processes")
+            return self.executor
+
+    def _bump(self, key: str, amount: int = 1):
+        with self.lock:
+            self.stats[key] += amount
+
+    def run(self, parse: Callable[[bytes], object], content: bytes):
+        """Apply a worker function to content; small inputs (or a disabled pool) are parsed inline"""
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        if self.workers <= 0 or len(content) < self.min_bytes:
+            self._bump("inline")
+            return parse(content)
+        try:
+            result = self._executor().submit(parse, content).result()
+        except BrokenProcessPool as e:
+            # A worker died (e.g. OOM on a huge document): parse here and start a fresh pool next time
+            logger.warning(f"Parse pool broken ({e}); parsing inline")
+            with self.lock:
+                self.executor = None
+                self.stats["fallbacks"] += 1
+            return parse(content)
+        self._bump("offloaded")
+        self._bump("bytes_offloaded", len(content))
+        return result
+
+    def feed_entries(self, content: bytes) -> List[Dict[str, str]]:
+        return self.run(feed_entries, content)
+
+    def article_text(self, html: bytes) -> str:
+        return self.run(article_text, html)
+
+    def document_text(self, html: bytes) -> str:
+        return self.run(document_text, html)
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            return {**self.stats, "workers": self.workers, "min_bytes": self.min_bytes,
+                    "started": self.executor is not None}
+
+    def close(self):
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Singleton
+parse_pool = ParsePool()
@@ -3,6 +3,7 @@ import json
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from app.services.database import get_db_connection
+from app.services.mention_extractor import mention_index
 from app.models.article import Article
 
 logger = logging.getLogger(__name__)
@@ -91,38 +92,40 @@ class PersistenceService:
         return [dict(row) for row in rows]
     
     def get_articles_for_portfolio(self, tickers: List[str], limit: int = 10) -> List[Dict]:
-        """Get articles that mention any of the portfolio companies."""
+        """Get articles that mention any of the portfolio companies (by ticker or company name)."""
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Build query to find articles mentioning any ticker
-        placeholders = ' OR '.join([f"(title LIKE ? OR content LIKE ? OR reasoning LIKE ?)" for _ in tickers])
-        query = f"SELECT * FROM articles WHERE {placeholders} ORDER BY published_at DESC LIMIT ?"
+        # Prefilter on every alias ("AAPL", "$AAPL", "Apple", ...); LIKE also hits substrings
+        # ("ARM" in "pharma"), so exact word-boundary matching below decides
+        terms = mention_index.aliases_for(tickers)
+        placeholders = ' OR '.join([f"(title LIKE ? OR content LIKE ?)" for _ in terms])
+        query = f"SELECT * FROM articles WHERE {placeholders} ORDER BY published_at DESC LIMIT ? OFFSET ?"
         
-        # Create parameters: for each ticker, we need 3 wildcards
+        # Create parameters: for each alias, we need 2 wildcards
         params = []
-        for ticker in tickers:
-            search_term = f"%{ticker}%"
-            params.extend([search_term, search_term, search_term])
-        params.append(limit)
+        for term in terms:
+            search_term = f"%{term}%"
+            params.extend([search_term, search_term])
         
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        conn.close()
-        
-        # Add affected_companies field
+        # Page through candidates until `limit` exact matches are collected
         articles = []
-        for row in rows:
-            article = dict(row)
-            affected = []
-            text = f"{article.get('title', '')} {article.get('content', '')} {article.get('reasoning', '')}".upper()
-            for ticker in tickers:
-                if ticker.upper() in text:
-                    affected.append(ticker.upper())
-            article['affected_companies'] = affected
-            articles.append(article)
+        page_size, offset = max(limit * 3, 30), 0
+        while len(articles) < limit:
+            cursor.execute(query, params + [page_size, offset])
+            rows = cursor.fetchall()
+            for row in rows:
+                article = dict(row)
+                text = f"{article.get('title', '')} {article.get('content', '')}"
+                article['affected_companies'] = mention_index.extract(text, tickers)
+                if article['affected_companies']:
+                    articles.append(article)
+            if len(rows) < page_size:
+                break
+            offset += page_size
+        conn.close()
         
-        return articles
+        return articles[:limit]
 
     # --- ALERT & REASONING TRAIL ---
     def save_alert(self, alert_id: str, headline: str, severity: str, impact_pct: float, article_id: str,
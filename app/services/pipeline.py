@@ -10,13 +10,16 @@ from app.models.article import Article
 from app.models.alert import Alert, AffectedHolding
 from app.models.knowledge_graph import KnowledgeGraph
 from app.services.gemini_client import gemini_client
+from app.services.analysis_reuse import analysis_reuse, portfolio_kind
+from app.services.url_index import url_index
+from app.models.analysis import ArticleAnalysis
 from app.services.database import get_db_connection
 from app.services import persistence  # For database operations
 database = persistence.persistence_service  # Database service singleton
 from app.services.market_data import market_data_service
 from app.config import (
     SUPPLY_CHAIN_COMPANIES,
-    SEVERITY_THRESHOLDS, MIN_CONFIDENCE, COMPANY_TICKERS
+    SEVERITY_THRESHOLDS, MIN_CONFIDENCE, COMPANY_TICKERS, LLM_FUSED_ANALYSIS
 )
 
 logger = logging.getLogger(__name__)
@@ -75,7 +78,8 @@ class Pipeline:
                 return None
 
             # Check if article is too old (>7 days)
-            age_days = (datetime.now() - article.published_at).days
+            # Ingested articles carry aware UTC stamps, hand-built ones naive local time
+            age_days = (datetime.now(article.published_at.tzinfo) - article.published_at).days
             if age_days > 7:
                 logger.info(f"Article too old ({age_days} days): {article.title}")
                 return None
@@ -108,19 +112,24 @@ class Pipeline:
         try:
             logger.info(f"Extracting relationships from: {article.title}")
 
-            result = gemini_client.extract_relationships(
-                article.content,
-                article.title
-            )
+            # Syndicated copies of an already-extracted story skip the LLM
+            result = analysis_reuse.reuse("extraction", article.id, article.title, article.content)
+            if result is None:
+                result = gemini_client.extract_relationships(
+                    article.content,
+                    article.title
+                )
+                if result and result.get('event_type') != "market_news_heuristic":
+                    analysis_reuse.remember("extraction", article.id, article.title, article.content, result)
+
+            # Update article with event type (also when nothing was found: the LLM did answer)
+            if result and result.get('event_type'):
+                article.event_type = result['event_type']
 
             if not result or not result.get('relationships'):
                 logger.info("No relationships found")
                 return None
 
-            # Update article with event type
-            if result.get('event_type'):
-                article.event_type = result['event_type']
-
             logger.info(f"✓ Extracted {len(result['relationships'])} relationships")
             return result
 
@@ -128,6 +137,42 @@ class Pipeline:
             logger.error(f"Error in relation_extractor: {str(e)}")
             return None
 
+    def article_analyzer(self, article: Article, portfolio_companies: List[str]) -> Optional[Dict]:
+        """
+        Fused extraction: relationships and direct impact from one LLM call
+
+        Args:
+            article: Validated article
+            portfolio_companies: Portfolio tickers
+
+        Returns:
+            Dict with 'extraction' (relation_extractor shape, or None if no
+            relationships) and 'direct_impact', or None to use the separate calls
+        """
+        try:
+            logger.info(f"Analyzing (fused): {article.title}")
+            kind = portfolio_kind("analysis", portfolio_companies)
+            reused = analysis_reuse.reuse(kind, article.id, article.title, article.content)
+            if reused is not None:
+                analysis = ArticleAnalysis(**reused)
+            else:
+                analysis = gemini_client.analyze_article(article.content, article.title, portfolio_companies)
+                if analysis is None:
+                    return None
+                analysis_reuse.remember(kind, article.id, article.title, article.content, analysis.to_dict())
+
+            if analysis.event_type:
+                article.event_type = analysis.event_type
+
+            return {
+                "extraction": analysis.to_extraction() if analysis.relationships else None,
+                "direct_impact": analysis.to_direct_impact()
+            }
+
+        except Exception as e:
+            logger.error(f"Error in article_analyzer: {str(e)}")
+            return None
+
     # ═══════════════════════════════════════════════════════════════════
     # STAGE 3: RELATION VERIFIER
     # ═══════════════════════════════════════════════════════════════════
@@ -618,12 +663,13 @@ class Pipeline:
     # FULL PIPELINE EXECUTION
     # ═══════════════════════════════════════════════════════════════════
 
-    def process_article(self, article: Article) -> Optional[Alert]:
+    def process_article(self, article: Article, precomputed: Optional[Dict] = None) -> Optional[Alert]:
         """
         Run full pipeline on article
 
         Args:
             article: Article to process
+            precomputed: Stage 2 result from extract_relationships_batch, if already done
 
         Returns:
             Alert object or None
@@ -636,31 +682,58 @@ class Pipeline:
             if not validated_article:
                 return None
 
-            # Stage 2: Extract relationships
-            extraction_result = self.relation_extractor(validated_article)
+            # Stage 2: Extract relationships (fused mode also answers direct impact in the same call)
+            portfolio_data = self._get_portfolio()
+            portfolio_companies = [h["ticker"] for h in portfolio_data.get("portfolio", [])]
+
+            if precomputed is not None:
+                # Batched extraction already ran for this article (see process_articles)
+                if precomputed.get('event_type'):
+                    validated_article.event_type = precomputed['event_type']
+                fused = {
+                    "extraction": precomputed if precomputed.get('relationships') else None,
+                    "direct_impact": precomputed.get('direct_impact')
+                }
+            elif LLM_FUSED_ANALYSIS:
+                fused = self.article_analyzer(validated_article, portfolio_companies)
+            else:
+                fused = None
+
+            if fused:
+                extraction_result = fused["extraction"]
+            else:
+                extraction_result = self.relation_extractor(validated_article)
+
+            # Stage 2 answered by the LLM (not the heuristic fallback): only then is a final
+            # outcome recorded in processed_at, which process_articles uses to mark the URL seen
+            llm_answered = validated_article.event_type not in (None, "market_news_heuristic")
 
             # NEW: Stage 2B - If no relationships found, check for direct impact
             if not extraction_result or not extraction_result.get('relationships'):
                 logger.info("No relationships found, checking for direct impact...")
 
                 # Check for direct impact on portfolio companies
-                # Get portfolio from database
-                portfolio_data = self._get_portfolio()
-                portfolio_companies = [h["ticker"] for h in portfolio_data.get("portfolio", [])]
-
-                direct_impact = gemini_client.detect_direct_impact(
-                    validated_article.content,
-                    validated_article.title,
-                    portfolio_companies
-                )
+                if fused and fused.get("direct_impact") is not None:
+                    direct_impact = fused["direct_impact"]
+                else:
+                    direct_impact = gemini_client.detect_direct_impact(
+                        validated_article.content,
+                        validated_article.title,
+                        portfolio_companies
+                    )
 
                 if not direct_impact or not direct_impact.get('has_direct_impact'):
                     logger.info("No direct impact detected either")
+                    if llm_answered:
+                        validated_article.processed_at = datetime.now()
                     return None
 
                 # Handle direct impact (skip cascade inference, go straight to impact)
                 logger.info(f"✓ Direct impact detected: {direct_impact.get('impact_type')}")
-                return self._process_direct_impact(validated_article, direct_impact)
+                alert = self._process_direct_impact(validated_article, direct_impact)
+                if alert and llm_answered:
+                    validated_article.processed_at = datetime.now()
+                return alert
 
             relationships = extraction_result.get('relationships', [])
             event_summary = extraction_result.get('summary', validated_article.title)
@@ -669,6 +742,8 @@ class Pipeline:
             verified_relationships = self.relation_verifier(relationships)
             if not verified_relationships:
                 logger.info("No verified relationships")
+                if llm_answered:
+                    validated_article.processed_at = datetime.now()
                 return None
 
             # Stage 4: Infer cascade
@@ -753,12 +828,83 @@ class Pipeline:
 
             logger.info(f"\n✅ ALERT GENERATED: {alert.id}\n{'='*70}\n")
 
+            if llm_answered:
+                validated_article.processed_at = datetime.now()
             return alert
 
         except Exception as e:
             logger.error(f"Error in process_article: {str(e)}", exc_info=True)
             return None
 
+    def process_articles(self, articles: List[Article]) -> List[Alert]:
+        """
+        Run the pipeline on several articles, sharing batched extraction requests
+
+        Args:
+            articles: Articles to process
+
+        Returns:
+            Alerts generated
+        """
+        # Articles processed in an earlier run never reach the LLM again
+        unseen = set(url_index.filter_unseen(a.url for a in articles))
+        if len(unseen) < len(articles):
+            logger.info(f"🔖 Skipping {len(articles) - len(unseen)} already-processed articles")
+        articles = [a for a in articles if a.url in unseen]
+
+        validated = [a for a in articles if self.event_validator(a)]
+        if not validated:
+            return []
+
+        portfolio_companies = [h["ticker"] for h in self._get_portfolio().get("portfolio", [])]
+        kind = portfolio_kind("extraction", portfolio_companies)
+
+        # Near-duplicates of recently extracted stories reuse that result
+        extractions = {}
+        for article in validated:
+            reused = analysis_reuse.reuse(kind, article.id, article.title, article.content)
+            if reused is not None:
+                extractions[article.id] = reused
+
+        pending = [a for a in validated if a.id not in extractions]
+        # Copies of the same story inside this batch ride on the first one's extraction
+        followers = analysis_reuse.cluster(pending)
+        pending = [a for a in pending if a.id not in followers]
+        if pending:
+            try:
+                fresh = gemini_client.extract_relationships_batch(pending, portfolio_companies)
+            except Exception as e:
+                logger.error(f"Batched extraction failed, processing articles one by one: {e}")
+                fresh = {}
+            for article in pending:
+                result = fresh.get(article.id)
+                if result and result.get('event_type') != "market_news_heuristic":
+                    analysis_reuse.remember(kind, article.id, article.title, article.content, result)
+            extractions.update(fresh)
+
+        for follower_id, (leader_id, similarity) in followers.items():
+            if leader_id in extractions:
+                extractions[follower_id] = extractions[leader_id]
+                analysis_reuse.record_link(follower_id, leader_id, kind, similarity)
+
+        alerts = []
+        for article in validated:
+            alert = self.process_article(article, precomputed=extractions.get(article.id))
+            if alert:
+                alerts.append(alert)
+        # Heuristic fallbacks and LLM failures stay unseen so the next run retries them
+        url_index.mark_seen(a.url for a in validated if a.processed_at)
+        return alerts
+
+    def unfinished(self, articles: List[Article]) -> List[Article]:
+        """
+        Articles a process_articles call left for the next run: valid, but not marked seen
+        (heuristic fallbacks, LLM failures). Rejected and already-seen articles are done.
+        """
+        candidates = [a for a in articles if not a.processed_at]
+        unseen = set(url_index.filter_unseen(a.url for a in candidates))
+        return [a for a in candidates if a.url in unseen and self.event_validator(a)]
+
 
 # Create singleton instance
 pipeline = Pipeline()
@@ -0,0 +1,155 @@
+"""
+Source Quota Budget
+Tracks calls per news API and quota window (persisted across restarts) and paces daily
+quotas evenly: by a fraction f of the day a source may have used at most f of its quota
+plus a small burst, so no source goes dark before the window resets
+"""
+
+import logging
+import math
+import time
+from threading import Lock
+from typing import Dict, Optional
+
+from app.config import SOURCE_QUOTAS, QUOTA_ENFORCED, QUOTA_PACING_BURST
+from app.services.database import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+PACED_WINDOW_SECONDS = 3600  # windows at least this long are paced; shorter ones are plain counters
+
+
+class SourceQuotaBudget:
+    """Per-source call budgets over fixed (UTC-aligned) windows"""
+
+    def __init__(self, quotas: Optional[Dict[str, Dict[str, int]]] = None, burst: int = QUOTA_PACING_BURST,
+                 enforced: bool = QUOTA_ENFORCED):
+        self.quotas = quotas if quotas is not None else SOURCE_QUOTAS
+        self.burst = burst
+        self.enforced = enforced
+        self.usage: Dict[str, Dict] = {}  # source -> {"window_start", "used", "exhausted"}
+        self.lock = Lock()
+        self.stats = {"granted": 0, "deferred": 0, "exhausted_upstream": 0}
+
+    def _ensure_table(self, cursor):
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS source_quota (
+                source TEXT PRIMARY KEY,
+                window_start REAL NOT NULL,
+                used INTEGER NOT NULL,
+                exhausted INTEGER DEFAULT 0,
+                updated_at REAL NOT NULL
+            )
+        ''')
+
+    @staticmethod
+    def _window_start(now: float, window: int) -> float:
+        return now - now % window
+
+    def _state(self, source: str, now: float) -> Dict:
+        """Usage in the current window (called with self.lock held; loads the persisted row once)"""
+        window = self.quotas[source]["window"]
+        start = self._window_start(now, window)
+        state = self.usage.get(source)
+        if state is None:
+            state = {"window_start": start, "used": 0, "exhausted": False}
+            try:
+                conn = get_db_connection()
+                cursor = conn.cursor()
+                self._ensure_table(cursor)
+                cursor.execute("SELECT window_start, used, exhausted FROM source_quota WHERE source = ?", (source,))
+                row = cursor.fetchone()
+                conn.close()
+                if row and row["window_start"] == start:
+                    state = {"window_start": start, "used": row["used"], "exhausted": bool(row["exhausted"])}
+            except Exception as e:
+                logger.warning(f"Quota lookup failed for {source}: {e}")
+            self.usage[source] = state
+        if state["window_start"] != start:
+            state.update({"window_start": start, "used": 0, "exhausted": False})
+        return state
+
+    def _persist(self, source: str, state: Dict):
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            self._ensure_table(cursor)
+            cursor.execute(
+                "INSERT OR REPLACE INTO source_quota (source, window_start, used, exhausted, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (source, state["window_start"], state["used"], int(state["exhausted"]), time.time())
+            )
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Could not persist quota usage for {source}: {e}")
+
+    def _allowance(self, source: str, state: Dict, now: float) -> int:
+        """Calls the source may have made so far in this window"""
+        quota = self.quotas[source]
+        if quota["window"] < PACED_WINDOW_SECONDS:
+            return quota["limit"]
+        elapsed = (now - state["window_start"]) / quota["window"]
+        return min(quota["limit"], math.floor(quota["limit"] * elapsed) + self.burst)
+
+    def try_acquire(self, source: str) -> bool:
+        """Consume one call if the budget allows it now; False means skip this cycle"""
+        if source not in self.quotas:
+            return True
+        now = time.time()
+        with self.lock:
+            state = self._state(source, now)
+            allowed = not state["exhausted"] and state["used"] < self._allowance(source, state, now)
+            if not self.enforced or allowed:
+                state["used"] += 1
+                self.stats["granted"] += 1
+                snapshot = dict(state)
+            else:
+                self.stats["deferred"] += 1
+                snapshot = None
+        if snapshot is None:
+            logger.info(f"⏸️ {source} deferred: quota paced ({self.remaining(source)} calls left this window)")
+            return False
+        self._persist(source, snapshot)
+        return True
+
+    def mark_exhausted(self, source: str):
+        """Upstream said the quota is spent (HTTP 429): stop calling until the window resets"""
+        if source not in self.quotas:
+            return
+        with self.lock:
+            state = self._state(source, time.time())
+            state["exhausted"] = True
+            self.stats["exhausted_upstream"] += 1
+            snapshot = dict(state)
+        logger.warning(f"🚫 {source} reported its quota exhausted; paused until the window resets")
+        self._persist(source, snapshot)
+
+    def remaining(self, source: str) -> int:
+        if source not in self.quotas:
+            return -1
+        with self.lock:
+            state = self._state(source, time.time())
+            return 0 if state["exhausted"] else max(0, self.quotas[source]["limit"] - state["used"])
+
+    def get_stats(self) -> Dict:
+        now = time.time()
+        sources = {}
+        with self.lock:
+            for source, quota in self.quotas.items():
+                state = self._state(source, now)
+                sources[source] = {
+                    "limit": quota["limit"], "window_seconds": quota["window"], "used": state["used"],
+                    "remaining": 0 if state["exhausted"] else max(0, quota["limit"] - state["used"]),
+                    "available_now": max(0, self._allowance(source, state, now) - state["used"]),
+                    "exhausted": state["exhausted"],
+                    "resets_in": round(state["window_start"] + quota["window"] - now),
+                }
+            stats = dict(self.stats)
+        stats["enforced"] = self.enforced
+        stats["sources"] = sources
+        return stats
+
+
+# Singleton
+quota_budget = SourceQuotaBudget()
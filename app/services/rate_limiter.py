@@ -4,9 +4,11 @@ Prevents hitting OpenRouter/Gemini rate limits
 """
 
 import time
+import hashlib
 from threading import Lock
 from collections import deque
 from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
 
 class RateLimiter:
     """Token bucket rate limiter"""
@@ -70,6 +72,105 @@ class RateLimiter:
             return len(self.requests) < self.max_requests
 
 
+class TokenBucket:
+    """Lock-protected token bucket: steady refill rate with a bounded burst"""
+
+    def __init__(self, rate_per_minute: float, burst: int = 1):
+        """
+        Initialize token bucket
+
+        Args:
+            rate_per_minute: Sustained requests allowed per minute
+            burst: Maximum tokens that can accumulate while idle
+        """
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.last_refill = time.monotonic()
+        self.lock = Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self.last_refill
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate_per_second)
+            self.last_refill = now
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available, without blocking"""
+        with self.lock:
+            self._refill(time.monotonic())
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    def time_until_available(self) -> float:
+        """Seconds until the next token can be taken (0 if available now)"""
+        with self.lock:
+            self._refill(time.monotonic())
+            if self.tokens >= 1:
+                return 0.0
+            return (1 - self.tokens) / self.rate_per_second
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until a token is available
+
+        Returns False if timeout elapsed before a token could be taken.
+        The lock is never held while sleeping, so waiters on other
+        buckets (other API keys) are not serialized behind this one.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self.try_acquire():
+                return True
+            wait = self.time_until_available()
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(max(wait, 0.01))
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            self._refill(time.monotonic())
+            return {
+                "tokens_available": round(self.tokens, 2),
+                "capacity": self.capacity,
+                "rate_per_minute": round(self.rate_per_second * 60, 2)
+            }
+
+
+def key_fingerprint(api_key: Optional[str]) -> str:
+    """Stable short id for an API key (never keep raw keys in dict keys / stats output)"""
+    return hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:12]
+
+
+class ProviderRateLimiters:
+    """Process-wide registry: exactly one token bucket per (provider, API key)"""
+
+    def __init__(self):
+        self.buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self.lock = Lock()
+
+    def get(self, provider: str, api_key: Optional[str], rate_per_minute: float, burst: int = 1) -> TokenBucket:
+        """Return the shared bucket for this provider key, creating it on first use"""
+        key = (provider, key_fingerprint(api_key))
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(rate_per_minute, burst)
+                self.buckets[key] = bucket
+            return bucket
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            items = list(self.buckets.items())
+        return {f"{provider}:{key_id}": bucket.get_stats() for (provider, key_id), bucket in items}
+
+
 # Global rate limiter instances
+provider_limiters = ProviderRateLimiters()
 openrouter_limiter = RateLimiter(max_requests=8, time_window=60)  # 8 req/min (safe buffer)
 gemini_limiter = RateLimiter(max_requests=12, time_window=60)      # 12 req/min (safe buffer)
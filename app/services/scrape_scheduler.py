@@ -0,0 +1,225 @@
+"""
+Scrape Scheduler
+Full-text scraping with per-domain politeness: robots.txt is fetched once per domain and
+cached, each domain gets at most one request per interval (or its Crawl-delay), different
+domains are scraped concurrently, and extracted text is cached by canonical URL
+"""
+
+import logging
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+from app.config import (
+    SCRAPE_DOMAIN_INTERVAL_SECONDS, SCRAPE_MAX_WORKERS, SCRAPE_TIMEOUT_SECONDS,
+    SCRAPE_ROBOTS_TTL_SECONDS, SCRAPE_FAILURE_RETRY_SECONDS
+)
+from app.services.database import get_db_connection
+from app.services.http_client import http_client
+from app.services.parse_pool import parse_pool
+from app.services.url_index import canonicalize_url, url_hash
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'MarketPulse Intelligence Bot (support@marketpulse.ai) Web-Intelligence-System/1.1'
+}
+
+
+def extract_text(html: bytes) -> str:
+    """Body text of an article page (see parse_pool.article_text); large pages may parse in a worker process"""
+    return parse_pool.article_text(html)
+
+
+class ScrapeScheduler:
+    """Polite, cached, domain-parallel article scraper"""
+
+    def __init__(self, interval: float = SCRAPE_DOMAIN_INTERVAL_SECONDS, max_workers: int = SCRAPE_MAX_WORKERS,
+                 timeout: float = SCRAPE_TIMEOUT_SECONDS, robots_ttl: int = SCRAPE_ROBOTS_TTL_SECONDS,
+                 failure_retry: int = SCRAPE_FAILURE_RETRY_SECONDS):
+        self.interval = interval
+        self.timeout = timeout
+        self.robots_ttl = robots_ttl
+        self.failure_retry = failure_retry
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scrape")
+        self.robots: Dict[str, Tuple[RobotFileParser, float]] = {}  # domain -> (parser, fetched_at)
+        self.domain_locks: Dict[str, Lock] = defaultdict(Lock)  # held while a domain waits/fetches
+        self.next_allowed: Dict[str, float] = {}
+        self.lock = Lock()
+        self.stats = {"cache_hits": 0, "scraped": 0, "failed": 0, "disallowed": 0, "robots_fetched": 0}
+
+    def _ensure_table(self, cursor):
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS scraped_texts (
+                url_hash TEXT PRIMARY KEY,
+                url TEXT,
+                text TEXT NOT NULL,
+                scraped_at REAL NOT NULL
+            )
+        ''')
+
+    def _get(self, url: str, headers: Dict[str, str]) -> requests.Response:
+        # One attempt only: a retry would bypass the per-domain pacing
+        return http_client.get(url, headers=headers, timeout=self.timeout, retries=0)
+
+    def _bump(self, key: str):
+        with self.lock:
+            self.stats[key] += 1
+
+    # ------------------------------------------------------------------
+    # Text cache
+    # ------------------------------------------------------------------
+
+    def _cached(self, urls: List[str]) -> Dict[str, str]:
+        """Cached text per URL (failures only until their retry time)"""
+        hashes = {url: url_hash(canonicalize_url(url)) for url in urls}
+        rows = {}
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            self._ensure_table(cursor)
+            keys = list(set(hashes.values()))
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                cursor.execute(
+                    f"SELECT url_hash, text, scraped_at FROM scraped_texts WHERE url_hash IN ({','.join('?' * len(chunk))})",
+                    chunk
+                )
+                rows.update({row["url_hash"]: row for row in cursor.fetchall()})
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Scrape cache lookup failed: {e}")
+
+        now = time.time()
+        found = {}
+        for url, digest in hashes.items():
+            row = rows.get(digest)
+            if row and (row["text"] or now - row["scraped_at"] < self.failure_retry):
+                found[url] = row["text"]
+        return found
+
+    def _store(self, results: Dict[str, str]):
+        if not results:
+            return
+        now = time.time()
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            self._ensure_table(cursor)
+            cursor.executemany(
+                "INSERT OR REPLACE INTO scraped_texts (url_hash, url, text, scraped_at) VALUES (?, ?, ?, ?)",
+                [(url_hash(canonicalize_url(url)), canonicalize_url(url), text, now) for url, text in results.items()]
+            )
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Could not cache scraped text: {e}")
+
+    # ------------------------------------------------------------------
+    # Politeness
+    # ------------------------------------------------------------------
+
+    def _robots_for(self, scheme: str, domain: str, headers: Dict[str, str]) -> RobotFileParser:
+        """robots.txt for the domain, fetched at most once per TTL (called with the domain lock held)"""
+        cached = self.robots.get(domain)
+        if cached and time.time() - cached[1] < self.robots_ttl:
+            return cached[0]
+
+        parser = RobotFileParser()
+        try:
+            resp = self._get(f"{scheme}://{domain}/robots.txt", headers)
+            if resp.status_code in (401, 403):
+                parser.disallow_all = True
+            elif resp.status_code >= 400:
+                parser.allow_all = True
+            else:
+                parser.parse(resp.text.splitlines())
+        except Exception as e:
+            # Unreachable robots.txt: allow, but try again next run
+            logger.debug(f"robots.txt unavailable for {domain}: {e}")
+            parser.allow_all = True
+            self.robots[domain] = (parser, time.time() - self.robots_ttl)
+            return parser
+        self.robots[domain] = (parser, time.time())
+        self._bump("robots_fetched")
+        return parser
+
+    def _scrape_domain(self, scheme: str, domain: str, urls: List[str], headers: Dict[str, str]) -> Dict[str, str]:
+        """Scrape one domain's URLs in order, spaced by the domain interval"""
+        results = {}
+        agent = headers.get("User-Agent", "*")
+        with self.domain_locks[domain]:
+            robots = self._robots_for(scheme, domain, headers)
+            delay = max(self.interval, float(robots.crawl_delay(agent) or 0))
+            for url in urls:
+                if not robots.can_fetch(agent, url):
+                    self._bump("disallowed")
+                    results[url] = ""
+                    continue
+                wait_for = self.next_allowed.get(domain, 0) - time.time()
+                if wait_for > 0:
+                    time.sleep(wait_for)
+                try:
+                    resp = self._get(url, headers)
+                    results[url] = extract_text(resp.content) if resp.status_code == 200 else ""
+                except Exception as e:
+                    logger.debug(f"Scrape failed for {url}: {e}")
+                    results[url] = ""
+                finally:
+                    self.next_allowed[domain] = time.time() + delay
+                self._bump("scraped" if results[url] else "failed")
+        return results
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def scrape_many(self, urls: Iterable[str], headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        Body text for each URL ("" when disallowed or unavailable)
+
+        Cached URLs are answered without a request; the rest are grouped by domain,
+        domains run concurrently and each domain is paced by its own interval.
+        """
+        urls = list(dict.fromkeys(u for u in urls if u))
+        headers = headers or DEFAULT_HEADERS
+        results = self._cached(urls)
+        with self.lock:
+            self.stats["cache_hits"] += len(results)
+
+        by_domain: Dict[Tuple[str, str], List[str]] = defaultdict(list)
+        for url in urls:
+            if url not in results:
+                parts = urlsplit(url)
+                by_domain[(parts.scheme or "https", parts.netloc.lower())].append(url)
+        if not by_domain:
+            return results
+
+        futures = [self.pool.submit(self._scrape_domain, scheme, domain, domain_urls, headers)
+                   for (scheme, domain), domain_urls in by_domain.items()]
+        fresh = {}
+        for future in futures:
+            fresh.update(future.result())
+        self._store(fresh)
+        results.update(fresh)
+        logger.info(f"📰 Scraped {len(fresh)} article(s) across {len(by_domain)} domain(s)")
+        return results
+
+    def scrape(self, url: str, headers: Optional[Dict[str, str]] = None) -> str:
+        return self.scrape_many([url], headers).get(url, "")
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            stats = dict(self.stats)
+        stats["domains"] = len(self.robots)
+        return stats
+
+
+# Singleton
+scrape_scheduler = ScrapeScheduler()
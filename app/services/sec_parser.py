@@ -1,16 +1,16 @@
-import requests
 import logging
 import json
 import re
 from typing import List, Dict, Optional
-from bs4 import BeautifulSoup
-from app.services.gemini_client import GeminiClient
+from app.services.gemini_client import GeminiClient, get_gemini_client
+from app.services.http_client import http_client
+from app.services.parse_pool import parse_pool
 
 logger = logging.getLogger(__name__)
 
 class SECParser:
     def __init__(self, gemini_client: Optional[GeminiClient] = None):
-        self.gemini_client = gemini_client or GeminiClient()
+        self.gemini_client = gemini_client or get_gemini_client()
         self.ticker_to_cik = {}
         self._load_ticker_map()
 
@@ -19,7 +19,7 @@ class SECParser:
         try:
             url = "https://www.sec.gov/files/company_tickers.json"
             headers = {"User-Agent": "MarketPulse Support (support@marketpulse.ai)"}
-            response = requests.get(url, headers=headers, timeout=10)
+            response = http_client.get(url, headers=headers, timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 for key, val in data.items():
@@ -42,7 +42,7 @@ class SECParser:
             # 1. Get List of Submissions
             url = f"https://data.sec.gov/submissions/CIK{cik}.json"
             headers = {"User-Agent": "MarketPulse Support (support@marketpulse.ai)"}
-            response = requests.get(url, headers=headers, timeout=10)
+            response = http_client.get(url, headers=headers, timeout=10)
             if response.status_code != 200:
                 return None
             
@@ -65,12 +65,12 @@ class SECParser:
             
             # 2. Fetch the actual document (HTML)
             doc_url = f"https://www.sec.gov/Archives/edgar/data/{int(cik)}/{acc_num}/{primary_doc}"
-            doc_resp = requests.get(doc_url, headers=headers, timeout=15)
+            doc_resp = http_client.get(doc_url, headers=headers, timeout=15)
             if doc_resp.status_code != 200:
                 return None
             
-            soup = BeautifulSoup(doc_resp.content, 'html.parser')
-            text = soup.get_text(separator=' ', strip=True)
+            # Multi-MB filings: parsed in the worker pool when one is configured
+            text = parse_pool.document_text(doc_resp.content)
             
             # Extract relevant sections (Business, Risk Factors)
             # Use regex to find "Item 1. Business" and "Item 1A. Risk Factors"
@@ -117,7 +117,7 @@ class SECParser:
         try:
             # We assume gemini_client has a method to get structured JSON
             # For Phase 3 implementation, we parse the response
-            response_text = self.gemini_client.generate_content(prompt).text
+            response_text = self.gemini_client.generate_content(prompt, caller="sec_parser").text
             # Clean JSON if LLM adds backticks
             response_text = re.sub(r'^```json\s*|\s*```$', '', response_text.strip(), flags=re.MULTILINE)
             rels = json.loads(response_text)
@@ -0,0 +1,94 @@
+"""
+Single-Flight Request Coalescing
+Concurrent callers with the same key share one in-flight call and all receive its result
+"""
+
+import asyncio
+import logging
+from concurrent.futures import Future
+from threading import Lock
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Deduplicates concurrent identical work across threads and event loops"""
+
+    def __init__(self, name: str = "singleflight"):
+        self.name = name
+        self.calls: Dict[str, Future] = {}
+        self.lock = Lock()
+        self.stats = {"leaders": 0, "coalesced": 0, "errors": 0}
+
+    def _join(self, key: str) -> Tuple[Future, bool]:
+        """Return (future, is_leader) for key"""
+        with self.lock:
+            future = self.calls.get(key)
+            if future is not None:
+                self.stats["coalesced"] += 1
+                return future, False
+            future = Future()
+            self.calls[key] = future
+            self.stats["leaders"] += 1
+            return future, True
+
+    def _finish(self, key: str):
+        with self.lock:
+            self.calls.pop(key, None)
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run fn once per key among concurrent callers
+
+        Returns:
+            (result, shared) - shared is True for callers that piggybacked on
+            another caller's in-flight request
+        """
+        future, is_leader = self._join(key)
+        if not is_leader:
+            return future.result(), True
+
+        try:
+            result = fn()
+        except BaseException as e:
+            with self.lock:
+                self.stats["errors"] += 1
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            self._finish(key)
+        return result, False
+
+    async def ado(self, key: str, coro_fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Async variant of do(); followers may be on other threads or loops"""
+        future, is_leader = self._join(key)
+        if not is_leader:
+            return await asyncio.wrap_future(future), True
+
+        try:
+            result = await coro_fn()
+        except BaseException as e:
+            with self.lock:
+                self.stats["errors"] += 1
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            self._finish(key)
+        return result, False
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            stats = dict(self.stats)
+            stats["in_flight"] = len(self.calls)
+        total = stats["leaders"] + stats["coalesced"]
+        stats["coalesce_rate"] = round(stats["coalesced"] / total, 4) if total else 0.0
+        return stats
+
+
+# Singleton for identical LLM prompts (keyed like the response cache)
+llm_singleflight = SingleFlight("llm")
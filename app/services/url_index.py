@@ -0,0 +1,235 @@
+"""
+Seen-URL Index
+Canonicalized URLs of articles already sent through the LLM pipeline, kept across runs:
+a Bloom filter answers "never seen" without touching disk, SQLite confirms hits and
+expires entries after a TTL
+"""
+
+import base64
+import hashlib
+import logging
+import math
+import re
+import time
+from threading import Lock
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from app.config import URL_INDEX_TTL_SECONDS, URL_INDEX_BLOOM_CAPACITY, URL_INDEX_BLOOM_FP_RATE
+from app.services.database import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid", "ocid", "cmpid", "taid",
+    "guccounter", "guce_referrer", "guce_referrer_sig", "yptr", "ncid", "sr_share", "ref", "ref_src",
+    "smid", "soc_src", "soc_trk", "oc", ".tsrc"
+}
+_EMBEDDED_URL_RE = re.compile(rb"https?://[\x21-\x7e]+")
+
+
+def _google_news_target(parts) -> Optional[str]:
+    """Publisher URL behind a Google redirect/article link, when it can be recovered"""
+    host = parts.netloc.lower()
+    if host.endswith("google.com") and parts.path == "/url":
+        params = dict(parse_qsl(parts.query))
+        return params.get("url") or params.get("q")
+    if host == "news.google.com":
+        # Older article IDs are base64 protobuf with the publisher URL inside
+        article_id = parts.path.rstrip("/").rsplit("/", 1)[-1]
+        try:
+            decoded = base64.urlsafe_b64decode(article_id + "=" * (-len(article_id) % 4))
+        except (ValueError, TypeError):
+            return None
+        match = _EMBEDDED_URL_RE.search(decoded)
+        if match:
+            return match.group(0).decode("ascii")
+    return None
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Stable form of an article URL for dedup
+
+    Lowercases scheme/host, drops "www.", fragments, tracking params (utm_* and friends)
+    and trailing slashes, sorts the query, and unwraps Google News / google.com/url links.
+    """
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    target = _google_news_target(parts)
+    if target and target != url:
+        return canonicalize_url(target)
+
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if host == "news.google.com":
+        # Undecodable Google News IDs: same story under rss/ or articles/, any hl/gl/ceid
+        return "https://news.google.com/articles/" + parts.path.rstrip("/").rsplit("/", 1)[-1]
+
+    params = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("https", host, path, urlencode(params), ""))
+
+
+def url_hash(canonical: str) -> str:
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over hex digests (double hashing)"""
+
+    def __init__(self, capacity: int, fp_rate: float):
+        self.size = max(64, int(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, digest: str):
+        h1, h2 = int(digest[:16], 16), int(digest[16:], 16) | 1
+        return ((h1 + i * h2) % self.size for i in range(self.num_hashes))
+
+    def add(self, digest: str):
+        for pos in self._positions(digest):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, digest: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(digest))
+
+
+class SeenUrlIndex:
+    """Persistent set of processed article URLs with TTL expiry"""
+
+    def __init__(self, ttl_seconds: int = URL_INDEX_TTL_SECONDS, capacity: int = URL_INDEX_BLOOM_CAPACITY,
+                 fp_rate: float = URL_INDEX_BLOOM_FP_RATE):
+        self.ttl_seconds = ttl_seconds
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.bloom: Optional[BloomFilter] = None
+        self.rebuilt_at = 0.0
+        self.lock = Lock()
+        self.stats = {"lookups": 0, "bloom_negatives": 0, "db_confirmed": 0, "false_positives": 0, "marked": 0}
+
+    def _ensure_table(self, cursor):
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS seen_urls (
+                url_hash TEXT PRIMARY KEY,
+                url TEXT,
+                first_seen REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_seen_urls_expires ON seen_urls(expires_at)")
+
+    def _rebuild(self, now: float):
+        """Drop expired rows and rebuild the Bloom filter (called with self.lock held)"""
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        self._ensure_table(cursor)
+        cursor.execute("DELETE FROM seen_urls WHERE expires_at <= ?", (now,))
+        conn.commit()
+        cursor.execute("SELECT url_hash FROM seen_urls")
+        rows = cursor.fetchall()
+        conn.close()
+
+        self.bloom = BloomFilter(max(self.capacity, 2 * len(rows)), self.fp_rate)
+        for row in rows:
+            self.bloom.add(row["url_hash"])
+        self.rebuilt_at = now
+        logger.info(f"🔖 Seen-URL index loaded ({len(rows)} URLs)")
+
+    def _ready(self, now: float):
+        # Bloom filters cannot forget: rebuild once a TTL fraction has passed so expired URLs
+        # stop short-circuiting to the DB, or once the filter fills past its capacity
+        if (self.bloom is None or now - self.rebuilt_at > self.ttl_seconds / 4
+                or self.bloom.count > self.bloom.size / 10):
+            self._rebuild(now)
+
+    def filter_unseen(self, urls: Iterable[str]) -> List[str]:
+        """The URLs (as given) whose canonical form has not been processed within the TTL"""
+        urls = list(urls)
+        now = time.time()
+        with self.lock:
+            self._ready(now)
+            hashes = {url: url_hash(canonicalize_url(url)) for url in urls}
+            maybe = [h for h in set(hashes.values()) if h in self.bloom]
+            self.stats["lookups"] += len(urls)
+            self.stats["bloom_negatives"] += len(set(hashes.values())) - len(maybe)
+
+        seen = set()
+        if maybe:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            self._ensure_table(cursor)
+            for start in range(0, len(maybe), 500):
+                chunk = maybe[start:start + 500]
+                cursor.execute(
+                    f"SELECT url_hash FROM seen_urls WHERE expires_at > ? AND url_hash IN ({','.join('?' * len(chunk))})",
+                    [now] + chunk
+                )
+                seen.update(row["url_hash"] for row in cursor.fetchall())
+            conn.close()
+            with self.lock:
+                self.stats["db_confirmed"] += len(seen)
+                self.stats["false_positives"] += len(maybe) - len(seen)
+
+        # Repeats within the same batch count once
+        unseen, batch = [], set()
+        for url in urls:
+            digest = hashes[url]
+            if digest not in seen and digest not in batch:
+                batch.add(digest)
+                unseen.append(url)
+        return unseen
+
+    def is_seen(self, url: str) -> bool:
+        return not self.filter_unseen([url])
+
+    def mark_seen(self, urls: Iterable[str]):
+        """Record URLs as processed for the next TTL window"""
+        now = time.time()
+        rows = {}
+        for url in urls:
+            canonical = canonicalize_url(url)
+            if canonical:
+                rows[url_hash(canonical)] = canonical
+        if not rows:
+            return
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            self._ensure_table(cursor)
+            cursor.executemany(
+                "INSERT INTO seen_urls (url_hash, url, first_seen, expires_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(url_hash) DO UPDATE SET expires_at = excluded.expires_at",
+                [(digest, canonical, now, now + self.ttl_seconds) for digest, canonical in rows.items()]
+            )
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Could not record seen URLs: {e}")
+            return
+        with self.lock:
+            self._ready(now)
+            for digest in rows:
+                self.bloom.add(digest)
+            self.stats["marked"] += len(rows)
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            stats = dict(self.stats)
+            if self.bloom is not None:
+                stats["bloom_bits"] = self.bloom.size
+                stats["bloom_hashes"] = self.bloom.num_hashes
+                stats["bloom_entries"] = self.bloom.count
+        stats["ttl_seconds"] = self.ttl_seconds
+        return stats
+
+
+# Singleton
+url_index = SeenUrlIndex()
@@ -1,69 +1,263 @@
 """
 Gemini API Usage Tracker
 Monitors and logs API calls to ensure efficient credit usage
+Append-only SQLite ledger fed through an in-memory queue by a background writer
 """
 import json
-import os
-from datetime import datetime
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Dict, Optional
 
+from app.config import LLM_CREDIT_BUDGET_USD, USAGE_FLUSH_INTERVAL_SECONDS
+from app.services.database import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+# Legacy JSON log, imported once into the ledger
 USAGE_LOG_PATH = Path(__file__).parent.parent / "data" / "gemini_usage.json"
 
+# Gemini 2.5 Flash pricing: $0.000075 per 1K chars (input), $0.0003 per 1K chars (output)
+INPUT_COST_PER_1K_CHARS = 0.000075
+OUTPUT_COST_PER_1K_CHARS = 0.0003
+
+
+def _empty_day() -> Dict:
+    return {"count": 0, "input_chars": 0, "output_chars": 0, "estimated_cost": 0.0}
+
+
 class UsageTracker:
-    def __init__(self):
-        self.usage_data = self._load_usage()
-    
-    def _load_usage(self):
-        """Load usage data from file"""
-        if USAGE_LOG_PATH.exists():
-            try:
-                with open(USAGE_LOG_PATH, 'r') as f:
-                    return json.load(f)
-            except:
-                pass
-        return {"daily_requests": {}, "total_requests": 0}
-    
-    def _save_usage(self):
-        """Save usage data to file"""
-        USAGE_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-        with open(USAGE_LOG_PATH, 'w') as f:
-            json.dump(self.usage_data, f, indent=2)
-    
-    def log_request(self, model: str, input_chars: int, output_chars: int):
-        """Log a Gemini API request"""
+    def __init__(self, budget_usd: float = LLM_CREDIT_BUDGET_USD,
+                 flush_interval: float = USAGE_FLUSH_INTERVAL_SECONDS):
+        self.budget_usd = budget_usd
+        self.flush_interval = flush_interval
+        self.queue: "queue.Queue" = queue.Queue()
+        self.lock = threading.Lock()
+        self.writer: Optional[threading.Thread] = None
+        self.loaded = False
+        self.daily: Dict[str, Dict] = {}  # Running aggregates, only today's is kept in memory
+        self.total_cost = 0.0
+        self.total_requests = 0
+
+    def _ensure_tables(self, cursor):
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS llm_usage_ledger (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at DATETIME NOT NULL,
+                day TEXT NOT NULL,
+                model TEXT,
+                caller TEXT,
+                latency_ms REAL,
+                input_chars INTEGER,
+                output_chars INTEGER,
+                prompt_tokens INTEGER,
+                completion_tokens INTEGER,
+                cost REAL
+            )
+        ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_usage_ledger_day ON llm_usage_ledger(day)")
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS llm_usage_daily (
+                day TEXT NOT NULL,
+                model TEXT NOT NULL,
+                caller TEXT NOT NULL,
+                count INTEGER DEFAULT 0,
+                input_chars INTEGER DEFAULT 0,
+                output_chars INTEGER DEFAULT 0,
+                prompt_tokens INTEGER DEFAULT 0,
+                completion_tokens INTEGER DEFAULT 0,
+                latency_ms_total REAL DEFAULT 0,
+                latency_ms_max REAL DEFAULT 0,
+                cost REAL DEFAULT 0,
+                PRIMARY KEY (day, model, caller)
+            )
+        ''')
+
+    def _migrate_legacy(self, cursor):
+        """Import daily totals from the old gemini_usage.json into an empty ledger"""
+        cursor.execute("SELECT COUNT(*) FROM llm_usage_daily")
+        if cursor.fetchone()[0] or not USAGE_LOG_PATH.exists():
+            return
+        try:
+            with open(USAGE_LOG_PATH, 'r') as f:
+                legacy = json.load(f)
+        except Exception:
+            return
+        for day, stats in legacy.get("daily_requests", {}).items():
+            cursor.execute(
+                "INSERT OR IGNORE INTO llm_usage_daily (day, model, caller, count, input_chars, output_chars, cost) "
+                "VALUES (?, 'legacy', 'legacy', ?, ?, ?, ?)",
+                (day, stats.get("count", 0), stats.get("input_chars", 0),
+                 stats.get("output_chars", 0), stats.get("estimated_cost", 0.0))
+            )
+        logger.info(f"📊 Imported {len(legacy.get('daily_requests', {}))} days of legacy usage into the ledger")
+
+    def _load(self):
+        """Create tables and seed running totals (called with self.lock held)"""
+        if self.loaded:
+            return
         today = datetime.now().strftime("%Y-%m-%d")
-        
-        if today not in self.usage_data["daily_requests"]:
-            self.usage_data["daily_requests"][today] = {
-                "count": 0,
-                "input_chars": 0,
-                "output_chars": 0,
-                "estimated_cost": 0.0
-            }
-        
-        # Gemini 2.5 Flash pricing: $0.000075 per 1K chars (input), $0.0003 per 1K chars (output)
-        input_cost = (input_chars / 1000) * 0.000075
-        output_cost = (output_chars / 1000) * 0.0003
-        total_cost = input_cost + output_cost
-        
-        self.usage_data["daily_requests"][today]["count"] += 1
-        self.usage_data["daily_requests"][today]["input_chars"] += input_chars
-        self.usage_data["daily_requests"][today]["output_chars"] += output_chars
-        self.usage_data["daily_requests"][today]["estimated_cost"] += total_cost
-        self.usage_data["total_requests"] += 1
-        
-        self._save_usage()
-        
-        print(f"📊 Gemini Usage: {self.usage_data['daily_requests'][today]['count']} requests today | "
-              f"${self.usage_data['daily_requests'][today]['estimated_cost']:.4f} cost | "
-              f"${10.00 - sum(day['estimated_cost'] for day in self.usage_data['daily_requests'].values()):.2f} credits remaining")
-    
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            self._ensure_tables(cursor)
+            self._migrate_legacy(cursor)
+            conn.commit()
+            cursor.execute("SELECT COALESCE(SUM(count), 0), COALESCE(SUM(cost), 0) FROM llm_usage_daily")
+            self.total_requests, self.total_cost = cursor.fetchone()
+            cursor.execute(
+                "SELECT COALESCE(SUM(count), 0), COALESCE(SUM(input_chars), 0), COALESCE(SUM(output_chars), 0), "
+                "COALESCE(SUM(cost), 0) FROM llm_usage_daily WHERE day = ?", (today,)
+            )
+            count, input_chars, output_chars, cost = cursor.fetchone()
+            conn.close()
+            self.daily = {today: {"count": count, "input_chars": input_chars,
+                                  "output_chars": output_chars, "estimated_cost": cost}}
+        except Exception as e:
+            logger.warning(f"Could not load usage ledger: {e}")
+        self.loaded = True
+
+    def _ensure_writer(self):
+        # Called with self.lock held
+        if self.writer is None or not self.writer.is_alive():
+            self.writer = threading.Thread(target=self._writer_loop, name="usage-ledger", daemon=True)
+            self.writer.start()
+
+    def log_request(self, model: str, input_chars: int, output_chars: int, caller: Optional[str] = None,
+                    latency_ms: Optional[float] = None, prompt_tokens: Optional[int] = None,
+                    completion_tokens: Optional[int] = None):
+        """Log an LLM API request (non-blocking: the row is written by the background writer)"""
+        now = datetime.now()
+        today = now.strftime("%Y-%m-%d")
+        cost = (input_chars / 1000) * INPUT_COST_PER_1K_CHARS + (output_chars / 1000) * OUTPUT_COST_PER_1K_CHARS
+
+        with self.lock:
+            self._load()
+            if today not in self.daily:
+                # New day: drop yesterday's running aggregate
+                self.daily = {today: _empty_day()}
+            day = self.daily[today]
+            day["count"] += 1
+            day["input_chars"] += input_chars
+            day["output_chars"] += output_chars
+            day["estimated_cost"] += cost
+            self.total_requests += 1
+            self.total_cost += cost
+            count, day_cost, remaining = day["count"], day["estimated_cost"], self.budget_usd - self.total_cost
+            self._ensure_writer()
+
+        self.queue.put({
+            "created_at": now, "day": today, "model": model or "unknown", "caller": caller or "unspecified",
+            "latency_ms": latency_ms, "input_chars": input_chars, "output_chars": output_chars,
+            "prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "cost": cost
+        })
+        logger.info(f"📊 LLM Usage: {count} requests today | ${day_cost:.4f} cost | ${remaining:.2f} credits remaining")
+
+    def _writer_loop(self):
+        while True:
+            batch, flushes = [], []
+            item = self.queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if isinstance(item, threading.Event):  # flush() marker
+                    flushes.append(item)
+                    break
+                batch.append(item)
+                if len(batch) >= 200:
+                    break
+                try:
+                    item = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._write(batch)
+            for event in flushes:
+                event.set()
+
+    def _write(self, batch):
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            self._ensure_tables(cursor)
+            cursor.executemany(
+                "INSERT INTO llm_usage_ledger (created_at, day, model, caller, latency_ms, input_chars, output_chars, "
+                "prompt_tokens, completion_tokens, cost) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(r["created_at"], r["day"], r["model"], r["caller"], r["latency_ms"], r["input_chars"],
+                  r["output_chars"], r["prompt_tokens"], r["completion_tokens"], r["cost"]) for r in batch]
+            )
+            cursor.executemany('''
+                INSERT INTO llm_usage_daily (day, model, caller, count, input_chars, output_chars, prompt_tokens,
+                                             completion_tokens, latency_ms_total, latency_ms_max, cost)
+                VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(day, model, caller) DO UPDATE SET
+                    count = count + 1,
+                    input_chars = input_chars + excluded.input_chars,
+                    output_chars = output_chars + excluded.output_chars,
+                    prompt_tokens = prompt_tokens + excluded.prompt_tokens,
+                    completion_tokens = completion_tokens + excluded.completion_tokens,
+                    latency_ms_total = latency_ms_total + excluded.latency_ms_total,
+                    latency_ms_max = MAX(latency_ms_max, excluded.latency_ms_max),
+                    cost = cost + excluded.cost
+            ''', [(r["day"], r["model"], r["caller"], r["input_chars"], r["output_chars"], r["prompt_tokens"] or 0,
+                   r["completion_tokens"] or 0, r["latency_ms"] or 0, r["latency_ms"] or 0, r["cost"]) for r in batch])
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.error(f"Usage ledger write failed ({len(batch)} rows dropped): {e}")
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything logged so far is on disk"""
+        with self.lock:
+            if self.writer is None:
+                return True
+            self._ensure_writer()
+        done = threading.Event()
+        self.queue.put(done)
+        return done.wait(timeout)
+
     def get_daily_stats(self):
         """Get today's usage stats"""
         today = datetime.now().strftime("%Y-%m-%d")
-        return self.usage_data["daily_requests"].get(today, {
-            "count": 0, "input_chars": 0, "output_chars": 0, "estimated_cost": 0.0
-        })
+        with self.lock:
+            self._load()
+            return dict(self.daily.get(today, _empty_day()))
+
+    def get_summary(self, days: int = 7) -> Dict:
+        """Ledger aggregates for the API: per day, per model and per caller"""
+        self.flush()
+        since = (datetime.now() - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+        with self.lock:
+            self._load()
+            totals = {"requests": self.total_requests, "estimated_cost": round(self.total_cost, 6),
+                      "credits_remaining": round(self.budget_usd - self.total_cost, 4)}
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        self._ensure_tables(cursor)
+
+        def grouped(column: str):
+            cursor.execute(f'''
+                SELECT {column} AS name, SUM(count) AS requests, SUM(input_chars) AS input_chars,
+                       SUM(output_chars) AS output_chars, SUM(prompt_tokens) AS prompt_tokens,
+                       SUM(completion_tokens) AS completion_tokens, SUM(cost) AS estimated_cost,
+                       SUM(latency_ms_total) / SUM(count) AS avg_latency_ms, MAX(latency_ms_max) AS max_latency_ms
+                FROM llm_usage_daily WHERE day >= ? GROUP BY {column} ORDER BY {column}
+            ''', (since,))
+            return [dict(row) for row in cursor.fetchall()]
+
+        summary = {
+            "totals": totals,
+            "since": since,
+            "daily": grouped("day"),
+            "by_model": grouped("model"),
+            "by_caller": grouped("caller")
+        }
+        conn.close()
+        return summary
 
 # Singleton
 usage_tracker = UsageTracker()
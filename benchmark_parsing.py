@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Feed/HTML parsing benchmark: inline on the ingest threads vs the process parse pool
+Runs on recorded HTTP fixtures (feeds, article pages, filings); reports wall time and the
+worst stall seen by a 5 ms heartbeat thread, i.e. how long request threads wait on the GIL
+
+Usage: python benchmark_parsing.py [--workers 2 4] [--threads 8] [--repeat 3] [--fixture-dir DIR]
+"""
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import HTTP_FIXTURE_DIR
+from app.services.http_replay import FixtureStore
+from app.services.parse_pool import ParsePool
+
+
+def load_documents(directory):
+    """(kind, content) for every recorded 200 response that is a feed or an HTML page"""
+    store = FixtureStore(directory)
+    documents = []
+    names = sorted(os.listdir(directory)) if os.path.isdir(directory) else []
+    for name in names:
+        if not name.endswith(".json"):
+            continue
+        exchange = store.load(name[:-len(".json")])
+        if not exchange or exchange["response"]["status"] != 200:
+            continue
+        content = exchange["response"]["content"]
+        content_type = exchange["response"]["headers"].get("content-type", "")
+        head = content[:512].lstrip().lower()
+        if "xml" in content_type or "rss" in content_type or head.startswith(b"<?xml") or b"<rss" in head:
+            documents.append(("feed", content))
+        elif "html" in content_type or b"<html" in head or b"<!doctype html" in head:
+            kind = "filing" if "sec.gov/Archives" in json.dumps(exchange["request"]) else "page"
+            documents.append((kind, content))
+    return documents
+
+
+def synthetic_documents(rng):
+    """Stand-in corpus when no fixtures were recorded: 40 feeds, 40 article pages, one large filing"""
+    words = "chip supply fab demand revenue guidance export tariff memory gpu wafer capacity".split()
+    sentence = lambda: " ".join(rng.choice(words) for _ in range(rng.randint(8, 20))).capitalize() + "."
+    items = "".join(f"<item><title>{sentence()}</title><link>https://ex.com/{i}</link>"
+                    f"<description>{sentence() * 3}</description></item>" for i in range(60))
+    feed = f'<?xml version="1.0"?><rss version="2.0"><channel><title>T</title>{items}</channel></rss>'.encode()
+    page = ("<html><body>" + "".join(f"<div><p>{sentence() * 2}</p></div>" for _ in range(300))
+            + "</body></html>").encode()
+    filing = ("<html><body>" + "".join(f"<table><tr><td>{sentence()}</td></tr></table><p>{sentence()}</p>"
+                                       for _ in range(15000)) + "</body></html>").encode()
+    return [("feed", feed)] * 40 + [("page", page)] * 40 + [("filing", filing)]
+
+
+def run(pool, documents, threads):
+    """Parse every document from `threads` ingest-style threads; returns (seconds, worst heartbeat gap)"""
+    parsers = {"feed": pool.feed_entries, "page": pool.article_text, "filing": pool.document_text}
+    worst = [0.0]
+    done = threading.Event()
+
+    def heartbeat():
+        last = time.perf_counter()
+        while not done.wait(0.005):
+            now = time.perf_counter()
+            worst[0] = max(worst[0], now - last - 0.005)
+            last = now
+
+    ticker = threading.Thread(target=heartbeat)
+    ticker.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda doc: parsers[doc[0]](doc[1]), documents))
+    elapsed = time.perf_counter() - started
+    done.set()
+    ticker.join()
+    return elapsed, worst[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4])
+    parser.add_argument("--threads", type=int, default=8, help="concurrent ingest threads")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--fixture-dir", default=HTTP_FIXTURE_DIR)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    documents = load_documents(args.fixture_dir)
+    if documents:
+        print(f"Loaded {len(documents)} documents from {args.fixture_dir}")
+    else:
+        print(f"No feed/HTML fixtures in {args.fixture_dir} (record some with HTTP_REPLAY_MODE=record); "
+              f"using a synthetic corpus")
+        documents = synthetic_documents(random.Random(args.seed))
+    total_mb = sum(len(c) for _, c in documents) / 1e6
+    kinds = {k: sum(1 for kind, _ in documents if kind == k) for k in ("feed", "page", "filing")}
+    print(f"{total_mb:.1f} MB: {kinds['feed']} feeds, {kinds['page']} pages, {kinds['filing']} filings\n")
+
+    print(f"{'mode':>12} {'wall (best)':>12} {'MB/s':>7} {'worst stall':>12}")
+    print("=" * 46)
+    for workers in [0] + args.workers:
+        # min_bytes=0 so every document goes through the pool being measured
+        pool = ParsePool(workers=workers, min_bytes=0)
+        if workers:
+            run(pool, documents[:workers], workers)  # start the processes outside the timing
+        results = [run(pool, documents, args.threads) for _ in range(args.repeat)]
+        pool.close()
+        wall = min(r[0] for r in results)
+        stall = max(r[1] for r in results)
+        label = "inline" if not workers else f"{workers} procs"
+        print(f"{label:>12} {wall:>11.3f}s {total_mb / wall:>7.1f} {stall * 1000:>10.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
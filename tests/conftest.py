@@ -0,0 +1,29 @@
+"""
+Shared fixtures for the test suite
+"""
+
+import pytest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep test runs out of app/data/marketpulse.log (read when app.config is first imported)
+os.environ.setdefault("LOG_FILE", "")
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """Point the SQLite layer at a throwaway database."""
+    from app.services import database
+    monkeypatch.setattr(database, "DATABASE_PATH", str(tmp_path / "test.db"))
+    return tmp_path
+
+
+@pytest.fixture
+def schema_db(temp_db):
+    """Throwaway database with the real schema (companies, holdings, articles, ...)."""
+    from app.services import database
+    database.init_db()
+    return temp_db
@@ -0,0 +1,140 @@
+"""
+Fused Article Analysis Test Suite
+Schema validation and mapping onto the classification / extraction / direct-impact shapes,
+and multi-article batched extraction
+"""
+
+import pytest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+SAMPLE = {
+    "factor_name": "supply chain events",
+    "sentiment": "Negative",
+    "sentiment_score": -0.8,
+    "confidence": 0.9,
+    "reasoning": "Fab outage",
+    "affected_sectors": ["Semiconductors"],
+    "event_type": "disruption",
+    "summary": "TSMC halts production",
+    "relationships": [
+        {"from_company": "TSMC", "to_company": "Apple", "relationship_type": "supply_chain", "confidence": 0.9, "description": "foundry"}
+    ],
+    "direct_impact": {"has_direct_impact": True, "affected_companies": ["AAPL"], "impact_type": "negative", "severity": "high", "reasoning": "supplier"}
+}
+
+
+class TestArticleAnalysis:
+    """Test suite for the fused analysis schema"""
+
+    def test_maps_to_existing_shapes(self):
+        from app.models.analysis import ArticleAnalysis
+        from app.models.factors import MarketFactor
+
+        analysis = ArticleAnalysis(**SAMPLE)
+        classification = analysis.to_classification()
+        assert classification["factor_type"] == MarketFactor.SUPPLY_CHAIN.value
+        assert classification["sentiment"] == "negative"
+
+        extraction = analysis.to_extraction()
+        assert extraction["relationships"][0]["to_company"] == "Apple"
+        assert extraction["summary"] == "TSMC halts production"
+        assert analysis.to_direct_impact()["affected_companies"] == ["AAPL"]
+
+    def test_optional_sections_default(self):
+        from app.models.analysis import ArticleAnalysis
+
+        analysis = ArticleAnalysis(factor_name="Unknown Factor")
+        assert analysis.to_extraction()["relationships"] == []
+        assert analysis.to_direct_impact()["has_direct_impact"] is False
+        assert analysis.to_classification()["factor_name"] == "Unknown Factor"
+
+    def test_rejects_out_of_range_scores(self):
+        from app.models.analysis import ArticleAnalysis
+
+        with pytest.raises(Exception):
+            ArticleAnalysis(**{**SAMPLE, "sentiment_score": 3.0})
+        with pytest.raises(Exception):
+            ArticleAnalysis(**{**SAMPLE, "relationships": [{"from_company": "TSMC"}]})
+
+
+class TestBatchedExtraction:
+    """Test suite for packing several articles into one extraction request"""
+
+    def _articles(self, n):
+        from datetime import datetime
+        from app.models.article import Article
+
+        return [Article(title=f"Story {i}", url=f"https://example.com/{i}", source="test",
+                        published_at=datetime.now(), content=f"TSMC news {i}") for i in range(n)]
+
+    def test_splits_response_and_falls_back_per_article(self):
+        import json
+        from app.services.gemini_client import GeminiClient, MockResponse
+
+        client = GeminiClient()
+        prompts = []
+
+        def fake_generate(prompt, generation_config=None, **kwargs):
+            prompts.append(prompt)
+            if "[A1]" in prompt:
+                # A2 is missing and A3 is malformed: both must be re-extracted individually
+                return MockResponse(json.dumps({"results": [
+                    {"id": "A1", "relationships": [{"from_company": "TSMC", "to_company": "Apple", "confidence": 0.9}],
+                     "summary": "s1", "direct_impact": {"has_direct_impact": True}},
+                    {"id": "A3", "relationships": "none"}
+                ]}))
+            return MockResponse(json.dumps({"relationships": [], "event_type": "news", "summary": "single"}))
+
+        client.generate_content = fake_generate
+        articles = self._articles(3)
+        results = client.extract_relationships_batch(articles, portfolio_holdings=["AAPL"])
+
+        assert len(prompts) == 3  # one batch + two fallbacks
+        assert results[articles[0].id]["relationships"][0]["to_company"] == "Apple"
+        assert results[articles[0].id]["direct_impact"]["has_direct_impact"] is True
+        assert results[articles[1].id]["summary"] == "single"
+        assert results[articles[2].id]["summary"] == "single"
+
+    def test_chunks_by_batch_size(self):
+        import json
+        from app.services.gemini_client import GeminiClient, MockResponse
+
+        client = GeminiClient()
+        prompts = []
+
+        def fake_generate(prompt, generation_config=None, **kwargs):
+            prompts.append(prompt)
+            ids = [f"A{i}" for i in range(1, 4) if f"[A{i}]" in prompt]
+            return MockResponse(json.dumps({"results": [{"id": i, "relationships": []} for i in ids]}))
+
+        client.generate_content = fake_generate
+        articles = self._articles(6)
+        results = client.extract_relationships_batch(articles, batch_size=3)
+
+        assert len(prompts) == 2
+        assert set(results) == {a.id for a in articles}
+
+    def test_priority_comes_from_the_caller(self):
+        import json
+        from app.services.gemini_client import GeminiClient, MockResponse
+        from app.services.llm_scheduler import PRIORITY_LOW
+
+        client = GeminiClient()
+        priorities = []
+
+        def fake_generate(prompt, generation_config=None, priority=None, **kwargs):
+            priorities.append(priority)
+            return MockResponse(json.dumps({"results": [], "relationships": []}))
+
+        client.generate_content = fake_generate
+        # None lets the scheduler apply the llm_priority() context; nothing here forces HIGH
+        client.extract_relationships_batch(self._articles(2))
+        assert priorities == [None, None, None]
+        priorities.clear()
+        client.extract_relationships_batch(self._articles(2), priority=PRIORITY_LOW)
+        assert priorities == [PRIORITY_LOW] * 3
@@ -0,0 +1,125 @@
+"""
+Concurrent Ingestion Test Suite
+All news sources fetched at once under a global deadline
+"""
+
+import time
+
+import pytest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _article(source: str) -> dict:
+    return {"title": f"{source} headline", "url": f"https://{source}.example/1", "content": "",
+            "source": source, "published_at": "", "type": "api", "credibility": "high"}
+
+
+@pytest.fixture
+def layer():
+    """Ingestion layer whose sources sleep instead of calling the network."""
+    from app.services.news_aggregator import NewsIngestionLayer
+
+    layer = NewsIngestionLayer()
+    delays = {"google_news": 0.3, "newsapi": 0.3, "newsdata": 0.3, "finnhub": 0.3, "gnews": 0.3, "hacker_news": 0.3}
+
+    def slow(name):
+        def fetch(*args):
+            time.sleep(delays[name])
+            return [_article(name)]
+        return fetch
+
+    layer.fetch_google_news_rss = slow("google_news")
+    layer.fetch_news_api = slow("newsapi")
+    layer.fetch_newsdata = slow("newsdata")
+    layer.fetch_finnhub = slow("finnhub")
+    layer.fetch_gnews = slow("gnews")
+    layer.fetch_hacker_news = slow("hacker_news")
+    layer._rss_feed_list = lambda tickers: []
+    layer.delays = delays
+    return layer
+
+
+class TestConcurrentIngestion:
+    """Test suite for NewsIngestionLayer.fetch_all_sources"""
+
+    def test_wall_time_is_the_slowest_source(self, layer):
+        result = layer.fetch_all_sources(["AAPL"], deadline=5, concurrent=True)
+        assert len(result["articles"]) == 6
+        assert result["elapsed"] < 1.0  # Sequential would take ~1.8s
+        assert all(t["status"] == "ok" for t in result["timings"].values())
+        # Merge order follows source priority, not completion order
+        assert [a["source"] for a in result["articles"]][:2] == ["google_news", "newsapi"]
+
+    def test_deadline_returns_what_finished(self, layer):
+        layer.delays["hacker_news"] = 2.0
+        result = layer.fetch_all_sources(["AAPL"], deadline=0.8, concurrent=True)
+        assert result["elapsed"] < 1.5
+        assert result["timings"]["hacker_news"]["status"] == "timeout"
+        assert result["timings"]["finnhub"]["articles"] == 1
+        assert "hacker_news" not in {a["source"] for a in result["articles"]}
+        assert layer.last_report["timings"]["hacker_news"]["status"] == "timeout"
+
+    def test_source_filter_and_sequential_mode(self, layer):
+        result = layer.fetch_all_sources(["AAPL"], sources=["newsapi", "finnhub"], concurrent=False)
+        assert set(result["timings"]) == {"newsapi", "finnhub"}
+        assert [a["source"] for a in result["articles"]] == ["newsapi", "finnhub"]
+
+    def test_failing_source_is_reported(self, layer):
+        def broken(*args):
+            raise RuntimeError("feed down")
+        layer._rss_feed_list = lambda tickers: [("rss:Reuters", "Reuters", "http://x", "high")]
+        layer._fetch_feed_entries = broken
+        result = layer.fetch_all_sources(["AAPL"], deadline=5)
+        assert result["timings"]["rss:Reuters"]["status"] == "error"
+        assert len(result["articles"]) == 6
+
+
+class TestStreamingIngestion:
+    """Test suite for NewsIngestionLayer.stream_batches / stream_articles"""
+
+    def test_batches_arrive_as_sources_complete(self, layer):
+        layer.delays.update({"hacker_news": 1.0, "google_news": 0.05})
+        started = time.monotonic()
+        arrivals = []
+        for batch in layer.stream_batches(["AAPL"], deadline=5):
+            arrivals.append((time.monotonic() - started, [a.source for a in batch]))
+
+        assert arrivals[0][0] < 0.2 and arrivals[0][1] == ["google_news"]
+        assert arrivals[-1][1] == ["hacker_news"]
+        assert sorted(s for _, batch in arrivals for s in batch) == sorted(layer.delays)
+
+    def test_dedup_spans_batches(self, layer):
+        layer.fetch_gnews = lambda *args: [dict(_article("newsapi"), url="https://gnews.example/copy")]
+        streamed = list(layer.stream_articles(["AAPL"], deadline=5))
+        assert len(streamed) == 5
+        assert len({a.title for a in streamed}) == 5
+
+    def test_consumer_can_stop_early(self, layer):
+        from itertools import islice
+
+        layer.delays["hacker_news"] = 2.0
+        started = time.monotonic()
+        first_two = list(islice(layer.stream_articles(["AAPL"], deadline=5), 2))
+        assert len(first_two) == 2
+        assert time.monotonic() - started < 1.0
+        assert layer.last_report["timings"]["hacker_news"]["status"] == "timeout"
+
+    def test_alert_stream_processes_every_batch(self):
+        from app.services.alert_generator import AlertGenerator
+
+        class _Pipeline:
+            seen = []
+
+            def process_articles(self, batch):
+                self.seen.extend(batch)
+                return []
+
+        generator = AlertGenerator()
+        generator.pipeline = _Pipeline()
+        # No max_articles: every article of every batch is processed
+        generator.generate_alerts_from_stream(iter([list(range(15)), list(range(15, 30))]))
+        assert generator.pipeline.seen == list(range(30))
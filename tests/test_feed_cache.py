@@ -0,0 +1,91 @@
+"""
+Conditional Feed Fetch Test Suite
+ETag / Last-Modified validators are persisted and a 304 skips parsing
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Test</title>
+<item><title>TSMC raises capex</title><link>https://ex.com/tsmc</link><description>Chips</description></item>
+<item><title>ASML ships EUV tools</title><link>https://ex.com/asml</link><description>Lithography</description></item>
+</channel></rss>"""
+
+
+class _Feed(BaseHTTPRequestHandler):
+    """Serves one RSS document with an ETag and honours If-None-Match"""
+    full_responses = 0
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == '"rev1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        _Feed.full_responses += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("ETag", '"rev1"')
+        self.send_header("Content-Length", str(len(RSS)))
+        self.end_headers()
+        self.wfile.write(RSS)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def feed_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Feed)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    _Feed.full_responses = 0
+    yield f"http://127.0.0.1:{server.server_address[1]}/rss"
+    server.shutdown()
+    server.server_close()
+
+
+class TestConditionalFeeds:
+    """Test suite for conditional RSS/Atom fetching"""
+
+    def test_304_skips_parsing(self, temp_db, feed_url, monkeypatch):
+        from app.services import news_aggregator, parse_pool as parse_module
+        from app.services.feed_cache import FeedValidatorCache
+
+        cache = FeedValidatorCache()
+        monkeypatch.setattr(news_aggregator, "feed_cache", cache)
+        parses = []
+        real_parse = parse_module.feedparser.parse
+        monkeypatch.setattr(parse_module.feedparser, "parse", lambda data: parses.append(1) or real_parse(data))
+        layer = news_aggregator.NewsIngestionLayer()
+
+        first = layer._fetch_feed_entries("Test", feed_url, "high")
+        second = layer._fetch_feed_entries("Test", feed_url, "high")
+        assert [a["title"] for a in first] == ["TSMC raises capex", "ASML ships EUV tools"]
+        assert second == first
+        assert len(parses) == 1
+        assert _Feed.full_responses == 1
+
+        stats = cache.get_stats()
+        assert stats["feeds"][feed_url]["not_modified"] == 1
+        assert stats["feeds"][feed_url]["modified"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["bytes_saved"] == len(RSS)
+
+    def test_validators_survive_restart(self, temp_db, feed_url, monkeypatch):
+        from app.services import news_aggregator
+        from app.services.feed_cache import FeedValidatorCache
+
+        monkeypatch.setattr(news_aggregator, "feed_cache", FeedValidatorCache())
+        layer = news_aggregator.NewsIngestionLayer()
+        first = layer._fetch_feed_entries("Test", feed_url, "high")
+
+        monkeypatch.setattr(news_aggregator, "feed_cache", FeedValidatorCache())
+        assert layer._fetch_feed_entries("Test", feed_url, "high") == first
+        assert _Feed.full_responses == 1
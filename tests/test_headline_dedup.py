@@ -0,0 +1,60 @@
+"""
+Headline Dedup Test Suite
+The indexed deduplicator must match the pairwise 60% overlap rule exactly
+"""
+
+import random
+import re
+
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _pairwise(articles):
+    """Reference: the original O(n^2) implementation"""
+    unique, seen_urls = [], set()
+    for art in articles:
+        if art["url"] in seen_urls:
+            continue
+        words = set(re.findall(r'\w+', art["title"].lower()))
+        if not any(len(words & set(re.findall(r'\w+', u["title"].lower()))) / max(len(words), 1) > 0.6
+                   for u in unique):
+            seen_urls.add(art["url"])
+            unique.append(art)
+    return unique
+
+
+class TestHeadlineDedup:
+    """Test suite for HeadlineDeduplicator"""
+
+    def test_syndicated_copy_dropped(self):
+        from app.services.headline_dedup import deduplicate_headlines
+
+        articles = [
+            {"title": "TSMC halts chip production after Taiwan earthquake", "url": "https://a/1"},
+            {"title": "TSMC halts chip production after earthquake - Reuters", "url": "https://b/2"},
+            {"title": "Fed holds rates steady", "url": "https://c/3"},
+            {"title": "Fed holds rates steady", "url": "https://c/3"},
+            {"title": "", "url": "https://d/4"},
+        ]
+        assert [a["url"] for a in deduplicate_headlines(articles)] == ["https://a/1", "https://c/3", "https://d/4"]
+
+    def test_matches_pairwise_rule(self):
+        from app.services.headline_dedup import deduplicate_headlines
+
+        rng = random.Random(3)
+        vocab = [f"w{i}" for i in range(40)]
+        articles = []
+        for i in range(600):
+            if articles and rng.random() < 0.3:
+                words = rng.choice(articles)["title"].split()
+                rng.shuffle(words)
+                title = " ".join(words[:rng.randint(1, len(words))] + rng.sample(vocab, rng.randint(0, 3)))
+            else:
+                title = " ".join(rng.sample(vocab, rng.randint(1, 9)))
+            articles.append({"title": title, "url": f"https://x/{rng.randint(0, 500)}"})
+
+        assert deduplicate_headlines(articles) == _pairwise(articles)
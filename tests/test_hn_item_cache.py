@@ -0,0 +1,78 @@
+"""
+Hacker News Item Cache Test Suite
+Only story IDs not seen before are fetched from the API
+"""
+
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class _Response:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class _FakeHN:
+    """Stands in for the pooled HN session; counts item requests"""
+
+    def __init__(self, top):
+        self.top = top
+        self.item_requests = []
+
+    def get(self, url, **kwargs):
+        if url.endswith("topstories.json"):
+            return _Response(self.top)
+        story_id = int(url.rsplit("/", 1)[1].split(".")[0])
+        self.item_requests.append(story_id)
+        return _Response({"id": story_id, "title": f"Story {story_id}", "url": f"https://ex.com/{story_id}",
+                          "score": 10, "time": 1700000000})
+
+
+class TestHNItemCache:
+    """Test suite for the HN item cache"""
+
+    def test_only_new_ids_are_fetched(self, temp_db, monkeypatch):
+        from app.services import news_aggregator
+        from app.services.hn_item_cache import HNItemCache
+
+        fake = _FakeHN([1, 2, 3])
+        monkeypatch.setattr(news_aggregator, "http_client", fake)
+        monkeypatch.setattr(news_aggregator, "hn_item_cache", HNItemCache())
+        layer = news_aggregator.NewsIngestionLayer()
+
+        first = layer.fetch_hacker_news()
+        assert [a["title"] for a in first] == ["Story 1", "Story 2", "Story 3"]
+        assert sorted(fake.item_requests) == [1, 2, 3]
+
+        fake.top = [4, 2, 1]
+        fake.item_requests.clear()
+        second = layer.fetch_hacker_news()
+        assert fake.item_requests == [4]
+        assert [a["title"] for a in second] == ["Story 4", "Story 2", "Story 1"]
+
+    def test_disk_cache_survives_restart(self, temp_db):
+        from app.services.hn_item_cache import HNItemCache
+
+        HNItemCache().put_many({7: {"id": 7, "title": "Seven"}, 8: {}})
+        cache = HNItemCache()
+        assert cache.get_many([7, 8, 9]) == {7: {"id": 7, "title": "Seven"}, 8: {}}
+        assert cache.get_stats()["disk_hits"] == 2
+        assert cache.get_stats()["misses"] == 1
+        cache.get_many([7])
+        assert cache.get_stats()["memory_hits"] == 1
+
+    def test_table_bounded(self, temp_db):
+        from app.services.hn_item_cache import HNItemCache
+
+        cache = HNItemCache(max_items=3)
+        cache.put_many({i: {"id": i} for i in range(5)})
+        assert len(HNItemCache(max_items=3).get_many(range(5))) == 3
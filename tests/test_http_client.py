@@ -0,0 +1,100 @@
+"""
+Shared HTTP Client Test Suite
+Connections are reused per host, transient failures are retried with jittered backoff,
+and every attempt lands in the per-host metrics
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class _Flaky(BaseHTTPRequestHandler):
+    """Fails the first `failures` requests with 503, then answers 200; /slow never answers in time"""
+    protocol_version = "HTTP/1.1"
+    failures = 0
+    hits = 0
+    connections = set()
+
+    def do_GET(self):
+        _Flaky.hits += 1
+        _Flaky.connections.add(self.client_address)
+        if self.path == "/slow":
+            threading.Event().wait(1)  # unaffected by tests patching time.sleep
+        status = 503 if _Flaky.hits <= _Flaky.failures else 200
+        body = b"ok" if status == 200 else b"busy"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def upstream():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Flaky)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    _Flaky.failures, _Flaky.hits, _Flaky.connections = 0, 0, set()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestPooledHttpClient:
+    """Test suite for PooledHttpClient"""
+
+    def test_keep_alive_and_metrics(self, upstream):
+        from app.services.http_client import PooledHttpClient
+
+        client = PooledHttpClient()
+        for _ in range(5):
+            assert client.get(f"{upstream}/feed").text == "ok"
+        assert len(_Flaky.connections) == 1
+
+        stats = client.get_stats()[upstream.split("//")[1]]
+        assert stats["requests"] == 5 and stats["statuses"] == {200: 5}
+        assert stats["p50_ms"] is not None and stats["p95_ms"] >= stats["p50_ms"]
+        client.close()
+
+    def test_retries_transient_status_with_jitter(self, upstream, monkeypatch):
+        from app.services import http_client as module
+
+        sleeps = []
+        monkeypatch.setattr(module.time, "sleep", sleeps.append)
+        client = module.PooledHttpClient(max_retries=3, backoff_base=0.5)
+        _Flaky.failures = 2
+
+        resp = client.get(f"{upstream}/feed")
+        assert resp.status_code == 200 and _Flaky.hits == 3
+        assert len(sleeps) == 2 and 0 <= sleeps[0] <= 0.5 and 0 <= sleeps[1] <= 1.0
+        assert client.get_stats()[upstream.split("//")[1]]["retries"] == 2
+
+    def test_metered_calls_and_posts_are_not_retried(self, upstream, monkeypatch):
+        from app.services import http_client as module
+
+        monkeypatch.setattr(module.time, "sleep", lambda s: pytest.fail("unexpected backoff"))
+        client = module.PooledHttpClient(max_retries=3)
+        _Flaky.failures = 5
+
+        assert client.get(f"{upstream}/feed", retries=0).status_code == 503
+        assert _Flaky.hits == 1
+
+    def test_read_timeout_raises_after_retries(self, upstream, monkeypatch):
+        import requests
+        from app.services import http_client as module
+
+        monkeypatch.setattr(module.time, "sleep", lambda s: None)
+        client = module.PooledHttpClient(max_retries=1)
+        with pytest.raises(requests.Timeout):
+            client.get(f"{upstream}/slow", timeout=0.2)
+        stats = client.get_stats()[upstream.split("//")[1]]
+        assert stats["errors"] == 2 and stats["retries"] == 1
@@ -0,0 +1,102 @@
+"""
+HTTP Record / Replay Test Suite
+Fixtures captured from a live server are served back offline by the stub
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class _Upstream(BaseHTTPRequestHandler):
+    """Stands in for a news API: echoes the path and counts hits"""
+    hits = 0
+
+    def _reply(self):
+        _Upstream.hits += 1
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.dumps({"path": self.path.split("?")[0], "echo": self.rfile.read(length).decode()}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = _reply
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def upstream():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Upstream)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    _Upstream.hits = 0
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestHttpReplay:
+    """Test suite for recording and replaying upstream HTTP"""
+
+    def test_fixture_key_ignores_secrets_and_volatile_params(self):
+        from app.services.http_replay import fixture_key
+
+        a = fixture_key("GET", "https://newsapi.org/v2/everything?q=AAPL&apiKey=one&from=2025-01-01")
+        b = fixture_key("get", "https://NEWSAPI.org/v2/everything?apiKey=two&q=AAPL&from=2025-02-02")
+        assert a == b
+        assert a != fixture_key("GET", "https://newsapi.org/v2/everything?q=TSLA&apiKey=one")
+        assert fixture_key("POST", "https://openrouter.ai/x", '{"a": 1, "b": 2}') == \
+            fixture_key("POST", "https://openrouter.ai/x", b'{"b":2,"a":1}')
+
+    def test_record_then_replay_offline(self, upstream, tmp_path):
+        import httpx
+        import requests
+        from app.services.http_replay import HttpRecorder
+
+        with HttpRecorder().install("record", str(tmp_path)) as recorder:
+            live = requests.get(f"{upstream}/v2/everything", params={"q": "AAPL", "apiKey": "secret"}, timeout=5)
+            httpx.Client().post(f"{upstream}/chat", json={"model": "m", "prompt": "hi"}, timeout=5)
+            assert recorder.get_stats()["recorded"] == 2
+        stored = "".join(p.read_text() for p in tmp_path.iterdir())
+        assert "secret" not in stored and "REDACTED" in stored
+        hits = _Upstream.hits
+
+        with HttpRecorder().install("replay", str(tmp_path)) as recorder:
+            replayed = requests.get(f"{upstream}/v2/everything", params={"q": "AAPL", "apiKey": "other"}, timeout=5)
+            assert replayed.json() == live.json()
+            assert replayed.headers["ETag"] == '"v1"'
+            posted = httpx.Client().post(f"{upstream}/chat", json={"prompt": "hi", "model": "m"}, timeout=5)
+            assert posted.status_code == 200
+            missing = requests.get(f"{upstream}/never-recorded", timeout=5)
+            assert missing.status_code == 404
+            assert recorder.get_stats()["served"] == 2
+            assert recorder.get_stats()["missing"] == 1
+        assert _Upstream.hits == hits  # Nothing reached the real server
+
+    def test_injected_latency_and_errors(self, upstream, tmp_path):
+        import requests
+        from app.services.http_replay import HttpRecorder
+
+        with HttpRecorder().install("record", str(tmp_path)):
+            requests.get(f"{upstream}/feed", timeout=5)
+
+        with HttpRecorder().install("replay", str(tmp_path), latency_ms=150):
+            started = time.monotonic()
+            assert requests.get(f"{upstream}/feed", timeout=5).status_code == 200
+            assert time.monotonic() - started >= 0.15
+
+        with HttpRecorder().install("replay", str(tmp_path), error_rate=1.0) as recorder:
+            assert requests.get(f"{upstream}/feed", timeout=5).status_code in (429, 503)
+            assert recorder.get_stats()["injected_errors"] == 1
@@ -0,0 +1,90 @@
+"""
+LLM Response Cache Test Suite
+Verifies content-addressed keys, TTL expiry and LRU eviction
+"""
+
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class TestLLMResponseCache:
+    """Test suite for the SQLite-backed LLM response cache"""
+
+    def test_key_depends_on_model_prompt_and_config(self):
+        from app.services.llm_cache import LLMResponseCache
+
+        base = LLMResponseCache.make_key("model-a", "prompt", {"temperature": 0.1})
+        assert base == LLMResponseCache.make_key("model-a", "prompt", {"temperature": 0.1})
+        assert base != LLMResponseCache.make_key("model-b", "prompt", {"temperature": 0.1})
+        assert base != LLMResponseCache.make_key("model-a", "prompt 2", {"temperature": 0.1})
+        assert base != LLMResponseCache.make_key("model-a", "prompt", {"temperature": 0.2})
+
+    def test_hit_and_miss_counters(self, temp_db):
+        from app.services.llm_cache import LLMResponseCache
+
+        cache = LLMResponseCache(ttl_seconds=60, max_entries=10, enabled=True)
+        key = cache.make_key("m", "p")
+
+        assert cache.get(key) is None
+        cache.set(key, '{"relationships": []}')
+        assert cache.get(key) == '{"relationships": []}'
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["entries"] == 1
+
+    def test_ttl_expiry(self, temp_db):
+        from app.services.llm_cache import LLMResponseCache
+
+        cache = LLMResponseCache(ttl_seconds=0, max_entries=10, enabled=True)
+        key = cache.make_key("m", "p")
+        cache.set(key, "stale")
+        time.sleep(0.01)
+
+        assert cache.get(key) is None
+        assert cache.get_stats()["expired"] >= 1
+
+    def test_lru_eviction(self, temp_db):
+        from app.services.llm_cache import LLMResponseCache
+
+        cache = LLMResponseCache(ttl_seconds=60, max_entries=2, enabled=True)
+        keys = [cache.make_key("m", f"p{i}") for i in range(3)]
+
+        cache.set(keys[0], "zero")
+        time.sleep(0.01)
+        cache.set(keys[1], "one")
+        time.sleep(0.01)
+        cache.get(keys[0])  # Touch: keys[1] is now least recently used
+        time.sleep(0.01)
+        cache.set(keys[2], "two")
+
+        assert cache.get(keys[0]) == "zero"
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[2]) == "two"
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_expiry_is_numeric_and_legacy_rows_dropped(self, schema_db):
+        from app.services.database import get_db_connection
+        from app.services.llm_cache import LLMResponseCache
+
+        cache = LLMResponseCache(ttl_seconds=60, max_entries=10, enabled=True)
+        legacy, fresh = cache.make_key("m", "legacy"), cache.make_key("m", "fresh")
+        conn = get_db_connection()
+        conn.execute("INSERT INTO cache_metadata (key, value, expires_at) VALUES (?, ?, ?)",
+                     (legacy, '{"text": "old"}', "2000-01-01 00:00:00"))
+        conn.commit()
+        conn.close()
+
+        cache.set(fresh, "new")
+        assert cache.get(legacy) is None
+        assert cache.get(fresh) == "new"
+        conn = get_db_connection()
+        row = conn.execute("SELECT typeof(expires_at) AS kind, expires_at FROM cache_metadata WHERE key = ?",
+                           (fresh,)).fetchone()
+        conn.close()
+        assert row["kind"] == "real" and row["expires_at"] > time.time()
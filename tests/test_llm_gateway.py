@@ -0,0 +1,236 @@
+"""
+LLM Gateway Test Suite
+Shared token buckets and the priority-aware request scheduler
+"""
+
+import pytest
+import sys
+import os
+import threading
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class TestTokenBucket:
+    """Test suite for the process-wide provider rate limiters"""
+
+    def test_burst_then_steady_rate(self):
+        from app.services.rate_limiter import TokenBucket
+
+        bucket = TokenBucket(rate_per_minute=600, burst=2)  # 10/s
+        assert bucket.try_acquire()
+        assert bucket.try_acquire()
+        assert not bucket.try_acquire()
+        assert 0 < bucket.time_until_available() <= 0.1
+        assert bucket.acquire(timeout=0.5)
+
+    def test_one_bucket_per_provider_key(self):
+        from app.services.rate_limiter import ProviderRateLimiters
+
+        registry = ProviderRateLimiters()
+        a = registry.get("openrouter", "key-a", 30)
+        assert registry.get("openrouter", "key-a", 30) is a
+        assert registry.get("openrouter", "key-b", 30) is not a
+        assert registry.get("gemini", "key-a", 30) is not a
+        assert all("key-a" not in name for name in registry.get_stats())
+
+
+class TestLLMRequestScheduler:
+    """Test suite for priority ordering and non-blocking retries"""
+
+    def test_high_priority_jumps_queue(self):
+        from app.services.llm_scheduler import LLMRequestScheduler, PRIORITY_HIGH, PRIORITY_LOW
+
+        scheduler = LLMRequestScheduler(num_workers=1)
+        gate = threading.Event()
+        order = []
+
+        blocker = scheduler.submit(lambda: gate.wait(5), PRIORITY_LOW)
+        time.sleep(0.05)  # Let the single worker pick up the blocker
+        lows = [scheduler.submit(lambda i=i: order.append(f"low{i}"), PRIORITY_LOW) for i in range(3)]
+        high = scheduler.submit(lambda: order.append("high"), PRIORITY_HIGH)
+        gate.set()
+
+        for f in [blocker, high] + lows:
+            f.result(timeout=5)
+        assert order[0] == "high"
+
+    def test_retry_after_requeues_without_caller_sleep(self):
+        from app.services.llm_scheduler import LLMRequestScheduler, RetryAfter
+
+        scheduler = LLMRequestScheduler(num_workers=1)
+        attempts = []
+
+        def flaky():
+            attempts.append(time.monotonic())
+            return RetryAfter(0.05) if len(attempts) < 3 else "ok"
+
+        assert scheduler.run(flaky, timeout=5) == "ok"
+        assert len(attempts) == 3
+        assert scheduler.get_stats()["requeued"] == 2
+
+    def test_drained_provider_does_not_block_others(self):
+        from app.services.llm_scheduler import LLMRequestScheduler, PRIORITY_HIGH, PRIORITY_LOW
+        from app.services.rate_limiter import TokenBucket
+
+        scheduler = LLMRequestScheduler(num_workers=1)
+        gemini, openrouter = TokenBucket(rate_per_minute=1), TokenBucket(rate_per_minute=600, burst=5)
+        assert gemini.try_acquire()  # drained: next token in ~60s
+
+        blocked = scheduler.submit(lambda: "gemini", PRIORITY_HIGH, bucket_fn=lambda: gemini)
+        ready = scheduler.submit(lambda: "openrouter", PRIORITY_LOW, bucket_fn=lambda: openrouter)
+        assert ready.result(timeout=2) == "openrouter"
+        assert not blocked.done()
+
+    def test_exceptions_propagate_to_caller(self):
+        from app.services.llm_scheduler import LLMRequestScheduler
+
+        scheduler = LLMRequestScheduler(num_workers=1)
+
+        def boom():
+            raise RuntimeError("upstream exploded")
+
+        with pytest.raises(RuntimeError):
+            scheduler.run(boom, timeout=5)
+
+
+class TestSingleFlight:
+    """Test suite for in-flight coalescing of identical requests"""
+
+    def test_concurrent_callers_share_one_call(self):
+        from app.services.singleflight import SingleFlight
+
+        flight = SingleFlight("test")
+        calls = []
+        results = []
+
+        def upstream():
+            calls.append(1)
+            time.sleep(0.2)
+            return "answer"
+
+        threads = [threading.Thread(target=lambda: results.append(flight.do("k", upstream))) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert sorted(shared for _, shared in results) == [False, True, True, True]
+        assert all(result == "answer" for result, _ in results)
+        assert flight.get_stats()["coalesced"] == 3
+        assert flight.get_stats()["in_flight"] == 0
+
+    def test_errors_reach_every_waiter(self):
+        from app.services.singleflight import SingleFlight
+
+        flight = SingleFlight("test")
+
+        def upstream():
+            raise ValueError("bad gateway")
+
+        with pytest.raises(ValueError):
+            flight.do("k", upstream)
+        # Key is released after failure
+        assert flight.do("k", lambda: "retry")[0] == "retry"
+
+
+class TestModelRouter:
+    """Test suite for latency/error-aware model and key selection"""
+
+    def test_prefers_faster_healthy_model(self):
+        from app.services.model_router import ModelRouter
+
+        router = ModelRouter(["primary", "backup"], ["key-a"])
+        assert router.pick_model() == "primary"  # configured order until stats exist
+        for _ in range(5):
+            router.record("primary", "key-a", 4.0, 200)
+            router.record("backup", "key-a", 0.5, 200)
+        assert router.pick_model() == "backup"
+        assert router.pick_model(exclude={"backup"}) == "primary"
+
+    def test_circuit_opens_after_consecutive_failures(self):
+        from app.services.model_router import ModelRouter
+
+        router = ModelRouter(["primary", "backup"], ["key-a", "key-b"],
+                             failure_threshold=2, cooldown_seconds=60)
+        router.record("primary", "key-a", 0.1, 500)
+        assert router.get_stats()["models"]["primary"]["circuit"] == "closed"
+        assert router.pick_model() == "backup"  # error rate already penalises primary
+        router.record("primary", "key-a", 0.1, 503)
+        assert router.pick_model() == "backup"
+        assert router.get_stats()["models"]["primary"]["circuit"] == "open"
+
+        router.record("backup", "key-b", 0.1, 401)  # bad key trips immediately
+        assert router.ranked_keys()[0] == "key-a"
+        assert "key-b" not in router.get_stats()["api_keys"]  # keys are fingerprinted
+
+    def test_percentile_needs_samples(self):
+        from app.services.model_router import ModelRouter
+
+        router = ModelRouter(["primary"], [])
+        router.record("primary", None, 1.0, 200)
+        assert router.model_latency_percentile("primary", 95) is None
+        for latency in (2.0, 3.0, 4.0):
+            router.record("primary", None, latency, 200)
+        assert router.model_latency_percentile("primary", 50) == 2.0
+        assert router.model_latency_percentile("primary", 95) == 4.0
+
+
+class TestHedgedRequests:
+    """Test suite for racing a slow primary model against the next-best one"""
+
+    def _client(self, monkeypatch, primary_delay):
+        import httpx
+        from concurrent.futures import ThreadPoolExecutor
+        from app.services import gemini_client as module
+
+        monkeypatch.setattr(module, "LLM_HEDGE_MIN_DELAY_SECONDS", 0.05)
+        client = module.GeminiClient()
+        pool = ThreadPoolExecutor(max_workers=4)
+        primary = client.openrouter_models[0]
+
+        def fake_send(payload, api_key):
+            def respond():
+                if payload["model"] == primary:
+                    time.sleep(primary_delay)
+                return httpx.Response(200, json={"choices": [{"message": {"content": payload["model"]}}]})
+            return pool.submit(respond)
+
+        client._send_openrouter = fake_send
+        for _ in range(3):
+            client.router.record(primary, None, 0.05, 200)
+        return module, client, primary
+
+    def test_slow_primary_is_hedged(self, monkeypatch):
+        module, client, primary = self._client(monkeypatch, primary_delay=1.0)
+        request = module._OpenRouterRequest(client, "prompt", {"temperature": 0, "max_tokens": 10}, hedge=True)
+
+        response = request.attempt()
+        assert response.model != primary
+        assert response.text == response.model
+        stats = client.get_hedge_stats()
+        assert stats["sent"] == 1 and stats["won"] == 1
+
+    def test_out_raced_primary_trips(self, monkeypatch):
+        module, client, primary = self._client(monkeypatch, primary_delay=0.5)
+        client._take_hedge_slot = lambda api_key: True  # hedge budget is not under test here
+        threshold = client.router.failure_threshold
+        for _ in range(threshold):
+            request = module._OpenRouterRequest(client, "prompt", {"temperature": 0, "max_tokens": 10}, hedge=True)
+            assert request.attempt().model != primary
+
+        # Losing to the hedge never counts as a success for the primary
+        stats = client.router.get_stats()["models"][primary]
+        assert stats["timeout_rate"] > 0
+        assert stats["circuit"] == "open"
+        assert client.router.pick_model() != primary
+
+    def test_fast_primary_is_not_hedged(self, monkeypatch):
+        module, client, primary = self._client(monkeypatch, primary_delay=0.0)
+        request = module._OpenRouterRequest(client, "prompt", {"temperature": 0, "max_tokens": 10}, hedge=True)
+
+        assert request.attempt().model == primary
+        assert client.get_hedge_stats()["sent"] == 0
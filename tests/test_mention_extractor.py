@@ -0,0 +1,78 @@
+"""
+Mention Extractor Test Suite
+One Aho-Corasick pass finds company names and tickers on word boundaries
+"""
+
+import random
+import re
+
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class TestMentionExtractor:
+    """Test suite for AhoCorasick / MentionExtractor"""
+
+    def test_matches_regex_reference(self):
+        from app.services.mention_extractor import MentionExtractor
+
+        rng = random.Random(5)
+        alphabet = "ab c"
+        names = {"".join(rng.choice("abc") for _ in range(rng.randint(1, 4))) for _ in range(30)}
+        extractor = MentionExtractor({n: n for n in names})
+        for _ in range(300):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+            expected = {n for n in names if re.search(rf"(?<![^\W_]){re.escape(n)}(?![^\W_])", text)}
+            assert set(extractor.extract(text)) == expected
+
+    def test_boundaries_case_and_aliases(self, schema_db):
+        from app.services.mention_extractor import CompanyMentionIndex
+
+        index = CompanyMentionIndex()
+        text = "Nvidia Corporation and Apple's supplier TSMC; an arm of a pharma firm; AMDOCS; ARM Holdings up, $AAPL"
+        assert index.extract(text) == ["NVDA", "AAPL", "TSM", "ARM"]
+        assert index.extract("pineapple harm") == []
+        # Restricting to a portfolio keeps only its tickers
+        assert index.extract(text, ["aapl", "MSFT"]) == ["AAPL"]
+
+    def test_holdings_added_incrementally(self, schema_db):
+        from app.services.mention_extractor import CompanyMentionIndex
+
+        index = CompanyMentionIndex()
+        assert index.extract("Zeta Robotics Inc. beats estimates") == []
+        index.add_companies([("ZETA", "Zeta Robotics Inc.")])
+        assert index.extract("Zeta Robotics beats estimates; ZETA +4%") == ["ZETA"]
+        assert index.get_stats()["rebuilds"] == 0
+
+    def test_portfolio_articles_use_exact_matches(self, schema_db):
+        from app.services.persistence import persistence_service
+        from app.services.database import get_db_connection
+
+        conn = get_db_connection()
+        conn.executemany("INSERT INTO articles (id, title, content, published_at) VALUES (?, ?, ?, ?)", [
+            ("1", "ARM raises guidance", "", "2025-01-02"),
+            ("2", "Big pharma merger", "", "2025-01-03"),
+        ])
+        conn.commit()
+        conn.close()
+
+        articles = persistence_service.get_articles_for_portfolio(["ARM"])
+        assert [(a["id"], a["affected_companies"]) for a in articles] == [("1", ["ARM"])]
+
+    def test_portfolio_articles_found_by_name_and_paged(self, schema_db):
+        from app.services.persistence import persistence_service
+        from app.services.database import get_db_connection
+
+        rows = [(f"p{i}", f"Big pharma deal {i}", "", f"2025-02-01 {i:03d}") for i in range(40)]
+        rows.append(("apple", "Apple supplier update", "No ticker in this one", "2025-01-01"))
+        conn = get_db_connection()
+        conn.executemany("INSERT INTO articles (id, title, content, published_at) VALUES (?, ?, ?, ?)", rows)
+        conn.commit()
+        conn.close()
+
+        # 40 newer substring-only hits ("pharma", more than a page) must not crowd out the name-only match
+        articles = persistence_service.get_articles_for_portfolio(["AAPL", "ARM"], limit=1)
+        assert [(a["id"], a["affected_companies"]) for a in articles] == [("apple", ["AAPL"])]
@@ -0,0 +1,83 @@
+"""
+Near-Duplicate Reuse Test Suite
+MinHash similarity and reuse of LLM results across syndicated copies of a story
+"""
+
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+ORIGINAL = ("TSMC halts chip production after Taiwan earthquake",
+            "Taiwan Semiconductor Manufacturing Co halted production at several advanced fabs on Tuesday "
+            "after a magnitude 7 earthquake struck the island, threatening supplies to Apple and Nvidia.")
+SYNDICATED = ("TSMC halts chip production after earthquake in Taiwan - Reuters",
+              "Taiwan Semiconductor Manufacturing Co halted production at several advanced fabs on Tuesday "
+              "after a magnitude 7 earthquake struck the island, threatening supplies to Apple and Nvidia, sources said.")
+UNRELATED = ("Federal Reserve holds interest rates steady",
+             "The Federal Reserve left its benchmark rate unchanged, citing cooling inflation and a resilient labor market.")
+
+
+class TestMinHash:
+    """Test suite for signatures and the LSH index"""
+
+    def test_similarity_tracks_overlap(self):
+        from app.services.minhash import MinHasher, estimate_similarity, shingles
+
+        hasher = MinHasher(64)
+        original = hasher.signature(shingles(" ".join(ORIGINAL)))
+        assert estimate_similarity(original, hasher.signature(shingles(" ".join(SYNDICATED)))) > 0.6
+        assert estimate_similarity(original, hasher.signature(shingles(" ".join(UNRELATED)))) < 0.2
+
+    def test_lsh_query_and_remove(self):
+        from app.services.minhash import MinHasher, LSHIndex, shingles
+
+        hasher = MinHasher(64)
+        index = LSHIndex(64, 16)
+        index.add("a", hasher.signature(shingles(" ".join(ORIGINAL))))
+        index.add("b", hasher.signature(shingles(" ".join(UNRELATED))))
+
+        matches = index.query(hasher.signature(shingles(" ".join(SYNDICATED))), 0.6)
+        assert [key for key, _ in matches] == ["a"]
+        index.remove("a")
+        assert index.query(hasher.signature(shingles(" ".join(SYNDICATED))), 0.6) == []
+
+
+class TestAnalysisReuse:
+    """Test suite for reusing results across near-identical articles"""
+
+    def test_reuses_and_records_link(self, temp_db):
+        from app.services.analysis_reuse import AnalysisReuseIndex
+        from app.services.database import get_db_connection
+
+        index = AnalysisReuseIndex(threshold=0.6, ttl_seconds=3600, enabled=True)
+        result = {"relationships": [{"from_company": "TSMC", "to_company": "Apple"}], "summary": "halt"}
+        index.remember("extraction", "art-1", *ORIGINAL, result)
+
+        assert index.reuse("extraction", "art-2", *SYNDICATED) == result
+        assert index.reuse("extraction", "art-3", *UNRELATED) is None
+        assert index.reuse("analysis:AAPL", "art-4", *SYNDICATED) is None  # kinds don't mix
+
+        conn = get_db_connection()
+        rows = conn.execute("SELECT article_id, source_article_id FROM analysis_reuse_links").fetchall()
+        conn.close()
+        assert [(r["article_id"], r["source_article_id"]) for r in rows] == [("art-2", "art-1")]
+
+    def test_index_survives_restart_and_expires(self, temp_db):
+        from app.services.analysis_reuse import AnalysisReuseIndex
+
+        AnalysisReuseIndex(ttl_seconds=3600, enabled=True).remember("extraction", "art-1", *ORIGINAL, {"x": 1})
+        assert AnalysisReuseIndex(ttl_seconds=3600, enabled=True).reuse("extraction", "art-2", *SYNDICATED) == {"x": 1}
+        assert AnalysisReuseIndex(ttl_seconds=-1, enabled=True).reuse("extraction", "art-3", *SYNDICATED) is None
+
+    def test_cluster_within_batch(self):
+        from types import SimpleNamespace
+        from app.services.analysis_reuse import AnalysisReuseIndex
+
+        articles = [SimpleNamespace(id=i, title=t, content=c)
+                    for i, (t, c) in enumerate([ORIGINAL, UNRELATED, SYNDICATED])]
+        followers = AnalysisReuseIndex(enabled=True).cluster(articles)
+        assert list(followers) == [2]
+        assert followers[2][0] == 0
@@ -0,0 +1,73 @@
+"""
+News Snapshot Test Suite
+/articles reads a shared per-ticker-set snapshot: fresh hits never fetch, stale hits are
+served immediately while one background refresh runs
+"""
+
+import threading
+import time
+
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _snapshot_cache(delay=0.0, **kwargs):
+    from app.services.news_snapshot import NewsSnapshotCache
+
+    calls = []
+
+    def fetch(tickers):
+        calls.append(list(tickers))
+        time.sleep(delay)
+        return [{"title": f"{','.join(tickers)} #{len(calls)}", "url": f"https://x/{len(calls)}"}]
+
+    cache = NewsSnapshotCache(fetch=fetch, **kwargs)
+    return cache, calls
+
+
+class TestNewsSnapshot:
+    """Test suite for NewsSnapshotCache"""
+
+    def test_ticker_sets_share_one_snapshot(self):
+        cache, calls = _snapshot_cache(delay=0.2, ttl_seconds=60)
+        results = []
+        threads = [threading.Thread(target=lambda t=t: results.append(cache.get(t)))
+                   for t in (["AAPL", "NVDA"], ["nvda", "AAPL"], ["AAPL", "NVDA"])]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert calls == [["AAPL", "NVDA"]]
+        assert all(r["as_of"] == results[0]["as_of"] and not r["stale"] for r in results)
+        assert cache.get(["AAPL", "NVDA"])["articles"] == results[0]["articles"]
+        assert len(calls) == 1
+
+    def test_stale_served_while_revalidating(self):
+        cache, calls = _snapshot_cache(delay=0.3, ttl_seconds=0, max_stale_seconds=60)
+        first = cache.get(["TSM"])
+
+        started = time.monotonic()
+        stale = cache.get(["TSM"])
+        assert time.monotonic() - started < 0.1  # did not wait for the refresh
+        assert stale["stale"] and stale["articles"] == first["articles"]
+
+        time.sleep(0.5)
+        assert len(calls) == 2
+        assert cache.get(["TSM"])["articles"][0]["title"] == "TSM #2"
+
+    def test_background_refresh_and_idle_expiry(self):
+        cache, calls = _snapshot_cache(ttl_seconds=0, idle_seconds=60)
+        cache.track(["ASML"])
+        cache.refresh_due()
+        assert calls == [["ASML"]]
+        assert cache.get_stats()["snapshots"]["ASML"]["articles"] == 1
+
+        cache.idle_seconds = 0
+        time.sleep(0.01)
+        cache.refresh_due()
+        assert cache.get_stats()["snapshots"] == {}
+        assert len(calls) == 1
@@ -0,0 +1,66 @@
+"""
+Parse Pool Test Suite
+Worker processes return the same plain records as inline parsing; small documents
+stay on the calling thread
+"""
+
+import pytest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Test</title>
+<item><title>TSMC raises capex</title><link>https://ex.com/tsmc</link><description>Chips</description>
+<pubDate>Mon, 06 Jan 2025 10:00:00 GMT</pubDate></item>
+<item><title>ASML ships EUV tools</title><link>https://ex.com/asml</link></item>
+</channel></rss>"""
+
+HTML = (b"<html><head><script>var x = 1;</script><style>p {}</style></head><body>"
+        b"<p>short</p><p>Taiwan Semiconductor reported record quarterly revenue on AI demand.</p>"
+        b"<p>Shipments of advanced packaging capacity are expected to double next year.</p></body></html>")
+
+
+@pytest.fixture
+def pool():
+    from app.services.parse_pool import ParsePool
+
+    pool = ParsePool(workers=2, min_bytes=0)
+    yield pool
+    pool.close()
+
+
+class TestParsePool:
+    """Test suite for ParsePool"""
+
+    def test_feed_entries_are_plain_records(self):
+        from app.services.parse_pool import ParsePool
+
+        entries = ParsePool(workers=0).feed_entries(RSS)
+        assert entries == [
+            {"title": "TSMC raises capex", "link": "https://ex.com/tsmc", "summary": "Chips",
+             "description": "Chips", "published": "Mon, 06 Jan 2025 10:00:00 GMT"},
+            {"title": "ASML ships EUV tools", "link": "https://ex.com/asml"},
+        ]
+
+    def test_worker_processes_match_inline(self, pool):
+        from app.services.parse_pool import ParsePool
+
+        inline = ParsePool(workers=0)
+        assert pool.feed_entries(RSS) == inline.feed_entries(RSS)
+        assert pool.article_text(HTML) == inline.article_text(HTML)
+        assert pool.document_text(HTML) == inline.document_text(HTML)
+        assert "var x" not in pool.article_text(HTML) and "short" not in pool.article_text(HTML)
+
+        stats = pool.get_stats()
+        assert stats["offloaded"] == 5 and stats["started"]
+
+    def test_small_documents_stay_inline(self):
+        from app.services.parse_pool import ParsePool
+
+        pool = ParsePool(workers=2, min_bytes=len(HTML) + 1)
+        assert pool.article_text(HTML).startswith("Taiwan Semiconductor")
+        assert pool.get_stats() == {"inline": 1, "offloaded": 0, "fallbacks": 0, "bytes_offloaded": 0,
+                                    "workers": 2, "min_bytes": len(HTML) + 1, "started": False}
@@ -0,0 +1,76 @@
+"""
+Source Quota Budget Test Suite
+Daily quotas are paced over the window, persisted across restarts, and a deferred call
+never reaches the network
+"""
+
+import pytest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DAY = 86400
+QUOTAS = {"newsapi": {"limit": 100, "window": DAY}, "finnhub": {"limit": 3, "window": 60}}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.time() for the budget module, starting at a UTC midnight."""
+    from app.services import quota_budget as module
+
+    now = {"t": 1_700_006_400.0}  # 2023-11-15 00:00:00 UTC
+    monkeypatch.setattr(module.time, "time", lambda: now["t"])
+    return now
+
+
+class TestSourceQuotaBudget:
+    """Test suite for SourceQuotaBudget"""
+
+    def test_daily_quota_paced(self, temp_db, clock):
+        from app.services.quota_budget import SourceQuotaBudget
+
+        budget = SourceQuotaBudget(QUOTAS, burst=3)
+        # Start of day: only the burst
+        assert [budget.try_acquire("newsapi") for _ in range(5)] == [True, True, True, False, False]
+        # A quarter through the day: 25 paced calls + burst
+        clock["t"] += DAY / 4
+        granted = sum(budget.try_acquire("newsapi") for _ in range(50))
+        assert granted == 25
+        assert budget.get_stats()["sources"]["newsapi"]["remaining"] == 72
+
+    def test_usage_persists_and_window_resets(self, temp_db, clock):
+        from app.services.quota_budget import SourceQuotaBudget
+
+        clock["t"] += DAY - 60
+        budget = SourceQuotaBudget(QUOTAS, burst=3)
+        for _ in range(10):
+            budget.try_acquire("newsapi")
+
+        restarted = SourceQuotaBudget(QUOTAS, burst=3)
+        assert restarted.remaining("newsapi") == 90
+
+        clock["t"] += 120  # next UTC day
+        assert restarted.remaining("newsapi") == 100
+
+    def test_minute_window_and_upstream_exhaustion(self, temp_db, clock):
+        from app.services.quota_budget import SourceQuotaBudget
+
+        budget = SourceQuotaBudget(QUOTAS)
+        assert [budget.try_acquire("finnhub") for _ in range(4)] == [True, True, True, False]
+        clock["t"] += 60
+        assert budget.try_acquire("finnhub")
+
+        budget.mark_exhausted("finnhub")
+        assert not budget.try_acquire("finnhub")
+        assert budget.try_acquire("hacker_news")  # unmetered
+
+    def test_deferred_fetch_skips_network(self, temp_db, monkeypatch):
+        from app.services import news_aggregator
+        from app.services.quota_budget import SourceQuotaBudget
+
+        monkeypatch.setattr(news_aggregator, "NEWSAPI_KEY", "test-key")
+        monkeypatch.setattr(news_aggregator, "quota_budget", SourceQuotaBudget(QUOTAS, burst=0))
+        monkeypatch.setattr(news_aggregator.http_client, "get", lambda *a, **k: pytest.fail("quota not enforced"))
+        assert news_aggregator.NewsIngestionLayer().fetch_news_api("AAPL") == []
@@ -0,0 +1,160 @@
+"""
+Seen-URL Index Test Suite
+Canonical URLs of processed articles persist across runs and expire after the TTL
+"""
+
+import base64
+import time
+
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class TestCanonicalUrl:
+    """Test suite for canonicalize_url"""
+
+    def test_tracking_params_and_cosmetics_removed(self):
+        from app.services.url_index import canonicalize_url
+
+        expected = "https://reuters.com/markets/tsmc-halts?id=7&page=2"
+        assert canonicalize_url("http://www.Reuters.com/markets/tsmc-halts/?page=2&utm_source=rss&id=7#top") == expected
+        assert canonicalize_url("https://reuters.com/markets/tsmc-halts?id=7&fbclid=abc&page=2") == expected
+
+    def test_google_links_unwrapped(self):
+        from app.services.url_index import canonicalize_url
+
+        target = b"https://www.cnbc.com/2025/01/02/nvidia.html?utm_medium=feed"
+        article_id = base64.urlsafe_b64encode(b"\x08\x13\x22" + bytes([len(target)]) + target + b"\xd2\x01\x00")
+        gn = f"https://news.google.com/rss/articles/{article_id.decode().rstrip('=')}?oc=5&hl=en-US"
+        assert canonicalize_url(gn) == "https://cnbc.com/2025/01/02/nvidia.html"
+        assert canonicalize_url("https://www.google.com/url?q=https://cnbc.com/2025/01/02/nvidia.html&sa=D") == \
+            "https://cnbc.com/2025/01/02/nvidia.html"
+        # Opaque IDs still collapse rss/ vs articles/ and locale params
+        assert canonicalize_url("https://news.google.com/rss/articles/AU_yqLx?oc=5") == \
+            canonicalize_url("https://news.google.com/articles/AU_yqLx?hl=en-US&gl=US")
+
+
+class TestSeenUrlIndex:
+    """Test suite for SeenUrlIndex"""
+
+    def test_seen_urls_filtered_across_restarts(self, temp_db):
+        from app.services.url_index import SeenUrlIndex
+
+        index = SeenUrlIndex()
+        urls = ["https://a.com/1", "https://a.com/2?utm_source=x", "https://a.com/2"]
+        assert index.filter_unseen(urls) == ["https://a.com/1", "https://a.com/2?utm_source=x"]
+        index.mark_seen(["https://a.com/2"])
+
+        restarted = SeenUrlIndex()
+        assert restarted.filter_unseen(urls + ["https://b.com/9"]) == ["https://a.com/1", "https://b.com/9"]
+        assert restarted.is_seen("http://www.a.com/2/")
+        assert restarted.get_stats()["db_confirmed"] >= 1
+
+    def test_entries_expire(self, temp_db):
+        from app.services.url_index import SeenUrlIndex
+
+        index = SeenUrlIndex(ttl_seconds=1)
+        index.mark_seen(["https://a.com/1"])
+        assert index.is_seen("https://a.com/1")
+        time.sleep(1.1)
+        assert not index.is_seen("https://a.com/1")
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        from app.services.url_index import BloomFilter, url_hash
+
+        bloom = BloomFilter(1000, 0.01)
+        digests = [url_hash(f"https://x.com/{i}") for i in range(1000)]
+        for digest in digests:
+            bloom.add(digest)
+        assert all(digest in bloom for digest in digests)
+        false_positives = sum(url_hash(f"https://y.com/{i}") in bloom for i in range(5000))
+        assert false_positives < 150  # ~1% expected
+
+
+class TestAgentSeenMarking:
+    """Only articles that actually got an LLM analysis are marked seen"""
+
+    def test_heuristic_fallbacks_stay_unseen(self, temp_db, monkeypatch):
+        from app.agents import nodes
+        from app.services.url_index import SeenUrlIndex
+
+        class _Classifier:
+            def analyze_article(self, title, content, portfolio, article_id=None):
+                reasoning = "Heuristic fallback (Gemini error): SUPPLY_CHAIN" if title == "bad" else "LLM"
+                return {"sentiment_score": 0.0, "reasoning": reasoning}
+
+        index = SeenUrlIndex()
+        monkeypatch.setattr(nodes, "url_index", index)
+        monkeypatch.setattr(nodes, "classification_service", _Classifier())
+        articles = [{"id": str(i), "url": f"https://a.com/{title}", "title": title, "content": "", "companies": []}
+                    for i, title in enumerate(["good", "bad"])]
+
+        nodes.agent_2_classifier({"news_articles": articles, "portfolio": []})
+        assert index.filter_unseen(["https://a.com/good", "https://a.com/bad"]) == ["https://a.com/bad"]
+
+    def test_nothing_new_is_not_replaced_by_mock(self, temp_db, monkeypatch):
+        from app.agents import nodes
+
+        layer = nodes.news_aggregator_layer
+        monkeypatch.setattr(layer, "ingest_all", lambda tickers, unseen_only=False: [])
+        monkeypatch.setattr(layer, "last_report", {"timings": {"rss:Reuters": {"articles": 4}}})
+        assert nodes.agent_1_news_monitor({"portfolio": ["AAPL"]})["news_articles"] == []
+
+    def test_pipeline_leaves_heuristic_extractions_unseen(self, schema_db, monkeypatch):
+        from datetime import datetime
+        from app.models.article import Article
+        from app.services import pipeline as pipeline_module
+        from app.services.url_index import SeenUrlIndex
+
+        index = SeenUrlIndex()
+        monkeypatch.setattr(pipeline_module, "url_index", index)
+        articles = [Article(title=f"{name} story", url=f"https://a.com/{name}", source="Reuters",
+                            published_at=datetime.now(), content=f"{name} content") for name in ("llm", "heuristic")]
+        no_impact = {"relationships": [], "direct_impact": {"has_direct_impact": False}}
+        batch = {articles[0].id: {**no_impact, "event_type": "earnings"},
+                 articles[1].id: {**no_impact, "event_type": "market_news_heuristic"}}
+        monkeypatch.setattr(pipeline_module.gemini_client, "extract_relationships_batch", lambda arts, portfolio: batch)
+
+        assert pipeline_module.Pipeline().process_articles(articles) == []
+        assert index.filter_unseen(a.url for a in articles) == ["https://a.com/heuristic"]
+
+    def test_incremental_stream_retries_heuristic_extractions(self, schema_db, monkeypatch):
+        from app.services import pipeline as pipeline_module
+        from app.services.alert_generator import AlertGenerator
+        from app.services.news_aggregator import NewsIngestionLayer
+        from app.services.url_index import SeenUrlIndex
+
+        index = SeenUrlIndex()
+        monkeypatch.setattr(pipeline_module, "url_index", index)
+        extracted = []
+
+        def extract(arts, portfolio):
+            extracted.extend(a.url for a in arts)
+            return {a.id: {"relationships": [], "direct_impact": {"has_direct_impact": False},
+                           "event_type": "market_news_heuristic" if "heuristic" in a.url else "earnings"}
+                    for a in arts}
+
+        monkeypatch.setattr(pipeline_module.gemini_client, "extract_relationships_batch", extract)
+        # The heuristic fallback is older than the story the LLM answered
+        stories = [("heuristic", "Foundry margins slip on wafer pricing", "2025-03-01T10:00:00Z"),
+                   ("llm", "Memory maker lifts capex guidance", "2025-03-01T11:00:00Z")]
+        feed = [{"title": title, "url": f"https://b.com/{name}", "content": f"{title} after quarterly results",
+                 "source": "Test", "published_at": published, "type": "api", "credibility": "high"}
+                for name, title, published in stories]
+        layer = NewsIngestionLayer()
+        layer.fetch_news_api = lambda query, since=None: list(feed)
+        generator = AlertGenerator()
+
+        def run():
+            batches = layer.stream_batches(["AAPL"], "AAPL", sources=["newsapi"], incremental=True)
+            generator.generate_alerts_from_stream(batches)
+
+        run()
+        assert sorted(extracted) == ["https://b.com/heuristic", "https://b.com/llm"]
+        extracted.clear()
+        run()
+        # The cursor stopped before the unfinished article, and only that one reaches the LLM again
+        assert extracted == ["https://b.com/heuristic"]
@@ -0,0 +1,67 @@
+"""
+Usage Ledger Test Suite
+Buffered, non-blocking LLM usage logging into SQLite
+"""
+
+import json
+import pytest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def usage_log(tmp_path, monkeypatch):
+    """Keep the legacy JSON usage log out of the real data directory."""
+    from app.services import usage_tracker
+    monkeypatch.setattr(usage_tracker, "USAGE_LOG_PATH", tmp_path / "gemini_usage.json")
+
+
+class TestUsageLedger:
+    """Test suite for the usage ledger"""
+
+    def test_rows_aggregate_by_model_and_caller(self, temp_db):
+        from app.services.usage_tracker import UsageTracker
+
+        tracker = UsageTracker(budget_usd=1.0, flush_interval=0.05)
+        tracker.log_request("model-a", 1000, 200, caller="classify_article", latency_ms=100, prompt_tokens=250)
+        tracker.log_request("model-a", 1000, 200, caller="classify_article", latency_ms=300)
+        tracker.log_request("model-b", 500, 100, caller="extract_relationships", latency_ms=50)
+        assert tracker.flush()
+
+        summary = tracker.get_summary(days=1)
+        assert summary["totals"]["requests"] == 3
+        by_caller = {row["name"]: row for row in summary["by_caller"]}
+        assert by_caller["classify_article"]["requests"] == 2
+        assert by_caller["classify_article"]["avg_latency_ms"] == 200
+        assert by_caller["classify_article"]["max_latency_ms"] == 300
+        assert by_caller["classify_article"]["prompt_tokens"] == 250
+        by_model = {row["name"]: row for row in summary["by_model"]}
+        assert by_model["model-b"]["input_chars"] == 500
+
+        today = tracker.get_daily_stats()
+        assert today["count"] == 3
+        assert today["input_chars"] == 2500
+
+    def test_totals_survive_restart(self, temp_db):
+        from app.services.usage_tracker import UsageTracker
+
+        first = UsageTracker(flush_interval=0.05)
+        first.log_request("model-a", 2000, 400, caller="sec_parser")
+        assert first.flush()
+
+        second = UsageTracker()
+        assert second.get_daily_stats()["count"] == 1
+        assert second.get_summary()["totals"]["requests"] == 1
+
+    def test_legacy_json_imported_once(self, temp_db):
+        from app.services.usage_tracker import UsageTracker
+
+        legacy = {"daily_requests": {"2025-01-02": {"count": 7, "input_chars": 7000,
+                                                     "output_chars": 1400, "estimated_cost": 0.01}}}
+        (temp_db / "gemini_usage.json").write_text(json.dumps(legacy))
+
+        assert UsageTracker().get_summary(days=100000)["totals"]["requests"] == 7
+        assert UsageTracker().get_summary(days=100000)["totals"]["requests"] == 7